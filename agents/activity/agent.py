@@ -8,16 +8,22 @@ LangGraph-based agent that processes activity search requests.
 Uses SerpAPI to search for activities, attractions, and things to do.
 """
 
+import json
 import logging
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.graph import StateGraph, MessagesState, END
 from langgraph.graph.state import CompiledStateGraph
 from ioa_observe.sdk.decorators import agent, graph
 
-from agents.travel.serpapi_tools import search_activities
+from agents.travel.serpapi_tools import collect_stale_responses, search_activities, search_activities_multi
+from agents.travel.exceptions import SerpApiBudgetExhaustedError, SerpApiUnavailableError
 
 logger = logging.getLogger("lungo.activity.agent")
 
+# Activities returned for a single-type search and for a merged multi-type search
+MAX_ACTIVITIES = 10
+MAX_MERGED_ACTIVITIES = 20
+
 
 @agent(name="activity_search_agent")
 class ActivitySearchAgent:
@@ -53,6 +59,7 @@ class ActivitySearchAgent:
         Expected message format:
         "Search activities in {location}"
         or "location:{location}"
+        or "location:{location} types:museums,parks,restaurants" (one merged list)
         """
         # Get the latest human message
         user_msg = next(
@@ -75,10 +82,19 @@ class ActivitySearchAgent:
                 )]}
             
             # Search for activities using SerpAPI
-            activities = await search_activities(
-                location=params["location"],
-                activity_type=params.get("activity_type", "things to do"),
-            )
+            # Several types are searched concurrently and merged into one ranked list
+            # (stale: SerpAPI was unavailable and cached results were served instead)
+            with collect_stale_responses() as stale:
+                if params.get("activity_types"):
+                    activities = await search_activities_multi(
+                        location=params["location"],
+                        activity_types=params["activity_types"],
+                    )
+                else:
+                    activities = await search_activities(
+                        location=params["location"],
+                        activity_type=params.get("activity_type", "things to do"),
+                    )
             
             if not activities:
                 return {"messages": [AIMessage(
@@ -86,9 +102,18 @@ class ActivitySearchAgent:
                 )]}
             
             # Format the response
-            response = self._format_activities_response(activities, params)
+            response = self._format_activities_response(activities, params, stale=bool(stale))
             return {"messages": [AIMessage(content=response)]}
             
+        except (SerpApiBudgetExhaustedError, SerpApiUnavailableError) as e:
+            # Typed error so the supervisor can fall back to cached results
+            logger.warning(f"SerpAPI unavailable searching activities: {e}")
+            return {"messages": [AIMessage(content=json.dumps({
+                "status": "error",
+                "error_type": e.error_type,
+                "message": str(e),
+            }))]}
+            
         except Exception as e:
             logger.error(f"Error searching activities: {e}")
             return {"messages": [AIMessage(content=f"Error searching activities: {str(e)}")]}
@@ -99,6 +124,7 @@ class ActivitySearchAgent:
         
         Supports formats:
         - "location:San Jose activity_type:attractions"
+        - "location:San_Jose types:museums,parks,restaurants"
         - "Search activities in San Jose"
         """
         params = {}
@@ -115,20 +141,27 @@ class ActivitySearchAgent:
                     params["location"] = value.replace("_", " ")  # Handle underscores
                 elif key in ["type", "activity_type", "category"]:
                     params["activity_type"] = value.replace("_", " ")
+                elif key in ["types", "activity_types", "categories"]:
+                    params["activity_types"] = [
+                        t.replace("_", " ") for t in value.split(",") if t.strip()
+                    ]
         
         return params
     
-    def _format_activities_response(self, activities: list, params: dict) -> str:
+    def _format_activities_response(self, activities: list, params: dict, stale: bool = False) -> str:
         """Format activity results as a JSON string response."""
-        import json
-        
         # Return as JSON for the supervisor to parse
+        limit = MAX_MERGED_ACTIVITIES if params.get("activity_types") else MAX_ACTIVITIES
         response_data = {
             "status": "success",
             "location": params["location"],
             "activity_count": len(activities),
-            "activities": activities[:10],  # Return top 10 activities
+            "activities": activities[:limit],  # Return the top activities
+            # True if SerpAPI was unavailable and last-known cached results were served
+            "stale": stale,
         }
+        if params.get("activity_types"):
+            response_data["activity_types"] = params["activity_types"]
         
         return json.dumps(response_data)
     
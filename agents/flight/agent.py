@@ -8,13 +8,23 @@ LangGraph-based agent that processes flight search requests.
 Uses SerpAPI to search for flights and returns formatted results.
 """
 
+import json
 import logging
+import time
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.graph import StateGraph, MessagesState, END
 from langgraph.graph.state import CompiledStateGraph
 from ioa_observe.sdk.decorators import agent, graph
 
-from agents.travel.serpapi_tools import search_flights
+from agents.travel.serpapi_tools import (
+    collect_stale_responses,
+    search_flights,
+    search_flights_grid,
+    search_flights_multi_airport,
+)
+from agents.travel.exceptions import SerpApiBudgetExhaustedError, SerpApiUnavailableError
+from agents.travel.fare_history import get_fare_history
+from agents.travel.results import FlightTable
 
 logger = logging.getLogger("lungo.flight.agent")
 
@@ -50,9 +60,12 @@ class FlightSearchAgent:
         """
         Process flight search request and return results.
         
-        Supports both round-trip and one-way flights:
+        Supports both round-trip and one-way flights, plus flexible-date fare grids:
         - Round-trip: "origin:LAX destination:NRT outbound:2026-01-15 return:2026-01-22"
         - One-way: "origin:LAX destination:NRT outbound:2026-01-15 type:oneway"
+        - Nearby airports: add "radius_km:50" (0 = same-metro airports only)
+        - Fare grid: "origin:LAX destination:NRT outbound_from:2026-03-01 outbound_to:2026-03-31
+                      nights_min:6 nights_max:8 type:grid"
         """
         # Get the latest human message
         user_msg = next(
@@ -70,6 +83,9 @@ class FlightSearchAgent:
             params = self._parse_request(user_msg.content)
             is_one_way = params.get("is_one_way", False)
             
+            if params.get("is_grid"):
+                return await self._search_grid(params)
+            
             # Check required parameters
             # For one-way: origin, destination, outbound_date
             # For round-trip: also need return_date
@@ -95,23 +111,54 @@ class FlightSearchAgent:
             
             # Search for flights using SerpAPI
             # For one-way, pass outbound_date as return_date too (the API handles type:2)
-            flights = await search_flights(
+            search_kwargs = dict(
                 origin=params["origin"],
                 destination=params["destination"],
                 outbound_date=params["outbound_date"],
                 return_date=params.get("return_date") or params["outbound_date"],
                 include_return_flights=not is_one_way,  # Don't fetch return flights for one-way
             )
+            # Stale: SerpAPI was unavailable and cached results were served instead
+            search_started = time.time()
+            with collect_stale_responses() as stale:
+                if params.get("radius_km") is not None:
+                    # Fan out to all airports near origin and destination
+                    flights = await search_flights_multi_airport(**search_kwargs, radius_km=params["radius_km"])
+                else:
+                    flights = await search_flights(**search_kwargs)
             
             if not flights:
                 return {"messages": [AIMessage(
                     content=f"No flights found from {params['origin']} to {params['destination']}"
                 )]}
             
+            # Compare the cheapest fare with locally recorded fares (no upstream call);
+            # fares this search just recorded are left out
+            price_insight = None
+            fare_history = get_fare_history()
+            if fare_history is not None:
+                price_insight = await fare_history.flight_insight(
+                    params["origin"],
+                    params["destination"],
+                    params["outbound_date"],
+                    None if is_one_way else params.get("return_date"),
+                    min(flight.get("price") or float("inf") for flight in flights),
+                    before=search_started,
+                )
+            
             # Format the response
-            response = self._format_flights_response(flights, params)
+            response = self._format_flights_response(flights, params, price_insight, stale=bool(stale))
             return {"messages": [AIMessage(content=response)]}
             
+        except (SerpApiBudgetExhaustedError, SerpApiUnavailableError) as e:
+            # Typed error so the supervisor can fall back to cached results
+            logger.warning(f"SerpAPI unavailable searching flights: {e}")
+            return {"messages": [AIMessage(content=json.dumps({
+                "status": "error",
+                "error_type": e.error_type,
+                "message": str(e),
+            }))]}
+            
         except Exception as e:
             logger.error(f"Error searching flights: {e}")
             return {"messages": [AIMessage(content=f"Error searching flights: {str(e)}")]}
@@ -147,20 +194,83 @@ class FlightSearchAgent:
                     params["return_date"] = value
                 elif key == "type" and value.lower() in ["oneway", "one-way", "single"]:
                     params["is_one_way"] = True
+                elif key == "type" and value.lower() in ["grid", "flexible"]:
+                    params["is_grid"] = True
+                elif key in ["outbound_from", "earliest"]:
+                    params["outbound_from"] = value
+                elif key in ["outbound_to", "latest"]:
+                    params["outbound_to"] = value
+                elif key in ["nights_min", "min_nights"]:
+                    params["nights_min"] = value
+                elif key in ["nights_max", "max_nights"]:
+                    params["nights_max"] = value
+                elif key in ["radius_km", "radius"]:
+                    try:
+                        params["radius_km"] = max(0.0, float(value))
+                    except ValueError:
+                        pass
         
         return params
     
-    def _format_flights_response(self, flights: list, params: dict) -> str:
-        """Format flight results as a string response."""
-        import json
+    async def _search_grid(self, params: dict) -> dict:
+        """
+        Search a flexible-date fare grid and return it as JSON.
+        
+        Budget and unavailability errors propagate to _search_flights_node,
+        which reports them with their error_type like any other search.
+        """
+        required_present = all([
+            params.get("origin"),
+            params.get("destination"),
+            params.get("outbound_from"),
+            params.get("nights_min"),
+        ])
+        if not required_present:
+            return {"messages": [AIMessage(
+                content="Missing required parameters. Please provide: origin, destination, outbound_from, nights_min"
+            )]}
+        
+        try:
+            nights_min = int(params["nights_min"])
+            nights_max = int(params.get("nights_max") or nights_min)
+        except ValueError:
+            return {"messages": [AIMessage(content="nights_min and nights_max must be whole numbers.")]}
+        
+        with collect_stale_responses() as stale:
+            grid = await search_flights_grid(
+                origin=params["origin"],
+                destination=params["destination"],
+                outbound_range=(params["outbound_from"], params.get("outbound_to") or params["outbound_from"]),
+                trip_length_range=(nights_min, nights_max),
+            )
+        
+        if grid["cheapest"] is None:
+            return {"messages": [AIMessage(
+                content=f"No flights found from {params['origin']} to {params['destination']} in that date range"
+            )]}
         
+        return {"messages": [AIMessage(content=json.dumps({"status": "success", "grid": grid, "stale": bool(stale)}))]}
+    
+    def _format_flights_response(
+        self,
+        flights: list,
+        params: dict,
+        price_insight: dict = None,
+        stale: bool = False,
+    ) -> str:
+        """Format flight results as a string response."""
         # Return as JSON for the supervisor to parse
         response_data = {
             "status": "success",
             "origin": params["origin"],
             "destination": params["destination"],
             "flight_count": len(flights),
-            "flights": flights[:10],  # Return top 10 flights
+            # Top 10 flights, packed by column (raw legs are not sent)
+            "flight_table": FlightTable.from_records(flights[:10]).to_columns(),
+            # Cheapest fare vs. recently observed fares (None without history)
+            "price_insight": price_insight,
+            # True if SerpAPI was unavailable and last-known cached fares were served
+            "stale": stale,
         }
         
         return json.dumps(response_data)
@@ -26,6 +26,12 @@ AGENT_CARD = AgentCard(
             name="Search Flights",
             description="Search for flights between two locations using SerpAPI.",
             tags=["travel", "flights", "search"],
-        )
+        ),
+        AgentSkill(
+            id="search_flights_grid",
+            name="Search Flexible Dates",
+            description="Find the cheapest outbound/return date pair over a range of dates and trip lengths.",
+            tags=["travel", "flights", "flexible-dates"],
+        ),
     ],
 )
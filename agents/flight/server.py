@@ -24,6 +24,9 @@ from a2a.server.request_handlers import DefaultRequestHandler
 
 from agents.flight.agent_executor import FlightAgentExecutor
 from agents.flight.card import AGENT_CARD
+from agents.travel.http_client import start_http_client, close_http_client
+from agents.travel.server_routes import build_travel_routes
+from agents.travel.serpapi_tools import start_prewarm, stop_prewarm
 from config.config import (
     DEFAULT_MESSAGE_TRANSPORT,
     TRANSPORT_SERVER_ENDPOINT,
@@ -40,7 +43,7 @@ async def run_http_server(server):
     """Run the HTTP/REST server."""
     try:
         port = int(os.getenv("FLIGHT_AGENT_PORT", "9001"))
-        config = Config(app=server.build(), host="0.0.0.0", port=port, loop="asyncio")
+        config = Config(app=server.build(routes=build_travel_routes()), host="0.0.0.0", port=port, loop="asyncio")
         userver = Server(config)
         await userver.serve()
     except Exception as e:
@@ -86,17 +89,27 @@ async def main(enable_http: bool):
         http_handler=request_handler
     )
 
-    # Run HTTP server and transport logic concurrently (same pattern as original)
-    tasks = []
-    if enable_http:
-        tasks.append(asyncio.create_task(run_http_server(server)))
-    tasks.append(asyncio.create_task(run_transport(
-        server, 
-        DEFAULT_MESSAGE_TRANSPORT, 
-        TRANSPORT_SERVER_ENDPOINT
-    )))
+    # Open the shared SerpAPI HTTP client before serving requests
+    await start_http_client()
+    # Keep popular searches cached (no-op unless SERPAPI_PREWARM_ENABLED)
+    start_prewarm()
+
+    try:
+        # Run HTTP server and transport logic concurrently (same pattern as original)
+        tasks = []
+        if enable_http:
+            tasks.append(asyncio.create_task(run_http_server(server)))
+        tasks.append(asyncio.create_task(run_transport(
+            server, 
+            DEFAULT_MESSAGE_TRANSPORT, 
+            TRANSPORT_SERVER_ENDPOINT
+        )))
     
-    await asyncio.gather(*tasks)
+        await asyncio.gather(*tasks)
+    finally:
+        # Stop background cache refreshes, then release pooled SerpAPI connections
+        await stop_prewarm()
+        await close_http_client()
 
 
 if __name__ == '__main__':
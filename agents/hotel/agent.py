@@ -8,13 +8,18 @@ LangGraph-based agent that processes hotel search requests.
 Uses SerpAPI to search for hotels and returns formatted results.
 """
 
+import json
 import logging
+import time
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.graph import StateGraph, MessagesState, END
 from langgraph.graph.state import CompiledStateGraph
 from ioa_observe.sdk.decorators import agent, graph
 
-from agents.travel.serpapi_tools import search_hotels
+from agents.travel.serpapi_tools import collect_stale_responses, search_hotels_page
+from agents.travel.fare_history import get_fare_history
+from agents.travel.results import HotelTable
+from agents.travel.exceptions import SerpApiBudgetExhaustedError, SerpApiUnavailableError
 
 logger = logging.getLogger("lungo.hotel.agent")
 
@@ -52,6 +57,9 @@ class HotelSearchAgent:
         
         Expected message format:
         "Search hotels in {location} from {check_in} to {check_out}"
+        
+        With "paged:true" the whole results page is returned along with its
+        next_page_token; "page_token:{token}" requests the following page.
         """
         # Get the latest human message
         user_msg = next(
@@ -74,21 +82,47 @@ class HotelSearchAgent:
                 )]}
             
             # Search for hotels using SerpAPI
-            hotels = await search_hotels(
-                location=params["location"],
-                check_in_date=params["check_in"],
-                check_out_date=params["check_out"],
-            )
+            # (stale: SerpAPI was unavailable and cached results were served instead)
+            search_started = time.time()
+            with collect_stale_responses() as stale:
+                hotels, next_page_token = await search_hotels_page(
+                    location=params["location"],
+                    check_in_date=params["check_in"],
+                    check_out_date=params["check_out"],
+                    page_token=params.get("page_token"),
+                )
             
-            if not hotels:
+            if not hotels and not params.get("paged"):
                 return {"messages": [AIMessage(
                     content=f"No hotels found in {params['location']}"
                 )]}
             
             # Format the response
-            response = self._format_hotels_response(hotels, params)
+            # Compare the cheapest nightly rate with locally recorded rates (first page only,
+            # no upstream call); rates this search just recorded are left out
+            price_insight = None
+            fare_history = get_fare_history()
+            if fare_history is not None and hotels and not params.get("page_token"):
+                prices = [hotel.get("price") for hotel in hotels if hotel.get("price") and not hotel.get("price_is_total")]
+                if prices:
+                    price_insight = await fare_history.hotel_insight(
+                        params["location"], params["check_in"], min(prices), before=search_started
+                    )
+            
+            response = self._format_hotels_response(
+                hotels, params, next_page_token, price_insight, stale=bool(stale)
+            )
             return {"messages": [AIMessage(content=response)]}
             
+        except (SerpApiBudgetExhaustedError, SerpApiUnavailableError) as e:
+            # Typed error so the supervisor can fall back to cached results
+            logger.warning(f"SerpAPI unavailable searching hotels: {e}")
+            return {"messages": [AIMessage(content=json.dumps({
+                "status": "error",
+                "error_type": e.error_type,
+                "message": str(e),
+            }))]}
+            
         except Exception as e:
             logger.error(f"Error searching hotels: {e}")
             return {"messages": [AIMessage(content=f"Error searching hotels: {str(e)}")]}
@@ -100,6 +134,7 @@ class HotelSearchAgent:
         Supports formats:
         - "location:San Diego check_in:2026-01-15 check_out:2026-01-22"
         - "location:Tokyo check_in:2026-01-15 check_out:2026-01-22"
+        - "location:Tokyo check_in:2026-01-15 check_out:2026-01-22 paged:true page_token:CAE..."
         
         Handles multi-word locations like "San Diego", "New York", "Las Vegas"
         """
@@ -111,7 +146,7 @@ class HotelSearchAgent:
         # This properly handles "location:San Diego check_in:2026-03-13"
         
         # Extract location (can have spaces)
-        location_match = re.search(r'location:([^:]+?)(?:\s+(?:check_in|check_out|checkin|checkout|start|end):|\s*$)', message, re.IGNORECASE)
+        location_match = re.search(r'location:([^:]+?)(?:\s+(?:check_in|check_out|checkin|checkout|start|end|paged|page_token):|\s*$)', message, re.IGNORECASE)
         if location_match:
             params["location"] = location_match.group(1).strip()
         
@@ -125,18 +160,36 @@ class HotelSearchAgent:
         if check_out_match:
             params["check_out"] = check_out_match.group(1).strip()
         
+        # Pagination: a page token implies a paged request
+        page_token_match = re.search(r'page_token:(\S+)', message, re.IGNORECASE)
+        if page_token_match:
+            params["page_token"] = page_token_match.group(1).strip()
+        params["paged"] = bool(page_token_match) or bool(re.search(r'paged:true\b', message, re.IGNORECASE))
+        
         return params
     
-    def _format_hotels_response(self, hotels: list, params: dict) -> str:
+    def _format_hotels_response(
+        self,
+        hotels: list,
+        params: dict,
+        next_page_token: str = None,
+        price_insight: dict = None,
+        stale: bool = False,
+    ) -> str:
         """Format hotel results as a string response."""
-        import json
-        
         # Return as JSON for the supervisor to parse
         response_data = {
             "status": "success",
             "location": params["location"],
             "hotel_count": len(hotels),
-            "hotels": hotels[:10],  # Return top 10 hotels
+            # Paged requests get the whole page so the caller sees every candidate,
+            # otherwise top 10 hotels; packed by column
+            "hotel_table": HotelTable.from_records(hotels if params.get("paged") else hotels[:10]).to_columns(),
+            "next_page_token": next_page_token,
+            # Cheapest rate vs. recently observed rates (None without history)
+            "price_insight": price_insight,
+            # True if SerpAPI was unavailable and last-known cached rates were served
+            "stale": stale,
         }
         
         return json.dumps(response_data)
@@ -28,11 +28,32 @@ from langgraph.graph import MessagesState, StateGraph, END
 from ioa_observe.sdk.decorators import agent, graph
 
 # Import A2A tools for communicating with Flight, Hotel, and Activity agents
-from agents.supervisors.travel.graph.tools import get_flights_via_a2a, get_hotels_via_a2a, get_activities_via_a2a
-from agents.travel.travel_logic import find_cheapest_plan
-from agents.supervisors.travel.graph.models import TravelSearchArgs
+from agents.supervisors.travel.graph.tools import (
+    get_flights_via_a2a,
+    get_flight_results_via_a2a,
+    get_flight_grid_via_a2a,
+    get_hotel_results_via_a2a,
+    iter_hotel_pages_via_a2a,
+    get_activities_via_a2a,
+    get_activities_multi_via_a2a,
+    get_multi_city_results_via_a2a,
+)
+from agents.travel.airports import get_airport_catalog
+from agents.travel.spatial import index_activities
+from agents.travel.travel_logic import (
+    collect_hotel_pages,
+    find_cheapest_itinerary,
+    find_top_plans,
+    walkable_activities,
+)
+from agents.supervisors.travel.graph.models import TravelSearchArgs, TripLeg
 from common.llm import get_llm
-from config.config import TRAVEL_HOTEL_CHECKIN_GAP_HOURS
+from config.config import (
+    TRAVEL_HOTEL_CHECKIN_GAP_HOURS,
+    TRAVEL_MULTI_CITY_MAX_LEGS,
+    TRAVEL_NEARBY_AIRPORT_RADIUS_KM,
+    TRAVEL_PLAN_ALTERNATIVES,
+)
 
 logger = logging.getLogger("lungo.travel.supervisor.graph")
 
@@ -254,6 +275,11 @@ Respond with ONLY 'travel_search' or 'general':""",
 
         # Step 2: Validate dates are not in the past (skip for activity_only which doesn't need dates)
         search_type = params.search_type or "full_trip"
+        
+        # Flexible-date requests ("cheapest week in March") are answered from one fare grid
+        if params.flexible_dates and search_type in ("flight_only", "full_trip"):
+            return await self._handle_flexible_dates_search(params)
+        
         if search_type != "activity_only":
             date_error = self._validate_dates(params)
             if date_error:
@@ -269,6 +295,8 @@ Respond with ONLY 'travel_search' or 'general':""",
             return await self._handle_hotel_only_search(params)
         elif search_type == "flight_only":
             return await self._handle_flight_only_search(params)
+        elif search_type == "multi_city":
+            return await self._handle_multi_city_search(params)
         else:
             # Default: full_trip (flight + hotel + activities)
             return await self._handle_full_trip_search(params)
@@ -292,12 +320,16 @@ Respond with ONLY 'travel_search' or 'general':""",
         logger.info(f"Searching activities only for location: {location}")
         
         try:
-            activities = await get_activities_via_a2a(location, "things to do")
+            # Several categories ("museums and parks") come back as one merged list
+            if params.activity_types:
+                activities = await get_activities_multi_via_a2a(location, params.activity_types)
+            else:
+                activities = await get_activities_via_a2a(location, "things to do")
             
             if not activities:
                 return {"messages": [AIMessage(content=f"I couldn't find any activities in {location}. Please try another location.")]}
             
-            response = self._format_activities_only(activities, location)
+            response = self._format_activities_only(activities, location, params.activity_types)
             return {"messages": [AIMessage(content=response)], "full_response": response}
             
         except Exception as e:
@@ -333,12 +365,15 @@ Respond with ONLY 'travel_search' or 'general':""",
         logger.info(f"Searching hotels only for location: {location}, {params.start_date} to {params.end_date}")
         
         try:
-            hotels = await get_hotels_via_a2a(location, params.start_date, params.end_date)
+            results = await get_hotel_results_via_a2a(location, params.start_date, params.end_date)
+            hotels = results["hotels"]
             
             if not hotels:
                 return {"messages": [AIMessage(content=f"I couldn't find any hotels in {location} for those dates. Please try different dates or another location.")]}
             
-            response = self._format_hotels_only(hotels, location, params)
+            response = self._format_hotels_only(
+                hotels, location, params, results["price_insight"], stale=results["stale"]
+            )
             return {"messages": [AIMessage(content=response)], "full_response": response}
             
         except Exception as e:
@@ -373,24 +408,112 @@ Respond with ONLY 'travel_search' or 'general':""",
         logger.info(f"Searching {trip_type} flights only: {params.origin} -> {params.destination}")
         
         try:
-            flights = await get_flights_via_a2a(
+            results = await get_flight_results_via_a2a(
                 params.origin,
                 params.destination,
                 params.start_date,
                 params.end_date if not params.is_one_way else None,
                 is_one_way=params.is_one_way,
+                radius_km=self._flight_search_radius(params),
             )
+            flights = results["flights"]
             
             if not flights:
                 return {"messages": [AIMessage(content=f"I couldn't find any flights from {params.origin} to {params.destination} for {params.start_date}. Please try different dates.")]}
             
-            response = self._format_flights_only(flights, params)
+            response = self._format_flights_only(flights, params, results["price_insight"], stale=results["stale"])
             return {"messages": [AIMessage(content=response)], "full_response": response}
             
         except Exception as e:
             logger.error(f"Error searching flights: {e}")
             return {"messages": [AIMessage(content=f"I encountered an error searching for flights: {str(e)}")]}
 
+    async def _handle_flexible_dates_search(self, params: TravelSearchArgs) -> dict:
+        """
+        Handle flexible-date requests (e.g. "cheapest week in March").
+        
+        Fetches one fare grid (outbound date x return date) from the Flight Agent
+        instead of searching every date pair. Flight-only requests get the grid
+        summary; full trips continue with the cheapest date pair.
+        """
+        if not params.origin or not params.destination or not params.outbound_from:
+            clarification = "I'd be happy to find the cheapest dates for you! I need:\n\n"
+            if not params.origin:
+                clarification += "- **Origin**: Where are you flying from?\n"
+            if not params.destination:
+                clarification += "- **Destination**: Where are you flying to?\n"
+            if not params.outbound_from:
+                clarification += "- **Date Range**: Which dates could you leave on?\n"
+            clarification += "\nExample: 'Cheapest week in March from LAX to Tokyo'"
+            return {"messages": [AIMessage(content=clarification)]}
+        
+        outbound_from = params.outbound_from.strip()[:10]
+        outbound_to = (params.outbound_to or params.outbound_from).strip()[:10]
+        # A range that has already started ("cheapest week this month") is searched
+        # from today; only a range that is entirely in the past is rejected
+        today = datetime.now().date().isoformat()
+        if outbound_from < today <= outbound_to:
+            outbound_from = today
+        
+        date_error = self._validate_dates(params.model_copy(update={"start_date": outbound_from, "end_date": None}))
+        if date_error:
+            return {"messages": [AIMessage(content=date_error)]}
+        
+        # Default to a one-week trip when the user gives no trip length
+        nights_min = params.trip_nights_min or params.trip_nights_max or 7
+        nights_max = max(nights_min, params.trip_nights_max or nights_min)
+        
+        logger.info(
+            f"Searching fare grid: {params.origin} -> {params.destination}, "
+            f"{outbound_from} to {outbound_to}, {nights_min}-{nights_max} nights"
+        )
+        
+        try:
+            grid = await get_flight_grid_via_a2a(
+                params.origin,
+                params.destination,
+                outbound_from,
+                outbound_to,
+                nights_min,
+                nights_max,
+            )
+        except Exception as e:
+            logger.error(f"Error searching fare grid: {e}")
+            return {"messages": [AIMessage(content=f"I encountered an error searching for flights: {str(e)}")]}
+        
+        cheapest = grid.get("cheapest") if grid else None
+        if not cheapest:
+            return {"messages": [AIMessage(content=
+                f"I couldn't find any flights from {params.origin} to {params.destination} "
+                f"between {outbound_from} and {outbound_to}. Please try a different date range."
+            )]}
+        
+        if params.search_type == "flight_only":
+            response = self._format_flight_grid(grid, params)
+            return {"messages": [AIMessage(content=response)], "full_response": response}
+        
+        # Full trip: plan flight + hotel + activities for the cheapest dates
+        trip_params = params.model_copy(update={
+            "start_date": cheapest["outbound_date"],
+            "end_date": cheapest["return_date"],
+            "is_one_way": False,
+            "flexible_dates": False,
+        })
+        result = await self._handle_full_trip_search(trip_params)
+        
+        intro = (
+            f"📅 **Cheapest dates between {outbound_from} and {outbound_to}:** "
+            f"{cheapest['outbound_date']} to {cheapest['return_date']} "
+            f"(flights from ${cheapest['price']:.2f})\n\n"
+        )
+        messages = result.get("messages", [])
+        if messages:
+            response = intro + messages[-1].content
+            result = {**result, "messages": [AIMessage(content=response)]}
+            if "full_response" in result:
+                result["full_response"] = response
+        return result
+
     async def _handle_full_trip_search(self, params: TravelSearchArgs) -> dict:
         """
         Handle full trip search (flight + hotel + activities).
@@ -431,27 +554,39 @@ Respond with ONLY 'travel_search' or 'general':""",
                 params.start_date,
                 params.end_date if not params.is_one_way else None,
                 is_one_way=params.is_one_way,
+                radius_km=self._flight_search_radius(params),
             )
             
             if not flights:
                 return {"messages": [AIMessage(content=f"I couldn't find any flights from {params.origin} to {params.destination}. Please try again.")]}
 
-            # Search for hotels
+            # Search for hotels, reading further result pages only until
+            # enough hotels pass the rating and check-in filters
             hotel_location = params.destination_city or params.destination
-            hotels = await get_hotels_via_a2a(hotel_location, params.start_date, hotel_checkout_date)
+            hotels = await collect_hotel_pages(
+                flights,
+                iter_hotel_pages_via_a2a(hotel_location, params.start_date, hotel_checkout_date),
+            )
             
             if not hotels:
                 return {"messages": [AIMessage(content=f"I found flights but couldn't find hotels in {hotel_location}.")]}
 
-            # Find cheapest valid plan
-            plan = find_cheapest_plan(flights, hotels)
+            # Find the cheapest valid plan plus diverse alternatives
+            # (the first plan is the one find_cheapest_plan would pick)
+            plans = find_top_plans(
+                flights,
+                hotels,
+                k=1 + TRAVEL_PLAN_ALTERNATIVES,
+                diversity=("airline", "hotel", "nonstop"),
+            )
             
-            if not plan:
+            if not plans:
                 return {"messages": [AIMessage(content=
                     f"I found {len(flights)} flights and {len(hotels)} hotels, but couldn't find a valid combination.\n\n"
                     f"This usually happens when hotel check-in times conflict with flight arrival. "
                     f"Try an earlier departure or later check-in time."
                 )]}
+            plan, alternatives = plans[0], plans[1:]
 
             # Search for activities (optional)
             activities = []
@@ -460,14 +595,94 @@ Respond with ONLY 'travel_search' or 'general':""",
             except Exception as e:
                 logger.warning(f"Activity search failed: {e}")
 
+            # Activities within walking distance of the chosen hotel
+            nearby_activities = walkable_activities(plan["hotel"], index_activities(hotel_location, activities), limit=5)
+
             # Format and return
-            response = self._format_travel_plan(plan, params, activities, hotel_checkout_date)
+            response = self._format_travel_plan(
+                plan, params, activities, hotel_checkout_date, nearby_activities, alternatives
+            )
             return {"messages": [AIMessage(content=response)], "full_response": response}
             
         except Exception as e:
             logger.error(f"Error during full trip search: {e}")
             return {"messages": [AIMessage(content=f"I encountered an error: {str(e)}")]}
 
+    async def _handle_multi_city_search(self, params: TravelSearchArgs) -> dict:
+        """
+        Handle multi-city trips (A→B→C→A): one-way flights per leg + a hotel in each city.
+        
+        Every leg and stay is searched at once, then find_cheapest_itinerary
+        picks the cheapest flights and hotels that fit together (hotel
+        check-in after arrival + buffer, next flight after landing + buffer).
+        A city left on the same day it is reached gets no hotel.
+        """
+        legs = params.legs
+        if len(legs) < 2 or any(not (leg.origin and leg.destination and leg.date) for leg in legs):
+            clarification = (
+                "I'd be happy to plan a multi-city trip! Please list each flight in order "
+                "with its date, for example:\n\n"
+                "- Los Angeles → Tokyo on May 1\n"
+                "- Tokyo → Seoul on May 5\n"
+                "- Seoul → Los Angeles on May 9\n"
+            )
+            return {"messages": [AIMessage(content=clarification)], "search_params": params.model_dump()}
+        
+        if len(legs) > TRAVEL_MULTI_CITY_MAX_LEGS:
+            return {"messages": [AIMessage(content=
+                f"I can plan up to {TRAVEL_MULTI_CITY_MAX_LEGS} flights in one multi-city trip. "
+                f"Please split your trip into shorter parts."
+            )]}
+        
+        date_error = self._validate_leg_dates(legs)
+        if date_error:
+            return {"messages": [AIMessage(content=date_error)]}
+        
+        # Stay i is in the city leg i lands in, until leg i + 1 leaves
+        stays, nights = [], []
+        for leg, next_leg in zip(legs, legs[1:]):
+            stay_nights = (
+                datetime.strptime(next_leg.date.strip()[:10], "%Y-%m-%d")
+                - datetime.strptime(leg.date.strip()[:10], "%Y-%m-%d")
+            ).days
+            city = leg.destination_city or leg.destination
+            stays.append((city, leg.date, next_leg.date) if stay_nights > 0 else None)
+            nights.append(stay_nights)
+        
+        route = " → ".join([legs[0].origin] + [leg.destination for leg in legs])
+        logger.info(f"Searching multi-city trip: {route}")
+        
+        try:
+            results = await get_multi_city_results_via_a2a(
+                [(leg.origin, leg.destination, leg.date) for leg in legs], stays
+            )
+            
+            for leg, flights in zip(legs, results["leg_flights"]):
+                if not flights:
+                    return {"messages": [AIMessage(content=
+                        f"I couldn't find any flights from {leg.origin} to {leg.destination} on {leg.date}. Please try another date."
+                    )]}
+            for stay, hotels in zip(stays, results["stay_hotels"]):
+                if stay is not None and not hotels:
+                    return {"messages": [AIMessage(content=f"I found flights but couldn't find hotels in {stay[0]}.")]}
+            
+            itinerary = find_cheapest_itinerary(results["leg_flights"], results["stay_hotels"], nights)
+            
+            if not itinerary:
+                return {"messages": [AIMessage(content=
+                    f"I found flights for every leg of {route}, but couldn't find a combination that fits together.\n\n"
+                    f"This usually happens when a flight lands too late for hotel check-in or for the next flight. "
+                    f"Try leaving more time between the legs."
+                )]}
+            
+            response = self._format_stale_notice(results["stale"], "fares and hotel rates")
+            response += self._format_multi_city_itinerary(itinerary, legs)
+            return {"messages": [AIMessage(content=response)], "full_response": response}
+        
+        except Exception as e:
+            logger.error(f"Error during multi-city search: {e}")
+            return {"messages": [AIMessage(content=f"I encountered an error: {str(e)}")]}
+
     async def _extract_travel_params(self, user_message: str) -> TravelSearchArgs:
         """
         Extract travel parameters from user message using LLM structured output.
@@ -527,6 +742,11 @@ Set search_type to ONE of these values:
   * "book a trip to NYC"
   * KEY: User uses words like "trip", "vacation", "travel", "plan" or explicitly asks for flight AND hotel
 
+- "multi_city" - User wants a trip through SEVERAL cities, one flight after another:
+  * "LA to Tokyo on May 1, then Seoul on May 5, back to LA on May 9"
+  * "fly New York → London → Paris → New York"
+  * KEY: More than one destination, each reached by its own flight
+
 STEP 2 - EXTRACT PARAMETERS BASED ON SEARCH TYPE:
 
 For "flight_only":
@@ -541,15 +761,30 @@ For "hotel_only":
 For "activity_only":
 - Required: location (city name)
 - No dates needed
+- activity_types: categories the user names, as short plural nouns
+  ("museums and parks" → ["museums", "parks"]); leave empty for general things to do
 
 For "full_trip":
 - Required: origin, destination, start_date
 - Optional: end_date (if round-trip, set is_one_way=True if not provided)
 
+For "multi_city":
+- Required: legs - one entry per flight in travel order, each with origin, destination,
+  destination_city and date (YYYY-MM-DD); "back home" is a final leg to the first origin
+- Leave origin, destination, start_date and end_date empty
+
 STEP 3 - DATE FORMATTING:
 - Convert to YYYY-MM-DD format (e.g., "Jan 15" → "{current_year}-01-15")
 - If year not specified, use {current_year} or {current_year + 1}
 
+STEP 3b - FLEXIBLE DATES:
+If the user asks for the cheapest dates within a range instead of fixed dates
+("cheapest week in March", "any 5-7 day trip in May", "my dates are flexible"):
+- Set flexible_dates=True and leave start_date and end_date empty
+- outbound_from / outbound_to: earliest and latest departure date (YYYY-MM-DD)
+- trip_nights_min / trip_nights_max: trip length in nights ("a week" → 7 and 7, "5-7 days" → 5 and 7)
+- Example: "cheapest week in March" → outbound_from="{current_year}-03-01", outbound_to="{current_year}-03-24", 7 and 7
+
 STEP 4 - AIRPORT CODE CONVERSION (for flights):
 Convert city names to 3-letter IATA codes:
   * "Los Angeles" → "LAX", "New York" → "JFK", "Tokyo" → "NRT"
@@ -559,11 +794,19 @@ Convert city names to 3-letter IATA codes:
   * "Las Vegas" → "LAS", "Denver" → "DEN", "Dallas" → "DFW"
   * "Hong Kong" → "HKG", "Singapore" → "SIN", "Sydney" → "SYD"
 
+STEP 4b - MULTI-AIRPORT SEARCH:
+- If the user names a city (not a specific airport), set multi_airport=True so all of
+  that city's airports are compared (e.g. "New York" → JFK, EWR and LGA)
+- If the user names a specific airport ("from JFK"), leave multi_airport=False
+- If the user asks for nearby airports, set multi_airport=True and search_radius_km to the
+  distance they give, or {TRAVEL_NEARBY_AIRPORT_RADIUS_KM:g} if they give none
+
 STEP 5 - SET has_all_params:
 - For flight_only: True if origin, destination, start_date present (end_date only if round-trip)
 - For hotel_only: True if location, start_date, end_date present
 - For activity_only: True if location present
 - For full_trip: True if origin, destination, start_date present (end_date only if round-trip)
+- For multi_city: True if there are at least 2 legs and each has origin, destination and date
 
 List any missing parameters in missing_params field."""
 
@@ -577,9 +820,11 @@ List any missing parameters in missing_params field."""
     
     def _normalize_airport_codes(self, params: TravelSearchArgs) -> TravelSearchArgs:
         """
-        Normalize city names to airport codes using a fallback mapping.
+        Normalize city names to airport codes using the bundled airport catalog.
         
         This handles cases where the LLM returns a city name instead of airport code.
+        City names served by several airports (e.g. "New York": JFK, EWR, LGA)
+        turn on multi-airport search so fares from every metro airport are compared.
         
         Args:
             params: Extracted travel parameters
@@ -587,166 +832,27 @@ List any missing parameters in missing_params field."""
         Returns:
             Parameters with normalized airport codes
         """
-        # Common city name to airport code mapping (fallback)
-        city_to_airport = {
-            "tokyo": "NRT",
-            "paris": "CDG",
-            "london": "LHR",
-            "new york": "JFK",
-            "nyc": "JFK",
-            "los angeles": "LAX",
-            "la": "LAX",
-            "san francisco": "SFO",
-            "sf": "SFO",
-            "chicago": "ORD",
-            "dallas": "DFW",
-            "miami": "MIA",
-            "seattle": "SEA",
-            "boston": "BOS",
-            "atlanta": "ATL",
-            "denver": "DEN",
-            "las vegas": "LAS",
-            "orlando": "MCO",
-            "hong kong": "HKG",
-            "singapore": "SIN",
-            "sydney": "SYD",
-            "dubai": "DXB",
-            "seoul": "ICN",
-            "bangkok": "BKK",
-            "rome": "FCO",
-            "amsterdam": "AMS",
-            "frankfurt": "FRA",
-            "toronto": "YYZ",
-            "vancouver": "YVR",
-            "mexico city": "MEX",
-            "cancun": "CUN",
-            "osaka": "KIX",
-            "beijing": "PEK",
-            "shanghai": "PVG",
-            "mumbai": "BOM",
-            "delhi": "DEL",
-            "madrid": "MAD",
-            "barcelona": "BCN",
-            "berlin": "BER",
-            "munich": "MUC",
-            "zurich": "ZRH",
-            "vienna": "VIE",
-            "lisbon": "LIS",
-            "dublin": "DUB",
-            "moscow": "SVO",
-            "istanbul": "IST",
-            "cairo": "CAI",
-            "johannesburg": "JNB",
-            "cape town": "CPT",
-            "nairobi": "NBO",
-            "auckland": "AKL",
-            "melbourne": "MEL",
-            "brisbane": "BNE",
-            "honolulu": "HNL",
-            "austin": "AUS",
-            "phoenix": "PHX",
-            "philadelphia": "PHL",
-            "washington": "DCA",
-            "washington dc": "DCA",
-            "detroit": "DTW",
-            "minneapolis": "MSP",
-            "portland": "PDX",
-            "san diego": "SAN",
-            "san jose": "SJC",
-            "tampa": "TPA",
-            "charlotte": "CLT",
-            "houston": "IAH",
-        }
-        
-        # Reverse mapping: airport code to city name (for hotel searches)
-        # Used when user provides airport code directly, we need city name for hotels
-        airport_to_city = {
-            "NRT": "Tokyo, Japan",
-            "HND": "Tokyo, Japan",
-            "CDG": "Paris, France",
-            "ORY": "Paris, France",
-            "LHR": "London, UK",
-            "LGW": "London, UK",
-            "JFK": "New York, NY",
-            "EWR": "New York, NY",
-            "LGA": "New York, NY",
-            "LAX": "Los Angeles, CA",
-            "SFO": "San Francisco, CA",
-            "ORD": "Chicago, IL",
-            "DFW": "Dallas, TX",
-            "MIA": "Miami, FL",
-            "SEA": "Seattle, WA",
-            "BOS": "Boston, MA",
-            "ATL": "Atlanta, GA",
-            "DEN": "Denver, CO",
-            "LAS": "Las Vegas, NV",
-            "MCO": "Orlando, FL",
-            "HKG": "Hong Kong",
-            "SIN": "Singapore",
-            "SYD": "Sydney, Australia",
-            "DXB": "Dubai, UAE",
-            "ICN": "Seoul, South Korea",
-            "BKK": "Bangkok, Thailand",
-            "FCO": "Rome, Italy",
-            "AMS": "Amsterdam, Netherlands",
-            "FRA": "Frankfurt, Germany",
-            "YYZ": "Toronto, Canada",
-            "YVR": "Vancouver, Canada",
-            "MEX": "Mexico City, Mexico",
-            "CUN": "Cancun, Mexico",
-            "KIX": "Osaka, Japan",
-            "PEK": "Beijing, China",
-            "PVG": "Shanghai, China",
-            "BOM": "Mumbai, India",
-            "DEL": "Delhi, India",
-            "MAD": "Madrid, Spain",
-            "BCN": "Barcelona, Spain",
-            "BER": "Berlin, Germany",
-            "MUC": "Munich, Germany",
-            "ZRH": "Zurich, Switzerland",
-            "VIE": "Vienna, Austria",
-            "LIS": "Lisbon, Portugal",
-            "DUB": "Dublin, Ireland",
-            "SVO": "Moscow, Russia",
-            "IST": "Istanbul, Turkey",
-            "CAI": "Cairo, Egypt",
-            "JNB": "Johannesburg, South Africa",
-            "CPT": "Cape Town, South Africa",
-            "NBO": "Nairobi, Kenya",
-            "AKL": "Auckland, New Zealand",
-            "MEL": "Melbourne, Australia",
-            "BNE": "Brisbane, Australia",
-            "HNL": "Honolulu, HI",
-            "AUS": "Austin, TX",
-            "PHX": "Phoenix, AZ",
-            "PHL": "Philadelphia, PA",
-            "DCA": "Washington, DC",
-            "IAD": "Washington, DC",
-            "DTW": "Detroit, MI",
-            "MSP": "Minneapolis, MN",
-            "PDX": "Portland, OR",
-            "SAN": "San Diego, CA",
-            "SJC": "San Jose, CA",
-            "TPA": "Tampa, FL",
-            "CLT": "Charlotte, NC",
-            "IAH": "Houston, TX",
-        }
+        # Bundled airport catalog: city names -> main airport, airport -> city (for hotel searches)
+        catalog = get_airport_catalog()
         
         # Check if origin needs conversion
         if params.origin:
             origin_lower = params.origin.lower().strip()
             original_origin = params.origin.strip()
             
-            if origin_lower in city_to_airport:
+            city_airport = catalog.code_for_city(origin_lower)
+            if city_airport:
                 # User provided city name - store it and convert to airport code
                 params.origin_city = original_origin.title()  # Store original city name
-                params.origin = city_to_airport[origin_lower]
+                params.origin = city_airport
+                if len(catalog.metro_airports(city_airport)) > 1:
+                    params.multi_airport = True
                 logger.info(f"Converting origin '{original_origin}' to airport code '{params.origin}'")
             else:
                 # User provided airport code - look up city name for display
                 airport_code = original_origin.upper()
                 params.origin = airport_code
-                params.origin_city = airport_to_city.get(airport_code, original_origin)
+                params.origin_city = catalog.city_for(airport_code) or original_origin
                 logger.info(f"Origin is airport code '{airport_code}', city: '{params.origin_city}'")
         
         # Check if destination needs conversion
@@ -754,20 +860,57 @@ List any missing parameters in missing_params field."""
             dest_lower = params.destination.lower().strip()
             original_dest = params.destination.strip()
             
-            if dest_lower in city_to_airport:
+            city_airport = catalog.code_for_city(dest_lower)
+            if city_airport:
                 # User provided city name - store it and convert to airport code
                 params.destination_city = original_dest.title()  # Store original city name for hotel search
-                params.destination = city_to_airport[dest_lower]
+                params.destination = city_airport
+                if len(catalog.metro_airports(city_airport)) > 1:
+                    params.multi_airport = True
                 logger.info(f"Converting destination '{original_dest}' to airport code '{params.destination}', keeping city '{params.destination_city}' for hotels")
             else:
                 # User provided airport code - look up city name for hotel search
                 airport_code = original_dest.upper()
                 params.destination = airport_code
-                params.destination_city = airport_to_city.get(airport_code, original_dest)
+                params.destination_city = catalog.city_for(airport_code) or original_dest
                 logger.info(f"Destination is airport code '{airport_code}', city for hotels: '{params.destination_city}'")
         
+        # Multi-city legs: same conversion (each leg searches its main airport only)
+        for leg in params.legs:
+            self._normalize_leg_airports(leg, catalog)
+        
         return params
 
+    def _normalize_leg_airports(self, leg: TripLeg, catalog) -> None:
+        """Convert a multi-city leg's city names to airport codes and set its hotel city."""
+        if leg.origin:
+            original_origin = leg.origin.strip()
+            leg.origin = catalog.code_for_city(original_origin.lower()) or original_origin.upper()
+        
+        if leg.destination:
+            original_dest = leg.destination.strip()
+            city_airport = catalog.code_for_city(original_dest.lower())
+            if city_airport:
+                leg.destination_city = original_dest.title()
+                leg.destination = city_airport
+            else:
+                leg.destination = original_dest.upper()
+                leg.destination_city = catalog.city_for(leg.destination) or original_dest
+
+    def _flight_search_radius(self, params: TravelSearchArgs):
+        """
+        Return the nearby-airport radius for a flight search.
+        
+        Returns:
+            The requested radius in km, 0 to search only the metro airports,
+            or None for a single-airport search
+        """
+        if params.search_radius_km is not None:
+            return max(0.0, params.search_radius_km)
+        if params.multi_airport:
+            return 0.0
+        return None
+
     def _override_search_type_from_keywords(self, params: TravelSearchArgs, user_text: str) -> TravelSearchArgs:
         """
         Override search_type based on explicit keywords in user message.
@@ -782,6 +925,10 @@ List any missing parameters in missing_params field."""
         Returns:
             Parameters with corrected search_type if needed
         """
+        # Multi-city trips list several flights; keywords like "flight" or "hotel" don't change that
+        if params.search_type == "multi_city":
+            return params
+        
         # Keywords that explicitly indicate flight-only searches
         flight_keywords = ['flight', 'flights', 'fly', 'flying', 'airfare', 'airline']
         # Keywords that indicate full trip (plan everything)
@@ -870,18 +1017,61 @@ List any missing parameters in missing_params field."""
         
         return ""  # No errors
 
-    def _format_activities_only(self, activities: list, location: str) -> str:
+    def _validate_leg_dates(self, legs: list) -> str:
+        """
+        Validate the dates of a multi-city trip: valid, not in the past, in travel order.
+        
+        Returns:
+            Error message if dates are invalid, empty string if valid
+        """
+        today = datetime.now().date()
+        previous = None
+        for number, leg in enumerate(legs, 1):
+            try:
+                leg_date = datetime.strptime(leg.date.strip()[:10], "%Y-%m-%d").date()
+            except (ValueError, TypeError, AttributeError):
+                return (
+                    f"⚠️ **Invalid Date**\n\n"
+                    f"I couldn't read the date of flight {number} ({leg.origin} → {leg.destination}): {leg.date}.\n\n"
+                    f"Please give each flight a date like 2026-05-01."
+                )
+            if leg_date < today:
+                return (
+                    f"⚠️ **Date Already Passed**\n\n"
+                    f"The date of flight {number} ({leg.date}) is in the past.\n\n"
+                    f"Today is **{today.strftime('%Y-%m-%d')}**.\n\n"
+                    f"Please enter future dates for your search."
+                )
+            if previous and leg_date < previous:
+                return (
+                    f"⚠️ **Invalid Date Range**\n\n"
+                    f"Flight {number} ({leg.date}) is dated before the flight that comes before it.\n\n"
+                    f"Please list the flights in travel order."
+                )
+            previous = leg_date
+        return ""  # No errors
+
+    def _format_activities_only(self, activities: list, location: str, activity_types: list = None) -> str:
         """
         Format activity-only search results.
         
-        Shows a list of things to do at the specified location.
+        Shows a list of things to do at the specified location. For a
+        multi-category search each place also shows the categories it matched.
         """
-        response = f"""🎯 **Things to Do in {location}**
+        if activity_types:
+            response = f"""🎯 **{', '.join(t.title() for t in activity_types)} in {location}**
+
+Here are the top places across these categories:
+
+"""
+        else:
+            response = f"""🎯 **Things to Do in {location}**
 
 Here are the top activities and attractions I found:
 
 """
-        for i, activity in enumerate(activities[:10], 1):
+        limit = 15 if activity_types else 10
+        for i, activity in enumerate(activities[:limit], 1):
             name = activity.get('name', 'Unknown')
             rating = activity.get('rating', 0)
             reviews = activity.get('reviews', 0)
@@ -893,6 +1083,8 @@ Here are the top activities and attractions I found:
             type_str = f" - {activity_type}" if activity_type else ""
             
             response += f"**{i}. {name}**{type_str}\n"
+            if activity_types and activity.get('categories'):
+                response += f"   🏷️ {', '.join(activity['categories'])}\n"
             if address:
                 response += f"   📍 {address}\n"
             if rating_str or reviews_str:
@@ -905,12 +1097,72 @@ Would you like more details about any of these, or should I search for flights a
         
         return response
 
-    def _format_hotels_only(self, hotels: list, location: str, params: TravelSearchArgs) -> str:
+    def _format_price_insight(self, insight: dict, price: float, what: str) -> str:
+        """
+        Format a price insight from the local fare history as one line.
+        
+        Args:
+            insight: price_insight from the Flight or Hotel Agent (may be None)
+            price: The price the insight was computed for
+            what: What is being priced (e.g. "fare", "nightly rate")
+        
+        Returns:
+            Markdown line (with trailing blank line), or "" without an insight
+        """
+        if not insight:
+            return ""
+        
+        verdicts = {
+            "good": f"is a **good price** - lower than most {what}s seen recently",
+            "typical": f"is about typical for recently seen {what}s",
+            "high": f"is **higher than usual** for recently seen {what}s",
+        }
+        cheapest = insight.get("cheapest_recent") or {}
+        line = f"💡 **Price check**: ${price:,.2f}"
+        if insight.get("verdict"):
+            line += (
+                f" {verdicts[insight['verdict']]} "
+                f"(typical ${insight['typical_low']:,}-${insight['typical_high']:,}, "
+                f"{insight['samples']} observations in the last {insight['lookback_days']} days)."
+            )
+        else:
+            line += f" - only {insight['samples']} similar {what}s seen recently, not enough for a verdict."
+        if cheapest:
+            line += (
+                f" Cheapest recent {what}: ${cheapest['price']:,} ({cheapest['name']}, {cheapest['date']},"
+                f" seen {cheapest['observed_at']})."
+            )
+        return line + "\n\n"
+
+    def _format_stale_notice(self, stale: bool, what: str) -> str:
+        """
+        Format a notice that results came from the cache because SerpAPI was unavailable.
+        
+        Returns:
+            Markdown line (with trailing blank line), or "" for live results
+        """
+        if not stale:
+            return ""
+        return (
+            f"⚠️ Live {what} are temporarily unavailable - these are the most recently "
+            f"cached {what} and may have changed.\n\n"
+        )
+
+    def _format_hotels_only(
+        self,
+        hotels: list,
+        location: str,
+        params: TravelSearchArgs,
+        price_insight: dict = None,
+        stale: bool = False,
+    ) -> str:
         """
         Format hotel-only search results.
         
         Shows a list of hotels at the specified location for the given dates,
         sorted by overall rating (best first) and filtered to show quality options.
+        A price check against locally recorded rates is added when available, and
+        a notice when the rates are cached ones served while SerpAPI was down.
         """
         # Calculate number of nights
         try:
@@ -937,6 +1189,13 @@ Dates: {params.start_date} to {params.end_date} ({nights_text})
 Sorted by rating (best first):
 
 """
+        response += self._format_stale_notice(stale, "hotel rates")
+        # The price insight compares nightly rates (whole-stay totals are not comparable)
+        cheapest_rate = min(
+            (h.get('price') or float('inf') for h in hotels if not h.get('price_is_total')), default=float('inf')
+        )
+        if cheapest_rate != float('inf'):
+            response += self._format_price_insight(price_insight, cheapest_rate, "nightly rate")
         for i, hotel in enumerate(sorted_hotels[:10], 1):
             name = hotel.get('name', 'Unknown Hotel')
             price_per_night = hotel.get('price', 0) or 0
@@ -970,11 +1229,19 @@ Would you like me to also find flights to {location}?"""
         
         return response
 
-    def _format_flights_only(self, flights: list, params: TravelSearchArgs) -> str:
+    def _format_flights_only(
+        self,
+        flights: list,
+        params: TravelSearchArgs,
+        price_insight: dict = None,
+        stale: bool = False,
+    ) -> str:
         """
         Format flight-only search results with card-style layout.
         
-        Shows top 5 flights with detailed outbound and return flight cards.
+        Shows top 5 flights with detailed outbound and return flight cards,
+        plus a price check against locally recorded fares when available and
+        a notice when the fares are cached ones served while SerpAPI was down.
         """
         is_one_way = params.is_one_way
         trip_type = "One-Way" if is_one_way else "Round-Trip"
@@ -990,6 +1257,11 @@ Would you like me to also find flights to {location}?"""
         else:
             response += f"**Dates**: {params.start_date} to {params.end_date}\n\n"
 
+        response += self._format_stale_notice(stale, "fares")
+        cheapest_fare = min((f.get('price') or float('inf') for f in flights), default=float('inf'))
+        if cheapest_fare != float('inf'):
+            response += self._format_price_insight(price_insight, cheapest_fare, "fare")
+        
         response += f"Here are the top {min(5, len(flights))} flight options:\n\n"
         
         # Show only top 5 flights with card-style format
@@ -1005,8 +1277,10 @@ Would you like me to also find flights to {location}?"""
             response += f"---\n\n"
             response += f"**Option {i}** - ${price:.2f} ({price_label})\n\n"
             
-            # Outbound Flight card
-            response += f"🛫 **Outbound Flight** ({params.origin} → {params.destination})\n"
+            # Outbound Flight card (multi-airport searches may use other metro airports)
+            leg_origin = flight.get('departure_code') or params.origin
+            leg_destination = flight.get('arrival_code') or params.destination
+            response += f"🛫 **Outbound Flight** ({leg_origin} → {leg_destination})\n"
             response += f"- **Airline**: {airline}\n"
             response += f"- **Price**: ${price:.2f} ({price_label})\n"
             response += f"- **Departure**: {departure}\n"
@@ -1015,16 +1289,16 @@ Would you like me to also find flights to {location}?"""
             
             # Only show layover for one-way flights (round-trip return doesn't have consistent layover data)
             if is_one_way and stops > 0:
+                layover_airports = list(flight.get('layovers') or [])
                 flight_legs = flight.get('flights', [])
-                if len(flight_legs) > 1:
-                    layover_airports = []
+                if not layover_airports and len(flight_legs) > 1:
                     for j in range(len(flight_legs) - 1):
                         leg = flight_legs[j]
                         layover_airport = leg.get('arrival_airport', {}).get('id', '') or leg.get('arrival_code', '')
                         if layover_airport:
                             layover_airports.append(layover_airport)
-                    if layover_airports:
-                        response += f"- **Layover**: {', '.join(layover_airports)}\n"
+                if layover_airports:
+                    response += f"- **Layover**: {', '.join(layover_airports)}\n"
             
             # Return Flight card (for round-trip only) - no layover info for consistency
             if not is_one_way and flight.get('return_flight'):
@@ -1035,11 +1309,20 @@ Would you like me to also find flights to {location}?"""
                 ret_stops = ret.get('stops', 0)
                 ret_stops_text = "Non-stop" if ret_stops == 0 else f"{ret_stops} stop{'s' if ret_stops > 1 else ''}"
                 
-                response += f"\n🛬 **Return Flight** ({params.destination} → {params.origin})\n"
+                response += f"\n🛬 **Return Flight** ({ret.get('departure_code') or leg_destination} → {ret.get('arrival_code') or leg_origin})\n"
                 response += f"- **Airline**: {ret_airline}\n"
                 response += f"- **Departure**: {ret_departure}\n"
                 response += f"- **Arrival**: {ret_arrival}\n"
                 response += f"- **Stops**: {ret_stops} ({ret_stops_text})\n"
+                
+                alternatives = flight.get('return_alternatives') or []
+                if alternatives:
+                    other_returns = ", ".join(
+                        f"{alt.get('airline', 'Unknown')} {alt.get('departure_time', 'N/A')}"
+                        f" ({'non-stop' if alt.get('stops', 0) == 0 else str(alt.get('stops')) + ' stop(s)'})"
+                        for alt in alternatives
+                    )
+                    response += f"- **Other returns**: {other_returns}\n"
             
             response += "\n"
 
@@ -1049,11 +1332,69 @@ Would you like me to also find hotels at {params.destination_city or params.dest
         
         return response
 
-    def _format_travel_plan(self, plan: dict, params: TravelSearchArgs, activities: list = None, hotel_checkout_date: str = None) -> str:
+    def _format_flight_grid(self, grid: dict, params: TravelSearchArgs) -> str:
+        """
+        Format a flexible-date fare grid.
+        
+        Shows the cheapest date pair, the top 5 date pairs and a compact table
+        of prices by departure date (rows) and trip length in nights (columns).
+        """
+        cheapest = grid["cheapest"]
+        outbound_dates = grid.get("outbound_dates", [])
+        return_dates = grid.get("return_dates", [])
+        
+        # Flatten the matrix into (price, outbound, return, nights) cells
+        cells = []
+        for row, outbound_date in enumerate(outbound_dates):
+            outbound_dt = datetime.strptime(outbound_date, "%Y-%m-%d")
+            for col, price in enumerate(grid["prices"][row]):
+                if price is None:
+                    continue
+                nights = (datetime.strptime(return_dates[col], "%Y-%m-%d") - outbound_dt).days
+                cells.append((price, outbound_date, return_dates[col], nights))
+        
+        nights_columns = sorted({nights for _, _, _, nights in cells})
+        by_date = {(outbound, nights): price for price, outbound, _, nights in cells}
+        
+        response = f"""📅 **Flexible Dates: {params.origin} → {params.destination}**
+
+**Cheapest**: {cheapest['outbound_date']} to {cheapest['return_date']} - **${cheapest['price']:.2f}** (both directions)
+
+"""
+        response += "**Top date options:**\n"
+        for i, (price, outbound, ret, nights) in enumerate(sorted(cells)[:5], 1):
+            response += f"{i}. {outbound} → {ret} ({nights} night{'s' if nights != 1 else ''}) - ${price:.2f}\n"
+        
+        response += "\n| Departure | " + " | ".join(f"{n} nights" for n in nights_columns) + " |\n"
+        response += "|---|" + "---|" * len(nights_columns) + "\n"
+        for outbound in outbound_dates:
+            row_prices = [by_date.get((outbound, n)) for n in nights_columns]
+            if all(price is None for price in row_prices):
+                continue
+            response += f"| {outbound} | " + " | ".join(
+                f"${price:.0f}" if price is not None else "-" for price in row_prices
+            ) + " |\n"
+        
+        response += f"""
+Prices combine the cheapest one-way fare in each direction and may differ when booked as a round-trip.
+
+Would you like me to show flights or plan a full trip for the cheapest dates?"""
+        
+        return response
+
+    def _format_travel_plan(
+        self,
+        plan: dict,
+        params: TravelSearchArgs,
+        activities: list = None,
+        hotel_checkout_date: str = None,
+        nearby_activities: list = None,
+        alternatives: list = None,
+    ) -> str:
         """
         Format a travel plan with markdown-style sections: total cost,
         outbound flight, return flight (with full details when available),
-        hotel details, activities, and trip summary.
+        hotel details, alternative plans, activities, and trip summary.
         
         Supports both one-way and round-trip flights:
         - One-way: Shows single flight, 1 night hotel
@@ -1064,6 +1405,8 @@ Would you like me to also find hotels at {params.destination_city or params.dest
             params: Travel search parameters
             activities: Optional list of activities at the destination
             hotel_checkout_date: Checkout date for hotel (used for one-way trips)
+            nearby_activities: Activities within walking distance of the hotel (with distance_km)
+            alternatives: Other plans (from find_top_plans), shown as one line each
         """
         if activities is None:
             activities = []
@@ -1156,6 +1499,21 @@ Would you like me to also find hotels at {params.destination_city or params.dest
 - **Check-in**: {hotel.get('check_in_time', '3:00 PM')}
 """
 
+        # Other airlines / hotels / a nonstop option, priced for the same stay
+        if alternatives:
+            response += """
+🔀 **Other Options**
+"""
+            for option in alternatives:
+                option_flight, option_hotel = option["flight"], option["hotel"]
+                option_stops = option_flight.get("stops", 0) or 0
+                option_total = (option_flight.get("price") or 0) + (option_hotel.get("price") or 0) * nights
+                response += (
+                    f"- **${option_total:.2f}**: {option_flight.get('airline', 'Unknown')} "
+                    f"({'Non-stop' if option_stops == 0 else f'{option_stops} stop' + ('s' if option_stops > 1 else '')}) "
+                    f"+ {option_hotel.get('name', 'Unknown Hotel')}\n"
+                )
+
         # Add activities section if activities were found
         if activities:
             response += f"""
@@ -1177,6 +1535,14 @@ Would you like me to also find hotels at {params.destination_city or params.dest
                 
                 response += f"- **{name}**{type_str} {rating_str} {reviews_str}\n"
 
+        # Add what is within walking distance of the hotel
+        if nearby_activities:
+            response += f"""
+🚶 **Walkable from {plan['hotel'].get('name', 'your hotel')}**
+"""
+            for activity in nearby_activities:
+                response += f"- **{activity.get('name', 'Unknown')}** ({activity['distance_km']:.1f} km)\n"
+
         # Format trip summary based on trip type
         if is_one_way:
             response += f"""
@@ -1203,6 +1569,68 @@ Would you like me to search for different dates or another destination?"""
 
         return response
 
+    def _format_multi_city_itinerary(self, itinerary: dict, legs: list) -> str:
+        """
+        Format a multi-city itinerary: total cost, then each flight with the
+        hotel in the city it lands in, and a trip summary.
+        
+        Args:
+            itinerary: Itinerary from find_cheapest_itinerary()
+            legs: The trip's legs (TripLeg), in travel order
+        """
+        flight_total = sum(leg_plan["flight"].get("price") or 0 for leg_plan in itinerary["legs"])
+        hotel_total = itinerary["total_price"] - flight_total
+        route = " → ".join([legs[0].origin] + [leg.destination for leg in legs])
+
+        response = f"""🎉 **Great news! I found the best deal for your multi-city trip!**
+
+**💰 Total Cost: ${itinerary['total_price']:.2f}**
+- ✈️ Flights: ${flight_total:.2f} ({len(legs)} one-way flights)
+- 🏨 Hotels: ${hotel_total:.2f}
+"""
+
+        for number, (leg, leg_plan) in enumerate(zip(legs, itinerary["legs"]), 1):
+            flight = leg_plan["flight"]
+            stops = flight.get("stops", 0) or 0
+            stops_text = "(Non-stop)" if stops == 0 else f"({stops} stop{'s' if stops > 1 else ''})"
+            response += f"""
+---
+
+✈️ **Flight {number}** ({leg.origin} → {leg.destination}, {leg.date})
+- **Airline**: {flight.get('airline', 'Unknown')}
+- **Price**: ${(flight.get('price') or 0):.2f}
+- **Departure**: {flight.get('departure_time', 'N/A')}
+- **Arrival**: {flight.get('arrival_time', 'N/A')}
+- **Stops**: {stops} {stops_text}
+"""
+            hotel = leg_plan["hotel"]
+            if hotel is not None:
+                nights = leg_plan["nights"]
+                if hotel.get("price_is_total"):
+                    price_text = f"${leg_plan['hotel_price']:.2f} total for {nights} night{'s' if nights != 1 else ''}"
+                else:
+                    price_text = f"${(hotel.get('price') or 0):.2f}/night × {nights} = ${leg_plan['hotel_price']:.2f} total"
+                rating = hotel.get("overall_rating") or hotel.get("rating") or 0
+                response += f"""
+🏨 **Hotel in {leg.destination_city or leg.destination}**
+- **Name**: {hotel.get('name', 'Unknown Hotel')}
+- **Price**: {price_text}
+- **Overall Rating**: {f"⭐ {rating}/5" if rating else "N/A"}
+- **Check-in**: {hotel.get('check_in_time', '3:00 PM')}
+"""
+
+        response += f"""
+---
+
+📋 **Trip Summary**
+- **Route**: {route}
+- **Dates**: {legs[0].date} to {legs[-1].date}
+- **Buffer to Hotels and Connections**: {itinerary.get('gap_hours', TRAVEL_HOTEL_CHECKIN_GAP_HOURS)} hours
+
+Would you like me to try different dates for any of the flights?"""
+
+        return response
+
     async def _reflection_node(self, state: GraphState) -> dict:
         """
         Reflect on the conversation to determine if further action is needed.
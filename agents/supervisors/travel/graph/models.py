@@ -13,6 +13,34 @@ from pydantic import BaseModel, Field
 from typing import Optional
 
 
+class TripLeg(BaseModel):
+    """
+    One flight leg of a multi-city trip.
+    
+    Attributes:
+        origin: Departure airport code (e.g., "LAX")
+        destination: Arrival airport code (e.g., "NRT")
+        destination_city: City name of the destination - used for hotel searches
+        date: Departure date in YYYY-MM-DD format
+    """
+    origin: Optional[str] = Field(
+        default=None,
+        description="Departure airport code (e.g., 'LAX') - converted from city name"
+    )
+    destination: Optional[str] = Field(
+        default=None,
+        description="Arrival airport code (e.g., 'NRT') - converted from city name"
+    )
+    destination_city: Optional[str] = Field(
+        default=None,
+        description="Arrival city name (e.g., 'Tokyo') - used for hotel searches"
+    )
+    date: Optional[str] = Field(
+        default=None,
+        description="Departure date of this leg in YYYY-MM-DD format"
+    )
+
+
 class TravelSearchArgs(BaseModel):
     """
     Arguments extracted from user input for travel search.
@@ -25,17 +53,27 @@ class TravelSearchArgs(BaseModel):
     - flight_only: Just flights (one-way or round-trip)
     - hotel_only: Just hotels at a location
     - activity_only: Just activities/things to do at a location
+    - multi_city: Flights over several legs (A→B→C→A) + hotels in each city
     
     Attributes:
-        search_type: Type of search - "full_trip", "flight_only", "hotel_only", "activity_only"
+        search_type: Type of search - "full_trip", "flight_only", "hotel_only", "activity_only", "multi_city"
         origin: Departure airport code (e.g., "LAX", "JFK") - for flights
         destination: Arrival airport code (e.g., "NRT", "CDG") - for flights
         origin_city: Original departure city name - for display
         destination_city: Original arrival city name - for hotels/activities
         location: General location for hotel-only or activity-only searches
+        activity_types: Activity categories the user asked for, if any
         start_date: Trip start date in YYYY-MM-DD format
         end_date: Trip end/return date in YYYY-MM-DD format
         is_one_way: True if user wants one-way flight only
+        multi_airport: True to also search the other airports of the origin/destination metro
+        search_radius_km: Radius for including nearby airports, if the user asked for one
+        flexible_dates: True if user asks for the cheapest dates within a range
+        outbound_from: Earliest departure date for flexible-date searches
+        outbound_to: Latest departure date for flexible-date searches
+        trip_nights_min: Shortest trip length in nights for flexible-date searches
+        trip_nights_max: Longest trip length in nights for flexible-date searches
+        legs: Flight legs in travel order for multi-city searches
         has_all_params: Whether all required parameters were extracted
         missing_params: Description of any missing parameters
     
@@ -44,10 +82,12 @@ class TravelSearchArgs(BaseModel):
         Flight only: "Find flights from Seattle to San Diego on Feb 20"
         Hotel only: "Find hotels in Paris for March 1-5"
         Activity only: "What things to do in San Francisco?"
+        Flexible dates: "Cheapest week in March from LAX to Tokyo"
+        Multi-city: "LAX to Tokyo May 1, Tokyo to Seoul May 5, back to LAX May 9"
     """
     search_type: str = Field(
         default="full_trip",
-        description="Type of search: 'full_trip' (flight+hotel+activities), 'flight_only', 'hotel_only', 'activity_only'"
+        description="Type of search: 'full_trip' (flight+hotel+activities), 'flight_only', 'hotel_only', 'activity_only', 'multi_city'"
     )
     origin: Optional[str] = Field(
         default=None,
@@ -69,6 +109,10 @@ class TravelSearchArgs(BaseModel):
         default=None,
         description="General location for hotel-only or activity-only searches (e.g., 'Paris', 'San Francisco')"
     )
+    activity_types: list[str] = Field(
+        default_factory=list,
+        description="Activity categories the user asked for (e.g. ['museums', 'parks', 'restaurants']); empty for general things to do"
+    )
     start_date: Optional[str] = Field(
         default=None,
         description="Trip start/departure date in YYYY-MM-DD format"
@@ -81,6 +125,38 @@ class TravelSearchArgs(BaseModel):
         default=False,
         description="True if user wants one-way flight only (no return date needed)"
     )
+    multi_airport: bool = Field(
+        default=False,
+        description="True if user wants flights from/to any nearby airport (e.g. 'any NYC airport', 'airports near Boston')"
+    )
+    search_radius_km: Optional[float] = Field(
+        default=None,
+        description="Radius in km for nearby airports if the user gives one (e.g. 'within 100 km')"
+    )
+    flexible_dates: bool = Field(
+        default=False,
+        description="True if user wants the cheapest dates within a range (e.g. 'cheapest week in March')"
+    )
+    outbound_from: Optional[str] = Field(
+        default=None,
+        description="Earliest departure date in YYYY-MM-DD format (flexible-date searches)"
+    )
+    outbound_to: Optional[str] = Field(
+        default=None,
+        description="Latest departure date in YYYY-MM-DD format (flexible-date searches)"
+    )
+    trip_nights_min: Optional[int] = Field(
+        default=None,
+        description="Shortest acceptable trip length in nights (flexible-date searches)"
+    )
+    trip_nights_max: Optional[int] = Field(
+        default=None,
+        description="Longest acceptable trip length in nights (flexible-date searches)"
+    )
+    legs: list[TripLeg] = Field(
+        default_factory=list,
+        description="Flight legs in travel order for multi-city trips (e.g. LAX→NRT, NRT→ICN, ICN→LAX)"
+    )
     has_all_params: bool = Field(
         default=False,
         description="True if all required parameters were extracted based on search_type"
@@ -9,8 +9,11 @@ These tools use the A2A protocol to send requests and receive responses
 via NATS transport.
 """
 
+import asyncio
 import logging
 import json
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
 from uuid import uuid4
 
 from langchain_core.tools import tool, ToolException
@@ -34,8 +37,11 @@ from config.config import (
     DEFAULT_MESSAGE_TRANSPORT,
     TRANSPORT_SERVER_ENDPOINT,
     TRAVEL_HOTEL_CHECKIN_GAP_HOURS,
+    SERPAPI_HOTEL_MAX_PAGES,
 )
 from agents.travel.travel_logic import find_cheapest_plan
+from agents.travel.exceptions import SerpApiBudgetExhaustedError, SerpApiUnavailableError
+from agents.travel.results import FlightTable, HotelTable
 
 logger = logging.getLogger("lungo.travel.supervisor.tools")
 
@@ -48,6 +54,52 @@ class A2AAgentError(ToolException):
 # Create transport at module level (shared across all calls)
 _transport = None
 
+# Last successful results per search (bounded LRU)
+# Served as a fallback when an agent reports that the SerpAPI budget is exhausted
+# or that SerpAPI is unavailable (circuit breaker open, nothing cached agent-side)
+_LAST_RESULTS_LIMIT = 128
+_last_results: OrderedDict[tuple, list | dict] = OrderedDict()
+_FALLBACK_ERROR_TYPES = (SerpApiBudgetExhaustedError.error_type, SerpApiUnavailableError.error_type)
+
+
+def _remember_results(key: tuple, items: list | dict) -> None:
+    """Store the latest successful results for a search key."""
+    _last_results[key] = items
+    _last_results.move_to_end(key)
+    while len(_last_results) > _LAST_RESULTS_LIMIT:
+        _last_results.popitem(last=False)
+
+
+def _fallback_results(key: tuple, result: dict) -> list | dict:
+    """
+    Return cached results for a failed search if SerpAPI was out of budget or unavailable.
+    
+    Args:
+        key: Search key used with _remember_results
+        result: Parsed error response from the agent
+    
+    Returns:
+        Previously seen results for the same search, or an empty list
+    """
+    if result.get("error_type") in _FALLBACK_ERROR_TYPES and key in _last_results:
+        logger.warning(f"SerpAPI {result['error_type']}, serving last known results for {key}")
+        return _last_results[key]
+    return []
+
+def _decode_flights(result: dict) -> list:
+    """Return the flight dicts of a successful Flight Agent response."""
+    if "flight_table" in result:
+        return FlightTable.from_columns(result["flight_table"]).to_dicts()
+    return result.get("flights", [])
+
+
+def _decode_hotels(result: dict) -> list:
+    """Return the hotel dicts of a successful Hotel Agent response."""
+    if "hotel_table" in result:
+        return HotelTable.from_columns(result["hotel_table"]).to_dicts()
+    return result.get("hotels", [])
+
+
 def _get_transport():
     """Get or create the transport instance."""
     global _transport
@@ -141,6 +193,7 @@ async def _search_flights_internal(
     outbound_date: str,
     return_date: str = None,
     is_one_way: bool = False,
+    radius_km: float = None,
 ) -> str:
     """
     Internal function to search for flights using the Flight Search Agent via A2A.
@@ -156,6 +209,8 @@ async def _search_flights_internal(
         outbound_date: Departure date (YYYY-MM-DD)
         return_date: Return date (YYYY-MM-DD) - optional for one-way
         is_one_way: If True, search for one-way flights only
+        radius_km: If set, also search airports in the same metro area and within
+                   this radius of origin and destination (0 = metro airports only)
         
     Returns:
         JSON string with flight results
@@ -169,6 +224,8 @@ async def _search_flights_internal(
         message = f"origin:{origin} destination:{destination} outbound:{outbound_date} type:oneway"
     else:
         message = f"origin:{origin} destination:{destination} outbound:{outbound_date} return:{return_date}"
+    if radius_km is not None:
+        message += f" radius_km:{radius_km:g}"
     
     try:
         result = await _send_a2a_message(FLIGHT_AGENT_CARD, message)
@@ -178,10 +235,49 @@ async def _search_flights_internal(
         return json.dumps({"status": "error", "message": str(e)})
 
 
+async def _search_flight_grid_internal(
+    origin: str,
+    destination: str,
+    outbound_from: str,
+    outbound_to: str,
+    nights_min: int,
+    nights_max: int,
+) -> str:
+    """
+    Internal function to search a flexible-date fare grid via the Flight Search Agent.
+    
+    Args:
+        origin: Departure airport code (e.g., "LAX")
+        destination: Arrival airport code (e.g., "NRT")
+        outbound_from: Earliest departure date (YYYY-MM-DD)
+        outbound_to: Latest departure date (YYYY-MM-DD)
+        nights_min: Shortest trip length in nights
+        nights_max: Longest trip length in nights
+        
+    Returns:
+        JSON string with the fare grid
+    """
+    logger.info(f"Sending A2A fare grid request to Flight Agent: {origin} -> {destination}")
+    
+    message = (
+        f"origin:{origin} destination:{destination} outbound_from:{outbound_from} "
+        f"outbound_to:{outbound_to} nights_min:{nights_min} nights_max:{nights_max} type:grid"
+    )
+    
+    try:
+        result = await _send_a2a_message(FLIGHT_AGENT_CARD, message)
+        return result
+    except A2AAgentError as e:
+        logger.error(f"Flight grid A2A error: {e}")
+        return json.dumps({"status": "error", "message": str(e)})
+
+
 async def _search_hotels_internal(
     location: str,
     check_in_date: str,
     check_out_date: str,
+    page_token: str = None,
+    paged: bool = False,
 ) -> str:
     """
     Internal function to search for hotels using the Hotel Search Agent via A2A.
@@ -191,6 +287,8 @@ async def _search_hotels_internal(
         location: City or area name (e.g., "Tokyo")
         check_in_date: Check-in date (YYYY-MM-DD)
         check_out_date: Check-out date (YYYY-MM-DD)
+        page_token: next_page_token from a previous paged response
+        paged: Return the whole results page and its next_page_token
         
     Returns:
         JSON string with hotel results
@@ -199,6 +297,10 @@ async def _search_hotels_internal(
     
     # Format message for the hotel agent
     message = f"location:{location} check_in:{check_in_date} check_out:{check_out_date}"
+    if paged or page_token:
+        message += " paged:true"
+    if page_token:
+        message += f" page_token:{page_token}"
     
     try:
         result = await _send_a2a_message(HOTEL_AGENT_CARD, message)
@@ -278,6 +380,7 @@ async def get_flights_via_a2a(
     outbound_date: str,
     return_date: str = None,
     is_one_way: bool = False,
+    radius_km: float = None,
 ) -> list:
     """
     Get flights via A2A and parse the response.
@@ -288,6 +391,7 @@ async def get_flights_via_a2a(
     Supports both round-trip and one-way flights:
     - Round-trip: provide outbound_date and return_date
     - One-way: provide outbound_date only, set is_one_way=True
+    - Multi-airport: set radius_km to include nearby/metro airports
     
     Note: Uses _search_flights_internal (not the @tool decorated version)
     to avoid the 'StructuredTool object is not callable' error.
@@ -295,21 +399,90 @@ async def get_flights_via_a2a(
     Returns:
         List of flight dictionaries
     """
+    result = await get_flight_results_via_a2a(
+        origin, destination, outbound_date, return_date, is_one_way, radius_km
+    )
+    return result["flights"]
+
+
+async def get_flight_results_via_a2a(
+    origin: str,
+    destination: str,
+    outbound_date: str,
+    return_date: str = None,
+    is_one_way: bool = False,
+    radius_km: float = None,
+) -> dict:
+    """
+    Get flights via A2A together with the Flight Agent's price insight.
+    
+    Same arguments as get_flights_via_a2a.
+    
+    Returns:
+        Dictionary with:
+        - flights: List of flight dictionaries
+        - price_insight: Cheapest fare compared with the locally recorded fare
+          history (see agents.travel.fare_history), or None
+        - stale: True if SerpAPI was unavailable and last-known results were served
+    """
     # Use the internal function (not the @tool decorated version)
     result_json = await _search_flights_internal(
-        origin, destination, outbound_date, return_date, is_one_way
+        origin, destination, outbound_date, return_date, is_one_way, radius_km
     )
     
+    cache_key = ("flights", origin, destination, outbound_date, return_date, is_one_way, radius_km)
+    
     try:
         result = json.loads(result_json)
         if result.get("status") == "success":
-            return result.get("flights", [])
+            flights = _decode_flights(result)
+            _remember_results(cache_key, flights)
+            return {
+                "flights": flights,
+                "price_insight": result.get("price_insight"),
+                "stale": result.get("stale", False),
+            }
         else:
             logger.error(f"Flight search failed: {result.get('message')}")
-            return []
+            flights = _fallback_results(cache_key, result)
+            return {"flights": flights, "price_insight": None, "stale": bool(flights)}
     except json.JSONDecodeError:
         logger.error(f"Failed to parse flight results: {result_json}")
-        return []
+        return {"flights": [], "price_insight": None, "stale": False}
+
+
+async def get_flight_grid_via_a2a(
+    origin: str,
+    destination: str,
+    outbound_from: str,
+    outbound_to: str,
+    nights_min: int,
+    nights_max: int,
+) -> dict:
+    """
+    Get a flexible-date fare grid via A2A and parse the response.
+    
+    Returns:
+        Fare grid dictionary (see search_flights_grid), or an empty dict on failure
+    """
+    result_json = await _search_flight_grid_internal(
+        origin, destination, outbound_from, outbound_to, nights_min, nights_max
+    )
+    
+    cache_key = ("flight_grid", origin, destination, outbound_from, outbound_to, nights_min, nights_max)
+    
+    try:
+        result = json.loads(result_json)
+        if result.get("status") == "success":
+            grid = result.get("grid", {})
+            _remember_results(cache_key, grid)
+            return grid
+        else:
+            logger.error(f"Flight grid search failed: {result.get('message')}")
+            return _fallback_results(cache_key, result) or {}
+    except json.JSONDecodeError:
+        logger.error(f"Failed to parse flight grid results: {result_json}")
+        return {}
 
 
 async def get_hotels_via_a2a(location: str, check_in_date: str, check_out_date: str) -> list:
@@ -325,32 +498,156 @@ async def get_hotels_via_a2a(location: str, check_in_date: str, check_out_date:
     Returns:
         List of hotel dictionaries
     """
+    result = await get_hotel_results_via_a2a(location, check_in_date, check_out_date)
+    return result["hotels"]
+
+
+async def get_hotel_results_via_a2a(location: str, check_in_date: str, check_out_date: str) -> dict:
+    """
+    Get hotels via A2A together with the Hotel Agent's price insight.
+    
+    Returns:
+        Dictionary with:
+        - hotels: List of hotel dictionaries
+        - price_insight: Cheapest rate compared with the locally recorded rate
+          history (see agents.travel.fare_history), or None
+        - stale: True if SerpAPI was unavailable and last-known results were served
+    """
     # Use the internal function (not the @tool decorated version)
     result_json = await _search_hotels_internal(location, check_in_date, check_out_date)
     
+    cache_key = ("hotels", location, check_in_date, check_out_date)
+    
     try:
         result = json.loads(result_json)
         if result.get("status") == "success":
-            return result.get("hotels", [])
+            hotels = _decode_hotels(result)
+            _remember_results(cache_key, hotels)
+            return {
+                "hotels": hotels,
+                "price_insight": result.get("price_insight"),
+                "stale": result.get("stale", False),
+            }
         else:
             logger.error(f"Hotel search failed: {result.get('message')}")
-            return []
+            hotels = _fallback_results(cache_key, result)
+            return {"hotels": hotels, "price_insight": None, "stale": bool(hotels)}
     except json.JSONDecodeError:
         logger.error(f"Failed to parse hotel results: {result_json}")
-        return []
+        return {"hotels": [], "price_insight": None, "stale": False}
+
+
+async def get_multi_city_results_via_a2a(
+    legs: list[tuple[str, str, str]],
+    stays: list[Optional[tuple[str, str, str]]],
+) -> dict:
+    """
+    Search every leg and stay of a multi-city trip at once via A2A.
+    
+    All one-way leg searches (Flight Agent) and hotel searches (Hotel Agent)
+    are sent concurrently. A search that appears more than once in the trip
+    (e.g. the same leg or the same city and dates twice) is sent once; legs
+    searched before (one-way, return-leg or fare-grid searches) are served
+    from the agents' SerpAPI cache.
+    
+    Args:
+        legs: (origin airport, destination airport, date) per leg, in travel order
+        stays: (city, check-in date, check-out date) per stay after each leg,
+               None where no hotel is needed
+    
+    Returns:
+        Dictionary with:
+        - leg_flights: Flight dictionaries per leg
+        - stay_hotels: Hotel dictionaries per stay (None where no hotel is needed)
+        - stale: True if SerpAPI was unavailable for any search and
+          last-known results were served
+    """
+    logger.info(f"Searching multi-city trip via A2A: {len(legs)} leg(s), {sum(1 for s in stays if s)} stay(s)")
+    
+    searches = {}
+    for origin, destination, date in legs:
+        key = ("flights", origin, destination, date)
+        if key not in searches:
+            searches[key] = get_flight_results_via_a2a(origin, destination, date, is_one_way=True)
+    for stay in stays:
+        if stay is not None and ("hotels", *stay) not in searches:
+            searches[("hotels", *stay)] = get_hotel_results_via_a2a(*stay)
+    
+    results = dict(zip(searches, await asyncio.gather(*searches.values())))
+    
+    return {
+        "leg_flights": [results[("flights", *leg)]["flights"] for leg in legs],
+        "stay_hotels": [results[("hotels", *stay)]["hotels"] if stay is not None else None for stay in stays],
+        "stale": any(result["stale"] for result in results.values()),
+    }
+
+
+async def iter_hotel_pages_via_a2a(
+    location: str,
+    check_in_date: str,
+    check_out_date: str,
+    max_pages: int = SERPAPI_HOTEL_MAX_PAGES,
+) -> AsyncIterator[list]:
+    """
+    Yield hotels page by page via A2A, following the Hotel Agent's next_page_token.
+    
+    The next page is only requested when the consumer asks for it, so
+    travel_logic.collect_hotel_pages can stop paying for pages once it has
+    enough candidates.
+    
+    If the first page fails with a SerpAPI budget error, the last known
+    first-page results are yielded instead (same fallback as get_hotels_via_a2a).
+    
+    Yields:
+        List of hotel dictionaries per page
+    """
+    cache_key = ("hotels", location, check_in_date, check_out_date)
+    page_token = None
+    
+    for page in range(max(1, max_pages)):
+        result_json = await _search_hotels_internal(
+            location, check_in_date, check_out_date, page_token=page_token, paged=True
+        )
+        try:
+            result = json.loads(result_json)
+        except json.JSONDecodeError:
+            logger.error(f"Failed to parse hotel results: {result_json}")
+            return
+        
+        if result.get("status") != "success":
+            logger.error(f"Hotel search failed on page {page + 1}: {result.get('message')}")
+            if page == 0:
+                fallback = _fallback_results(cache_key, result)
+                if fallback:
+                    yield fallback
+            return
+        
+        hotels = _decode_hotels(result)
+        if page == 0:
+            _remember_results(cache_key, hotels)
+        yield hotels
+        
+        page_token = result.get("next_page_token")
+        if not page_token:
+            return
 
 
 # =============================================================================
 # Activity Search Functions (A2A communication with Activity Agent)
 # =============================================================================
 
-async def _search_activities_internal(location: str, activity_type: str = "things to do") -> str:
+async def _search_activities_internal(
+    location: str,
+    activity_type: str = "things to do",
+    activity_types: list = None,
+) -> str:
     """
     Search for activities using the Activity Search Agent via A2A.
     
     Args:
         location: City or area name (e.g., "San Jose, CA", "Tokyo")
         activity_type: Type of activities to search for (default: "things to do")
+        activity_types: Several types to search at once (merged into one list by the agent)
         
     Returns:
         JSON string with activity results
@@ -360,7 +657,11 @@ async def _search_activities_internal(location: str, activity_type: str = "thing
     # Format message for the activity agent
     # Replace spaces with underscores in location to handle parsing
     location_formatted = location.replace(" ", "_")
-    message = f"location:{location_formatted} type:{activity_type.replace(' ', '_')}"
+    if activity_types:
+        types = ",".join(t.replace(" ", "_") for t in activity_types)
+        message = f"location:{location_formatted} types:{types}"
+    else:
+        message = f"location:{location_formatted} type:{activity_type.replace(' ', '_')}"
     
     try:
         result = await _send_a2a_message(ACTIVITY_AGENT_CARD, message)
@@ -387,13 +688,49 @@ async def get_activities_via_a2a(location: str, activity_type: str = "things to
     # Use the internal function (not the @tool decorated version)
     result_json = await _search_activities_internal(location, activity_type)
     
+    cache_key = ("activities", location, activity_type)
+    
+    try:
+        result = json.loads(result_json)
+        if result.get("status") == "success":
+            activities = result.get("activities", [])
+            _remember_results(cache_key, activities)
+            return activities
+        else:
+            logger.error(f"Activity search failed: {result.get('message')}")
+            return _fallback_results(cache_key, result)
+    except json.JSONDecodeError:
+        logger.error(f"Failed to parse activity results: {result_json}")
+        return []
+
+
+async def get_activities_multi_via_a2a(location: str, activity_types: list) -> list:
+    """
+    Get several activity types in one A2A round trip.
+    
+    The Activity Agent searches the types concurrently, merges places found
+    under several types and returns one ranked list.
+    
+    Args:
+        location: City name (e.g., "Paris, France")
+        activity_types: Types to search (e.g. ["museums", "parks", "restaurants"])
+    
+    Returns:
+        List of activity dictionaries, each with "categories" (the types it matched)
+    """
+    result_json = await _search_activities_internal(location, activity_types=activity_types)
+    
+    cache_key = ("activities", location, tuple(activity_types))
+    
     try:
         result = json.loads(result_json)
         if result.get("status") == "success":
-            return result.get("activities", [])
+            activities = result.get("activities", [])
+            _remember_results(cache_key, activities)
+            return activities
         else:
             logger.error(f"Activity search failed: {result.get('message')}")
-            return []
+            return _fallback_results(cache_key, result)
     except json.JSONDecodeError:
         logger.error(f"Failed to parse activity results: {result_json}")
         return []
@@ -441,14 +778,14 @@ async def find_best_travel_plan(
         # Parse flight results
         try:
             flight_data = json.loads(flight_result)
-            flights = flight_data.get("flights", []) if flight_data.get("status") == "success" else []
+            flights = _decode_flights(flight_data) if flight_data.get("status") == "success" else []
         except json.JSONDecodeError:
             flights = []
         
         # Parse hotel results
         try:
             hotel_data = json.loads(hotel_result)
-            hotels = hotel_data.get("hotels", []) if hotel_data.get("status") == "success" else []
+            hotels = _decode_hotels(hotel_data) if hotel_data.get("status") == "success" else []
         except json.JSONDecodeError:
             hotels = []
         
@@ -12,17 +12,42 @@ Key components:
 - travel_logic: Business logic for filtering hotels and finding optimal plans
 """
 
-from agents.travel.serpapi_tools import search_flights, search_hotels
+from agents.travel.serpapi_tools import (
+    search_flights,
+    search_flights_grid,
+    search_hotels,
+    iter_hotel_pages,
+)
 from agents.travel.travel_logic import (
     extract_arrival_datetime,
     filter_valid_hotels,
     find_cheapest_plan,
+    find_top_plans,
+    find_pareto_plans,
+    rank_plans,
+    find_cheapest_itinerary,
+    PlanProblem,
+    solve_plan_batch,
+    collect_hotel_pages,
+    walkable_activities,
+    rank_hotels_by_proximity,
 )
 
 __all__ = [
     "search_flights",
+    "search_flights_grid",
     "search_hotels",
+    "iter_hotel_pages",
     "extract_arrival_datetime",
     "filter_valid_hotels",
     "find_cheapest_plan",
+    "find_top_plans",
+    "find_pareto_plans",
+    "rank_plans",
+    "find_cheapest_itinerary",
+    "PlanProblem",
+    "solve_plan_batch",
+    "collect_hotel_pages",
+    "walkable_activities",
+    "rank_hotels_by_proximity",
 ]
@@ -0,0 +1,169 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Activity Merging Module
+
+Merges the results of several activity searches (e.g. museums, parks and
+restaurants in one city) into one deduplicated, ranked list.
+
+Two results are the same place if:
+- They have the same SerpAPI place_id, or
+- They are within a few metres of each other and have matching names (one
+  name contains the other's words after normalization), or
+- Neither has coordinates and both name and address match
+
+Nearby-place checks use a small lat/lon grid (cells about one merge radius
+wide), so each place is only compared with places in the surrounding cells.
+
+Places are ranked by a review-weighted rating: the rating is shrunk towards a
+prior for places with few reviews, so a 5.0 with 3 reviews does not beat a
+4.7 with 20,000. Unrated places come last. Ties go to places found under more
+categories, then to more reviews, then to the order they were found in.
+
+Key components:
+- activity_score: Ranking score of one activity
+- merge_activities: Deduplicate and rank the results of several searches
+"""
+
+import math
+import re
+from typing import Optional
+
+from agents.travel.airports import haversine_km
+
+# Review-weighted rating: a place's rating counts as if PRIOR_REVIEWS extra
+# reviews of PRIOR_RATING had been added
+PRIOR_RATING = 4.0
+PRIOR_REVIEWS = 50
+
+# Approximate length of one degree of latitude in metres
+_METRES_PER_DEGREE = 111_200.0
+
+# Fields filled in from a duplicate when the kept result does not have them
+_FILLABLE_FIELDS = (
+    "place_id", "address", "type", "description", "hours", "phone",
+    "website", "thumbnail", "price_level", "latitude", "longitude",
+)
+
+
+def activity_score(activity: dict) -> float:
+    """Return the review-weighted rating of an activity (0 if unrated)."""
+    rating = activity.get("rating") or 0
+    if not rating:
+        return 0.0
+    reviews = activity.get("reviews") or 0
+    return (rating * reviews + PRIOR_RATING * PRIOR_REVIEWS) / (reviews + PRIOR_REVIEWS)
+
+
+def merge_activities(results: list[tuple[str, list[dict]]], radius_m: float = 50.0) -> list[dict]:
+    """
+    Merge the results of several activity searches.
+
+    Args:
+        results: (activity_type, activities) pairs, in the order searched
+        radius_m: Places with matching names closer than this are merged
+
+    Returns:
+        Deduplicated activities, best first. Each is a copy of the first result
+        seen for the place, with missing fields filled in from its duplicates
+        and a "categories" list of the activity types it was found under.
+    """
+    merged: list[dict] = []
+    by_place_id: dict[str, int] = {}
+    by_name_address: dict[tuple[str, str], int] = {}
+    grid: dict[tuple[int, int], list[int]] = {}
+    cell_degrees = max(radius_m, 1.0) / _METRES_PER_DEGREE
+    lon_scale: Optional[float] = None
+
+    for activity_type, activities in results:
+        for activity in activities:
+            name = _normalize_name(activity.get("name", ""))
+            lat, lon = activity.get("latitude"), activity.get("longitude")
+            has_gps = lat is not None and lon is not None
+            if has_gps and lon_scale is None:
+                # Longitude degrees shrink away from the equator; results are for
+                # one city, so the first place's latitude is good enough
+                lon_scale = max(math.cos(math.radians(lat)), 0.01)
+
+            index = by_place_id.get(activity.get("place_id")) if activity.get("place_id") else None
+            if index is None and has_gps:
+                index = _find_nearby(merged, grid, name, lat, lon, cell_degrees, lon_scale, radius_m)
+            if index is None and not has_gps:
+                index = by_name_address.get((name, _normalize_name(activity.get("address", ""))))
+
+            if index is None:
+                index = len(merged)
+                merged.append({**activity, "categories": []})
+                if has_gps:
+                    grid.setdefault(_cell(lat, lon, cell_degrees, lon_scale), []).append(index)
+                else:
+                    by_name_address[(name, _normalize_name(activity.get("address", "")))] = index
+            else:
+                _fill_missing(merged[index], activity)
+
+            kept = merged[index]
+            if kept.get("place_id"):
+                by_place_id.setdefault(kept["place_id"], index)
+            if activity_type not in kept["categories"]:
+                kept["categories"].append(activity_type)
+
+    order = sorted(
+        range(len(merged)),
+        key=lambda i: (
+            -activity_score(merged[i]),
+            -len(merged[i]["categories"]),
+            -(merged[i].get("reviews") or 0),
+            i,
+        ),
+    )
+    return [merged[i] for i in order]
+
+
+def _find_nearby(
+    merged: list[dict],
+    grid: dict[tuple[int, int], list[int]],
+    name: str,
+    lat: float,
+    lon: float,
+    cell_degrees: float,
+    lon_scale: float,
+    radius_m: float,
+) -> Optional[int]:
+    """Return the index of a merged place near (lat, lon) with a matching name, if any."""
+    row, col = _cell(lat, lon, cell_degrees, lon_scale)
+    for r in (row - 1, row, row + 1):
+        for c in (col - 1, col, col + 1):
+            for index in grid.get((r, c), ()):
+                other = merged[index]
+                other_name = _normalize_name(other.get("name", ""))
+                if not _names_match(name, other_name):
+                    continue
+                if haversine_km(lat, lon, other["latitude"], other["longitude"]) * 1000.0 <= radius_m:
+                    return index
+    return None
+
+
+def _cell(lat: float, lon: float, cell_degrees: float, lon_scale: float) -> tuple[int, int]:
+    """Return the grid cell of a point (cells are about cell_degrees of latitude wide)."""
+    return (math.floor(lat / cell_degrees), math.floor(lon * lon_scale / cell_degrees))
+
+
+def _normalize_name(name: str) -> str:
+    """Lowercase a name and collapse punctuation and whitespace."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(name).lower()))
+
+
+def _names_match(a: str, b: str) -> bool:
+    """Return True if two normalized names refer to the same place."""
+    return bool(a and b) and (a == b or f" {a} " in f" {b} " or f" {b} " in f" {a} ")
+
+
+def _fill_missing(kept: dict, duplicate: dict) -> None:
+    """Fill empty fields of a kept result from a duplicate."""
+    for field in _FILLABLE_FIELDS:
+        if not kept.get(field) and duplicate.get(field):
+            kept[field] = duplicate[field]
+    if (duplicate.get("reviews") or 0) > (kept.get("reviews") or 0):
+        kept["reviews"] = duplicate["reviews"]
+        kept["rating"] = duplicate.get("rating") or kept.get("rating")
@@ -0,0 +1,205 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Airport Catalog Module
+
+Offline airport catalog bundled with the travel agents (data/airports.csv),
+used to resolve city names to airport codes and to find alternative airports
+for multi-airport searches (e.g. JFK, EWR and LGA for "New York").
+
+Each airport has coordinates, a display city (used for hotel searches) and a
+metro grouping. Airports are bucketed into a 1°x1° lat/lon grid so radius
+queries only compute distances for airports in nearby cells.
+
+Key components:
+- Airport: One catalog entry
+- AirportCatalog: City lookup, metro groupings and radius queries
+- get_airport_catalog: Lazily loaded shared catalog
+"""
+
+import csv
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+# Bundled catalog file
+_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "data", "airports.csv")
+
+# Mean Earth radius used for great-circle distances
+_EARTH_RADIUS_KM = 6371.0
+
+# Approximate length of one degree of latitude
+_KM_PER_DEGREE = 111.2
+
+
+@dataclass(frozen=True)
+class Airport:
+    """
+    One airport in the catalog.
+
+    Attributes:
+        code: IATA code (e.g. "JFK")
+        name: Airport name
+        city: Display city used for hotel searches (e.g. "New York, NY")
+        country: ISO country code
+        metro: Metro area the airport serves (e.g. "New York")
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+    """
+    code: str
+    name: str
+    city: str
+    country: str
+    metro: str
+    lat: float
+    lon: float
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class AirportCatalog:
+    """
+    Airport lookup by code, city name, metro area and distance.
+
+    Example:
+        >>> catalog = get_airport_catalog()
+        >>> catalog.code_for_city("new york")
+        'JFK'
+        >>> [a.code for a, _ in catalog.nearby_airports("JFK", radius_km=0)]
+        ['JFK', 'LGA', 'EWR']
+    """
+
+    def __init__(self, airports: list[Airport], city_names: dict[str, str]):
+        """
+        Build the lookup tables and the spatial grid.
+
+        Args:
+            airports: Catalog entries
+            city_names: Lowercase city name or alias -> IATA code of the city's main airport
+        """
+        self._by_code = {airport.code: airport for airport in airports}
+        self._city_names = dict(city_names)
+        self._by_metro: dict[str, list[Airport]] = {}
+        self._grid: dict[tuple[int, int], list[Airport]] = {}
+
+        for airport in airports:
+            self._by_metro.setdefault(airport.metro, []).append(airport)
+            self._grid.setdefault(self._cell(airport.lat, airport.lon), []).append(airport)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "AirportCatalog":
+        """
+        Load a catalog from CSV.
+
+        Columns: iata, name, city, country, metro, lat, lon, city_names
+        (city_names is a ';'-separated list of names that resolve to this airport).
+        """
+        airports = []
+        city_names = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                code = row["iata"].strip().upper()
+                airports.append(Airport(
+                    code=code,
+                    name=row["name"],
+                    city=row["city"],
+                    country=row["country"],
+                    metro=row["metro"],
+                    lat=float(row["lat"]),
+                    lon=float(row["lon"]),
+                ))
+                for name in (row.get("city_names") or "").split(";"):
+                    if name.strip():
+                        city_names[name.strip().lower()] = code
+        return cls(airports, city_names)
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def get(self, code: str) -> Optional[Airport]:
+        """Return the airport for an IATA code, or None if unknown."""
+        return self._by_code.get(code.strip().upper())
+
+    def code_for_city(self, name: str) -> Optional[str]:
+        """Return the main airport code for a city name or alias (case-insensitive)."""
+        return self._city_names.get(name.strip().lower())
+
+    def city_for(self, code: str) -> Optional[str]:
+        """Return the display city for an airport code, or None if unknown."""
+        airport = self.get(code)
+        return airport.city if airport else None
+
+    def metro_airports(self, code: str) -> list[Airport]:
+        """Return all airports in the same metro area as code (including itself)."""
+        airport = self.get(code)
+        return list(self._by_metro.get(airport.metro, [])) if airport else []
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> list[tuple[Airport, float]]:
+        """
+        Return airports within radius_km of a point, nearest first.
+
+        Only grid cells overlapping the radius' bounding box are scanned.
+        """
+        lat_span = int(math.ceil(radius_km / _KM_PER_DEGREE))
+        # Longitude degrees shrink towards the poles; scan all columns near them
+        cos_lat = math.cos(math.radians(min(abs(lat) + lat_span, 89.0)))
+        lon_span = min(180, int(math.ceil(radius_km / (_KM_PER_DEGREE * max(cos_lat, 1e-6)))))
+
+        row, col = self._cell(lat, lon)
+        columns = range(-180, 180) if lon_span >= 180 else range(col - lon_span, col + lon_span + 1)
+
+        results = []
+        for r in range(row - lat_span, row + lat_span + 1):
+            for c in columns:
+                for airport in self._grid.get((r, (c + 180) % 360 - 180), ()):
+                    distance = haversine_km(lat, lon, airport.lat, airport.lon)
+                    if distance <= radius_km:
+                        results.append((airport, distance))
+        results.sort(key=lambda item: (item[1], item[0].code))
+        return results
+
+    def nearby_airports(self, code: str, radius_km: float = 0.0) -> list[tuple[Airport, float]]:
+        """
+        Return the airport, its metro siblings and all airports within radius_km.
+
+        Args:
+            code: IATA code to search around
+            radius_km: Extra search radius (0 = metro siblings only)
+
+        Returns:
+            (airport, distance_km) pairs, nearest first (the airport itself first);
+            empty if the code is not in the catalog
+        """
+        airport = self.get(code)
+        if airport is None:
+            return []
+
+        found = {
+            other.code: (other, haversine_km(airport.lat, airport.lon, other.lat, other.lon))
+            for other in self.metro_airports(code)
+        }
+        if radius_km > 0:
+            for other, distance in self.within_radius(airport.lat, airport.lon, radius_km):
+                found.setdefault(other.code, (other, distance))
+        return sorted(found.values(), key=lambda item: (item[0].code != airport.code, item[1], item[0].code))
+
+    @staticmethod
+    def _cell(lat: float, lon: float) -> tuple[int, int]:
+        """Return the 1°x1° grid cell of a point."""
+        return (math.floor(lat), math.floor(lon))
+
+
+@lru_cache(maxsize=1)
+def get_airport_catalog() -> AirportCatalog:
+    """Return the bundled airport catalog (loaded on first use)."""
+    return AirportCatalog.from_csv(_CATALOG_PATH)
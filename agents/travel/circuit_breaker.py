@@ -0,0 +1,192 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Circuit Breaker Module
+
+Stops sending requests to a SerpAPI engine while it is failing, so callers
+fail fast (and fall back to cached results) instead of each waiting for the
+HTTP timeout.
+
+States:
+- closed: Requests flow; failures are counted
+- open: Requests are rejected without calling SerpAPI, for open_seconds
+- half_open: A limited number of trial requests (probes) are let through;
+  a successful probe closes the breaker, a failed one opens it again
+
+The breaker opens after failure_threshold consecutive failures, or when at
+least min_requests requests were seen in the last window_seconds and the
+share of failures among them reached error_rate_threshold.
+
+Only upstream failures count (timeouts, transport errors, 5xx, 429) - bad
+requests and local budget rejections say nothing about SerpAPI's health.
+
+Key components:
+- CircuitBreaker: Breaker state machine for one engine
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger("lungo.travel.circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one SerpAPI engine.
+
+    Every call allowed by allow() must report its outcome with exactly one of
+    record_success(), record_failure() or record_ignored().
+
+    Example:
+        >>> breaker = CircuitBreaker("google_flights")
+        >>> if breaker.allow():
+        ...     try:
+        ...         data = await send(params)
+        ...     except httpx.TimeoutException:
+        ...         breaker.record_failure()
+        ...         raise
+        ...     breaker.record_success()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        error_rate_threshold: float = 0.5,
+        window_seconds: float = 60.0,
+        min_requests: int = 10,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        enabled: bool = True,
+    ):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            name: Engine the breaker guards (used in logs)
+            failure_threshold: Consecutive failures that open the breaker
+            error_rate_threshold: Failure share (0-1) over the window that opens the breaker
+            window_seconds: Rolling window for the error rate
+            min_requests: Requests in the window needed before the error rate counts
+            open_seconds: How long the breaker stays open before probing
+            half_open_probes: Trial requests allowed at once while half-open
+            enabled: If False, the breaker never opens
+        """
+        self.enabled = enabled
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probes_in_flight = 0
+        # (monotonic time, succeeded) of recent outcomes
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._stats = {"opened": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state ("closed", "open" or "half_open")."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"Circuit breaker for {self.name} half-open, probing SerpAPI")
+        return self._state
+
+    def retry_after(self) -> Optional[float]:
+        """Return seconds until the breaker probes again (None unless open)."""
+        if self.state != OPEN:
+            return None
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now (counting it as a probe when half-open)."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+            self._probes_in_flight += 1
+            self._stats["probes"] += 1
+            return True
+        self._stats["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful request (closes a half-open breaker)."""
+        self._record(True)
+        self._consecutive_failures = 0
+        if self._state == HALF_OPEN:
+            self._state = CLOSED
+            self._probes_in_flight = 0
+            self._outcomes.clear()
+            logger.info(f"Circuit breaker for {self.name} closed, SerpAPI recovered")
+
+    def record_failure(self) -> None:
+        """Record an upstream failure (may open the breaker)."""
+        if not self.enabled:
+            return
+        self._record(False)
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN:
+            self._open("probe failed")
+        elif self._state == CLOSED:
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open(f"{self._consecutive_failures} consecutive failures")
+            elif len(self._outcomes) >= self.min_requests and self._error_rate() >= self.error_rate_threshold:
+                self._open(f"error rate {self._error_rate():.0%}")
+
+    def record_ignored(self) -> None:
+        """Record a request that ended without saying anything about SerpAPI's health."""
+        if self._state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def stats(self) -> dict:
+        """Return the breaker state and counters."""
+        self._trim(time.monotonic())
+        return {
+            **self._stats,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "window_requests": len(self._outcomes),
+            "window_error_rate": round(self._error_rate(), 4),
+            "retry_after": round(self.retry_after(), 1) if self.retry_after() is not None else None,
+        }
+
+    def _open(self, reason: str) -> None:
+        """Open the breaker."""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self._stats["opened"] += 1
+        logger.warning(f"Circuit breaker for {self.name} opened ({reason}) for {self.open_seconds:.0f}s")
+
+    def _record(self, succeeded: bool) -> None:
+        """Add an outcome to the rolling window."""
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        self._trim(now)
+        if self._state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _trim(self, now: float) -> None:
+        """Drop outcomes older than the window."""
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _error_rate(self) -> float:
+        """Return the failure share of the window (0 if empty)."""
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
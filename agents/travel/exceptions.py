@@ -0,0 +1,77 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Travel Agent Exceptions
+
+Typed errors raised by the SerpAPI layer so callers (agents and the travel
+supervisor) can react to specific failure modes, e.g. fall back to cached data
+when the SerpAPI budget is exhausted.
+"""
+
+from typing import Optional
+
+
+class SerpApiError(Exception):
+    """Base class for SerpAPI failures."""
+    pass
+
+
+class SerpApiBudgetExhaustedError(SerpApiError):
+    """
+    Raised when a SerpAPI request cannot be sent because a budget is exhausted.
+
+    Attributes:
+        engine: SerpAPI engine that was requested (e.g. "google_flights")
+        reason: "monthly_quota" if the monthly plan is used up,
+                "rate_limit" if the per-engine rate budget did not free up in time
+        retry_after: Suggested seconds to wait before retrying (None if unknown)
+    """
+
+    error_type = "serpapi_budget_exhausted"
+
+    def __init__(self, engine: str, reason: str, retry_after: Optional[float] = None):
+        self.engine = engine
+        self.reason = reason
+        self.retry_after = retry_after
+        message = f"SerpAPI budget exhausted for {engine} ({reason})"
+        if retry_after is not None:
+            message += f", retry after {retry_after:.1f}s"
+        super().__init__(message)
+
+
+class SerpApiRequestError(SerpApiError):
+    """
+    Raised when a SerpAPI request fails (after retries) or SerpAPI returns an error.
+
+    Attributes:
+        status_code: HTTP status of the last attempt, if there was a response
+        retryable: True if the last failure was transient (timeout, 5xx, 429)
+    """
+
+    error_type = "serpapi_request_failed"
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        self.status_code = status_code
+        self.retryable = retryable
+        super().__init__(message)
+
+
+class SerpApiUnavailableError(SerpApiError):
+    """
+    Raised when a SerpAPI engine's circuit breaker is open and nothing is cached.
+
+    Attributes:
+        engine: SerpAPI engine that was requested (e.g. "google_flights")
+        retry_after: Seconds until the breaker lets a trial request through (None if unknown)
+    """
+
+    error_type = "serpapi_unavailable"
+
+    def __init__(self, engine: str, retry_after: Optional[float] = None):
+        self.engine = engine
+        self.retry_after = retry_after
+        message = f"SerpAPI {engine} is unavailable (circuit breaker open)"
+        if retry_after is not None:
+            message += f", retry after {retry_after:.1f}s"
+        super().__init__(message)
@@ -0,0 +1,499 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Fare History Module
+
+Local, append-only history of the flight fares and hotel rates seen in SerpAPI
+responses, so price questions ("is this a good price?", "what is the cheapest
+recent fare?") are answered from local data without another upstream call.
+
+Observations are stored in SQLite (WAL mode, shared by agent processes on the
+same host):
+- flight_fares: cheapest fare per airline for each (route, outbound date,
+  return date) search
+- hotel_rates: nightly rate per hotel for each (city, check-in, check-out)
+  search (whole-stay totals are divided by the nights)
+
+Both tables are indexed for range queries by route/city, travel date and
+observation time. Rows are only ever inserted; rows older than the retention
+period are purged periodically.
+
+Key components:
+- FareHistory: Record observations, query ranges and build price insights
+- get_fare_history: Shared instance configured from the environment
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional
+
+from config.config import (
+    TRAVEL_FARE_HISTORY_ENABLED,
+    TRAVEL_FARE_HISTORY_DB_PATH,
+    TRAVEL_FARE_HISTORY_RETENTION_DAYS,
+    TRAVEL_FARE_HISTORY_LOOKBACK_DAYS,
+    TRAVEL_FARE_HISTORY_DATE_WINDOW_DAYS,
+    TRAVEL_FARE_HISTORY_MIN_SAMPLES,
+)
+
+logger = logging.getLogger("lungo.travel.fare_history")
+
+# Purge rows older than the retention period once every N inserts
+_PURGE_EVERY_N_WRITES = 500
+
+# Percentile thresholds for price verdicts (share of observed prices at or below the price)
+_GOOD_PRICE_PERCENTILE = 25
+_HIGH_PRICE_PERCENTILE = 75
+
+
+class FareHistory:
+    """
+    Append-only SQLite store of observed flight fares and hotel rates.
+
+    Blocking methods run SQLite directly; the async methods run them in a
+    worker thread.
+
+    Example:
+        >>> history = FareHistory(".cache/serpapi/fare_history.sqlite3")
+        >>> await history.record_flights("LAX", "NRT", "2026-01-15", "2026-01-22", flights)
+        >>> insight = await history.flight_insight("LAX", "NRT", "2026-01-15", "2026-01-22", 812)
+        >>> insight["verdict"]
+        'good'
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        retention_days: int = 365,
+        lookback_days: int = 30,
+        date_window_days: int = 3,
+        min_samples: int = 5,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite file (created on first write)
+            retention_days: Observations older than this are purged
+            lookback_days: Default observation window for insights
+            date_window_days: Insights include travel dates this many days around the requested one
+            min_samples: Observations needed before a price verdict is given
+        """
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.lookback_days = lookback_days
+        self.date_window_days = date_window_days
+        self.min_samples = min_samples
+        self._db_ready = False
+        self._writes = 0
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    async def record_flights(
+        self,
+        origin: str,
+        destination: str,
+        outbound_date: str,
+        return_date: Optional[str],
+        flights: Iterable[Mapping],
+        observed_at: Optional[float] = None,
+    ) -> None:
+        """
+        Record the cheapest fare per airline from one flight search.
+
+        Args:
+            origin: Departure airport code
+            destination: Arrival airport code
+            outbound_date: Outbound date (YYYY-MM-DD)
+            return_date: Return date for round trips, None for one-way fares
+            flights: Parsed flights (price, airline, stops)
+            observed_at: Observation time (default: now)
+        """
+        cheapest: dict[str, tuple[float, int]] = {}
+        for flight in flights:
+            price = flight.get("price")
+            if not price:
+                continue
+            airline = flight.get("airline") or "Unknown"
+            if airline not in cheapest or price < cheapest[airline][0]:
+                cheapest[airline] = (float(price), int(flight.get("stops") or 0))
+        if not cheapest:
+            return
+
+        observed_at = time.time() if observed_at is None else observed_at
+        rows = [
+            (observed_at, origin.upper(), destination.upper(), outbound_date, return_date or "", airline, price, stops)
+            for airline, (price, stops) in cheapest.items()
+        ]
+        await self._insert(
+            "INSERT INTO flight_fares "
+            "(observed_at, origin, destination, outbound_date, return_date, airline, price, stops) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    async def record_hotels(
+        self,
+        city: str,
+        check_in_date: str,
+        check_out_date: str,
+        hotels: Iterable[Mapping],
+        observed_at: Optional[float] = None,
+    ) -> None:
+        """
+        Record the nightly rate of every hotel from one hotel search.
+
+        Hotels priced for the whole stay (price_is_total) are recorded as the
+        total divided by the nights, or skipped if the dates give no nights.
+
+        Args:
+            city: Hotel search location (e.g. "Tokyo")
+            check_in_date: Check-in date (YYYY-MM-DD)
+            check_out_date: Check-out date (YYYY-MM-DD)
+            hotels: Parsed hotels (name, price, price_is_total, overall_rating)
+            observed_at: Observation time (default: now)
+        """
+        observed_at = time.time() if observed_at is None else observed_at
+        nights = _nights(check_in_date, check_out_date)
+        rows = []
+        for hotel in hotels:
+            price = hotel.get("price")
+            if not price:
+                continue
+            if hotel.get("price_is_total"):
+                if not nights:
+                    continue
+                price = float(price) / nights
+            rows.append((
+                observed_at,
+                _normalize_city(city),
+                check_in_date,
+                check_out_date,
+                hotel.get("name") or "Unknown Hotel",
+                float(price),
+                float(hotel.get("overall_rating") or 0),
+            ))
+        if not rows:
+            return
+        await self._insert(
+            "INSERT INTO hotel_rates "
+            "(observed_at, city, check_in_date, check_out_date, hotel, price, overall_rating) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    # ------------------------------------------------------------------
+    # Range queries
+    # ------------------------------------------------------------------
+
+    async def flight_fares(
+        self,
+        origin: str,
+        destination: str,
+        outbound_from: str,
+        outbound_to: str,
+        round_trip: bool,
+        since: Optional[float] = None,
+        before: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        Return fares observed for a route within a range of outbound dates.
+
+        Args:
+            origin: Departure airport code
+            destination: Arrival airport code
+            outbound_from: First outbound date (YYYY-MM-DD, inclusive)
+            outbound_to: Last outbound date (YYYY-MM-DD, inclusive)
+            round_trip: Round-trip fares if True, one-way fares otherwise
+            since: Only observations at or after this time (default: lookback window)
+            before: Only observations before this time (default: no limit)
+
+        Returns:
+            Observations (observed_at, outbound_date, return_date, airline, price, stops), cheapest first
+        """
+        since = self._default_since(since)
+        return await self._query(
+            "SELECT observed_at, outbound_date, return_date, airline, price, stops FROM flight_fares "
+            "WHERE origin = ? AND destination = ? AND outbound_date BETWEEN ? AND ? "
+            f"AND return_date {'!=' if round_trip else '='} '' AND observed_at >= ? AND observed_at < ? "
+            "ORDER BY price, observed_at DESC",
+            (origin.upper(), destination.upper(), outbound_from, outbound_to, since, _default_before(before)),
+        )
+
+    async def hotel_rates(
+        self,
+        city: str,
+        check_in_from: str,
+        check_in_to: str,
+        since: Optional[float] = None,
+        before: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        Return hotel rates observed for a city within a range of check-in dates.
+
+        Args:
+            city: Hotel search location
+            check_in_from: First check-in date (YYYY-MM-DD, inclusive)
+            check_in_to: Last check-in date (YYYY-MM-DD, inclusive)
+            since: Only observations at or after this time (default: lookback window)
+            before: Only observations before this time (default: no limit)
+
+        Returns:
+            Observations (observed_at, check_in_date, check_out_date, hotel, price, overall_rating), cheapest first
+            (price is a nightly rate)
+        """
+        since = self._default_since(since)
+        return await self._query(
+            "SELECT observed_at, check_in_date, check_out_date, hotel, price, overall_rating FROM hotel_rates "
+            "WHERE city = ? AND check_in_date BETWEEN ? AND ? AND observed_at >= ? AND observed_at < ? "
+            "ORDER BY price, observed_at DESC",
+            (_normalize_city(city), check_in_from, check_in_to, since, _default_before(before)),
+        )
+
+    # ------------------------------------------------------------------
+    # Insights
+    # ------------------------------------------------------------------
+
+    async def flight_insight(
+        self,
+        origin: str,
+        destination: str,
+        outbound_date: str,
+        return_date: Optional[str],
+        price: float,
+        before: Optional[float] = None,
+    ) -> Optional[dict]:
+        """
+        Compare a fare with the fares seen for the route around the same dates.
+
+        Pass the time the search started as before, so the fares the search
+        itself just recorded are not compared with themselves.
+
+        Returns:
+            Insight dictionary (see _insight), or None without history
+        """
+        outbound_from, outbound_to = self._date_window(outbound_date)
+        observations = await self.flight_fares(
+            origin, destination, outbound_from, outbound_to, bool(return_date), before=before
+        )
+        return self._insight(price, observations, "airline", "outbound_date")
+
+    async def hotel_insight(
+        self, city: str, check_in_date: str, price: float, before: Optional[float] = None
+    ) -> Optional[dict]:
+        """
+        Compare a nightly hotel rate with the rates seen in the city around the same check-in date.
+
+        Pass the time the search started as before, so the rates the search
+        itself just recorded are not compared with themselves.
+
+        Returns:
+            Insight dictionary (see _insight), or None without history
+        """
+        check_in_from, check_in_to = self._date_window(check_in_date)
+        observations = await self.hotel_rates(city, check_in_from, check_in_to, before=before)
+        return self._insight(price, observations, "hotel", "check_in_date")
+
+    def _insight(self, price: float, observations: list[dict], name_field: str, date_field: str) -> Optional[dict]:
+        """
+        Summarize observations (cheapest first) relative to a price.
+
+        Returns:
+            None if there are no observations, otherwise:
+            - samples: Number of observations in the window
+            - lookback_days / date_window_days: Window used
+            - cheapest_recent: Cheapest observation (price, name, travel date, observed_at)
+            - typical_low / typical_high: 25th and 75th percentile prices
+            - percentile: Share (0-100) of observed prices at or below the price
+            - verdict: "good", "typical" or "high" (None below min_samples)
+        """
+        if not observations:
+            return None
+
+        prices = [row["price"] for row in observations]  # Sorted ascending
+        at_or_below = sum(1 for p in prices if p <= price)
+        percentile = round(100.0 * at_or_below / len(prices))
+
+        verdict = None
+        if len(prices) >= self.min_samples:
+            if percentile <= _GOOD_PRICE_PERCENTILE:
+                verdict = "good"
+            elif percentile >= _HIGH_PRICE_PERCENTILE and price > prices[len(prices) // 2]:
+                verdict = "high"
+            else:
+                verdict = "typical"
+
+        cheapest = observations[0]
+        return {
+            "samples": len(prices),
+            "lookback_days": self.lookback_days,
+            "date_window_days": self.date_window_days,
+            "cheapest_recent": {
+                "price": _number(cheapest["price"]),
+                "name": cheapest[name_field],
+                "date": cheapest[date_field],
+                "observed_at": datetime.fromtimestamp(cheapest["observed_at"]).strftime("%Y-%m-%d %H:%M"),
+            },
+            "typical_low": _number(_percentile(prices, 25)),
+            "typical_high": _number(_percentile(prices, 75)),
+            "percentile": percentile,
+            "verdict": verdict,
+        }
+
+    # ------------------------------------------------------------------
+    # SQLite (runs in a worker thread via asyncio.to_thread)
+    # ------------------------------------------------------------------
+
+    def _default_since(self, since: Optional[float]) -> float:
+        return time.time() - self.lookback_days * 86400 if since is None else since
+
+    def _date_window(self, travel_date: str) -> tuple[str, str]:
+        """Return the travel date range (inclusive) used for insights."""
+        try:
+            day = datetime.strptime(travel_date[:10], "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return travel_date, travel_date
+        window = timedelta(days=self.date_window_days)
+        return (day - window).strftime("%Y-%m-%d"), (day + window).strftime("%Y-%m-%d")
+
+    async def _insert(self, sql: str, rows: list[tuple]) -> None:
+        try:
+            await asyncio.to_thread(self._insert_sync, sql, rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Fare history write failed: {e}")
+
+    async def _query(self, sql: str, args: tuple) -> list[dict]:
+        try:
+            return await asyncio.to_thread(self._query_sync, sql, args)
+        except sqlite3.Error as e:
+            logger.warning(f"Fare history read failed: {e}")
+            return []
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the history database, creating the schema on first use."""
+        if not self._db_ready:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+
+        if not self._db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS flight_fares (
+                    observed_at REAL NOT NULL,
+                    origin TEXT NOT NULL,
+                    destination TEXT NOT NULL,
+                    outbound_date TEXT NOT NULL,
+                    return_date TEXT NOT NULL,
+                    airline TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    stops INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_flight_fares_route "
+                "ON flight_fares (origin, destination, outbound_date, observed_at)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hotel_rates (
+                    observed_at REAL NOT NULL,
+                    city TEXT NOT NULL,
+                    check_in_date TEXT NOT NULL,
+                    check_out_date TEXT NOT NULL,
+                    hotel TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    overall_rating REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_hotel_rates_city "
+                "ON hotel_rates (city, check_in_date, observed_at)"
+            )
+            conn.commit()
+            self._db_ready = True
+
+        return conn
+
+    def _insert_sync(self, sql: str, rows: list[tuple]) -> None:
+        conn = self._connect()
+        try:
+            conn.executemany(sql, rows)
+            # Periodically purge observations past the retention period
+            self._writes += 1
+            if self._writes % _PURGE_EVERY_N_WRITES == 0:
+                cutoff = time.time() - self.retention_days * 86400
+                conn.execute("DELETE FROM flight_fares WHERE observed_at < ?", (cutoff,))
+                conn.execute("DELETE FROM hotel_rates WHERE observed_at < ?", (cutoff,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _query_sync(self, sql: str, args: tuple) -> list[dict]:
+        if not os.path.exists(self.db_path):
+            return []
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, args).fetchall()]
+        finally:
+            conn.close()
+
+
+def _normalize_city(city: str) -> str:
+    """Normalize a hotel search location for grouping ("  Tokyo " -> "tokyo")."""
+    return " ".join(city.lower().split())
+
+
+def _default_before(before: Optional[float]) -> float:
+    """Return the upper bound of observed_at for a query (no limit by default)."""
+    return float("inf") if before is None else before
+
+
+def _nights(check_in_date: str, check_out_date: str) -> Optional[int]:
+    """Return the nights between two YYYY-MM-DD dates (None if unparseable or not positive)."""
+    try:
+        nights = (
+            datetime.strptime(check_out_date[:10], "%Y-%m-%d") - datetime.strptime(check_in_date[:10], "%Y-%m-%d")
+        ).days
+    except (TypeError, ValueError):
+        return None
+    return nights if nights > 0 else None
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of an ascending list."""
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _number(value: float):
+    """Return whole prices as int for display (812.0 -> 812)."""
+    return int(value) if float(value).is_integer() else round(value, 2)
+
+
+@lru_cache(maxsize=1)
+def get_fare_history() -> Optional[FareHistory]:
+    """Return the shared fare history, or None if TRAVEL_FARE_HISTORY_ENABLED is off."""
+    if not TRAVEL_FARE_HISTORY_ENABLED or not TRAVEL_FARE_HISTORY_DB_PATH:
+        return None
+    return FareHistory(
+        TRAVEL_FARE_HISTORY_DB_PATH,
+        retention_days=TRAVEL_FARE_HISTORY_RETENTION_DAYS,
+        lookback_days=TRAVEL_FARE_HISTORY_LOOKBACK_DAYS,
+        date_window_days=TRAVEL_FARE_HISTORY_DATE_WINDOW_DAYS,
+        min_samples=TRAVEL_FARE_HISTORY_MIN_SAMPLES,
+    )
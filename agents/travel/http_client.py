@@ -0,0 +1,124 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI HTTP Client Module
+
+This module owns the single long-lived, pooled httpx.AsyncClient that every
+SerpAPI call in the process goes through. Reusing one client keeps TCP and TLS
+connections alive between searches instead of paying a new handshake per call.
+
+Key functions:
+- get_http_client: Return the shared client, creating it on first use
+- start_http_client: Lifecycle hook called by the agent servers on startup
+- close_http_client: Lifecycle hook called by the agent servers on shutdown
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from config.config import (
+    SERPAPI_HTTP_TIMEOUT_SECONDS,
+    SERPAPI_HTTP2_ENABLED,
+    SERPAPI_MAX_CONNECTIONS,
+    SERPAPI_MAX_KEEPALIVE_CONNECTIONS,
+    SERPAPI_KEEPALIVE_EXPIRY_SECONDS,
+)
+
+logger = logging.getLogger("lungo.travel.http_client")
+
+# Shared client and the event loop it was created on
+# httpx connection pools are bound to a single event loop, so a client created
+# on one loop must not be reused from another (e.g. repeated asyncio.run calls)
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http2_available() -> bool:
+    """Return True if HTTP/2 is enabled in config and the `h2` package is installed."""
+    return SERPAPI_HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """
+    Build a new pooled AsyncClient from the configured limits.
+
+    Returns:
+        Configured httpx.AsyncClient instance
+    """
+    http2 = _http2_available()
+    limits = httpx.Limits(
+        max_connections=SERPAPI_MAX_CONNECTIONS,
+        max_keepalive_connections=SERPAPI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=SERPAPI_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+    logger.info(
+        f"Creating shared SerpAPI HTTP client (http2={http2}, "
+        f"max_connections={SERPAPI_MAX_CONNECTIONS}, "
+        f"max_keepalive={SERPAPI_MAX_KEEPALIVE_CONNECTIONS}, "
+        f"keepalive_expiry={SERPAPI_KEEPALIVE_EXPIRY_SECONDS}s)"
+    )
+
+    return httpx.AsyncClient(
+        timeout=SERPAPI_HTTP_TIMEOUT_SECONDS,
+        limits=limits,
+        http2=http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared SerpAPI HTTP client, creating it on first use.
+
+    Agent servers normally create the client up front via start_http_client(),
+    but lazy creation keeps the search functions usable from scripts as well.
+
+    Returns:
+        The process-wide pooled httpx.AsyncClient
+    """
+    global _client, _client_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _client is None or _client.is_closed or (loop is not None and loop is not _client_loop):
+        if _client is not None and not _client.is_closed:
+            # The old client belongs to a loop that is no longer running; its
+            # connections cannot be closed from here, so just drop the reference
+            logger.warning("SerpAPI HTTP client was created on a different event loop, recreating it")
+        _client = _build_client()
+        _client_loop = loop
+
+    return _client
+
+
+async def start_http_client() -> None:
+    """
+    Create the shared HTTP client on server startup.
+
+    Called from the agent servers' main() before they begin serving requests.
+    """
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client and release pooled connections.
+
+    Called from the agent servers' main() on shutdown. Safe to call more than once.
+    """
+    global _client, _client_loop
+
+    if _client is not None and not _client.is_closed:
+        logger.info("Closing shared SerpAPI HTTP client")
+        await _client.aclose()
+
+    _client = None
+    _client_loop = None
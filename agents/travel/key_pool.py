@@ -0,0 +1,286 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Key Pool Module
+
+Spreads SerpAPI requests over several API keys so search throughput grows with
+the number of keys instead of being capped by one key's plan.
+
+Every upstream attempt borrows a key from the pool:
+- least_used: the key with the fewest requests this month (relative to its
+  weight), ties going to the key with fewer requests in flight
+- weighted: smooth weighted round-robin (a key with weight 2 gets twice the
+  requests of a key with weight 1, interleaved rather than in runs)
+
+Each key can have its own monthly quota, persisted to SQLite like the global
+quota (one file per key, named after the key's fingerprint). Keys whose quota
+is used up, or that SerpAPI rejects (401, 403, invalid key, or the account ran
+out of searches), are ejected from the pool for a cooldown and re-admitted
+afterwards. A bare 429 is throttling, not a spent key: the caller retries it
+with backoff and the key stays in the pool.
+
+Keys are never logged; stats and logs use a short fingerprint instead.
+
+Key components:
+- parse_key_spec: Parse "key[:weight[:monthly_quota]]" entries
+- ApiKey: One pooled key with its quota and health state
+- ApiKeyPool: Key selection, per-key quota and ejection
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Optional
+
+from agents.travel.exceptions import SerpApiBudgetExhaustedError
+from agents.travel.rate_limiter import QuotaAccountant
+
+logger = logging.getLogger("lungo.travel.key_pool")
+
+STRATEGIES = ("least_used", "weighted")
+
+
+def parse_key_spec(spec: str, default_quota: int = 0) -> list[tuple[str, float, int]]:
+    """
+    Parse a comma-separated list of keys.
+
+    Each entry is "key", "key:weight" or "key:weight:monthly_quota"
+    (weight defaults to 1, monthly_quota to default_quota; 0 = unlimited).
+    Duplicate keys are dropped.
+
+    Returns:
+        (key, weight, monthly_quota) tuples in the order given
+    """
+    entries = []
+    seen = set()
+    for item in spec.split(","):
+        parts = [part.strip() for part in item.strip().split(":")]
+        if not parts[0] or parts[0] in seen:
+            continue
+        weight = float(parts[1]) if len(parts) > 1 and parts[1] else 1.0
+        quota = int(parts[2]) if len(parts) > 2 and parts[2] else default_quota
+        if weight <= 0:
+            logger.warning(f"Ignoring SerpAPI key {key_fingerprint(parts[0])} with weight {weight}")
+            continue
+        seen.add(parts[0])
+        entries.append((parts[0], weight, quota))
+    return entries
+
+
+def key_fingerprint(key: str) -> str:
+    """Return a short, non-reversible id for a key (safe to log)."""
+    return hashlib.sha256(key.encode()).hexdigest()[:8]
+
+
+class ApiKey:
+    """
+    One pooled API key.
+
+    Attributes:
+        value: The API key sent to SerpAPI
+        fingerprint: Short id used in logs and stats
+        weight: Relative share of requests
+        quota: Monthly quota accountant for this key
+        in_flight: Requests currently using the key
+        ejected_until: time.monotonic() until which the key is not used (0 = healthy)
+        eject_reason: Why the key was last ejected
+    """
+
+    def __init__(self, value: str, weight: float, quota: QuotaAccountant):
+        self.value = value
+        self.fingerprint = key_fingerprint(value)
+        self.weight = weight
+        self.quota = quota
+        self.in_flight = 0
+        self.requests = 0
+        self.ejected_until = 0.0
+        self.eject_reason: Optional[str] = None
+        # Requests this month (seeded from the quota store on first use)
+        self._used: Optional[int] = None
+        # Smooth weighted round-robin state
+        self._current_weight = 0.0
+
+    def healthy(self, now: float) -> bool:
+        """Return True if the key is not ejected."""
+        return now >= self.ejected_until
+
+
+class ApiKeyPool:
+    """
+    Pool of SerpAPI keys with per-key quotas and ejection.
+
+    Example:
+        >>> pool = ApiKeyPool(parse_key_spec("key-a,key-b:2"), quota_db_path=".cache/serpapi/quota.sqlite3")
+        >>> key = await pool.acquire("google_flights")
+        >>> try:
+        ...     response = await client.get(url, params={**params, "api_key": key.value})
+        ... finally:
+        ...     pool.release(key)
+    """
+
+    def __init__(
+        self,
+        keys: list[tuple[str, float, int]],
+        quota_db_path: Optional[str] = None,
+        strategy: str = "least_used",
+        eject_seconds: float = 3600.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            keys: (key, weight, monthly_quota) tuples, see parse_key_spec
+            quota_db_path: Base path of the per-key quota files (None keeps counters in memory)
+            strategy: "least_used" or "weighted"
+            eject_seconds: How long a rejected or exhausted key stays out of the pool
+        """
+        if strategy not in STRATEGIES:
+            logger.warning(f"Unknown SerpAPI key strategy '{strategy}', using least_used")
+            strategy = "least_used"
+        self.strategy = strategy
+        self.eject_seconds = eject_seconds
+        self._keys = [
+            ApiKey(value, weight, QuotaAccountant(_key_quota_path(quota_db_path, value), quota))
+            for value, weight, quota in keys
+        ]
+        self._stats = {"acquired": 0, "ejections": 0, "rejected_no_key": 0}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def healthy_count(self, now: Optional[float] = None) -> int:
+        """Return the number of keys currently in the pool (not ejected)."""
+        now = time.monotonic() if now is None else now
+        return sum(1 for key in self._keys if key.healthy(now))
+
+    async def acquire(self, engine: str) -> ApiKey:
+        """
+        Borrow a key for one request and count it against the key's quota.
+
+        Keys whose monthly quota is used up are ejected and the next key is tried.
+        The key must be handed back with release() once the request is done.
+
+        Raises:
+            SerpApiBudgetExhaustedError: If no key is healthy and within its quota
+                (reason "monthly_quota")
+        """
+        tried: set[str] = set()
+        while True:
+            now = time.monotonic()
+            candidates = [k for k in self._keys if k.healthy(now) and k.value not in tried]
+            if not candidates:
+                self._stats["rejected_no_key"] += 1
+                retry_after = min((k.ejected_until - now for k in self._keys), default=None)
+                logger.warning(f"No SerpAPI key available for {engine} ({len(self._keys)} configured)")
+                raise SerpApiBudgetExhaustedError(
+                    engine, "monthly_quota", retry_after=max(0.0, retry_after) if retry_after is not None else None
+                )
+
+            key = await self._select(candidates)
+            tried.add(key.value)
+            if await asyncio.to_thread(key.quota.try_consume, engine):
+                key._used += 1
+                key.requests += 1
+                key.in_flight += 1
+                self._stats["acquired"] += 1
+                return key
+            self.eject(key, "monthly_quota")
+
+    def release(self, key: ApiKey) -> None:
+        """Hand a key back after its request finished."""
+        key.in_flight = max(0, key.in_flight - 1)
+
+    def report_error(self, key: ApiKey, status_code: Optional[int] = None, message: str = "") -> bool:
+        """
+        Eject a key if SerpAPI rejected it.
+
+        Args:
+            key: Key the failed request was sent with
+            status_code: HTTP status of the response, if any
+            message: SerpAPI error message from the response body, if any
+
+        Returns:
+            True if the error was a key error and the key was ejected
+        """
+        reason = key_error_reason(status_code, message)
+        if reason is None:
+            return False
+        self.eject(key, reason)
+        return True
+
+    def eject(self, key: ApiKey, reason: str) -> None:
+        """Take a key out of the pool for eject_seconds."""
+        if key.healthy(time.monotonic()):
+            self._stats["ejections"] += 1
+            logger.warning(
+                f"Ejecting SerpAPI key {key.fingerprint} ({reason}) for {self.eject_seconds:.0f}s"
+            )
+        key.ejected_until = time.monotonic() + self.eject_seconds
+        key.eject_reason = reason
+        key._current_weight = 0.0
+
+    def stats(self) -> dict:
+        """Return pool counters and per-key state (fingerprints only)."""
+        now = time.monotonic()
+        return {
+            **self._stats,
+            "strategy": self.strategy,
+            "keys": [
+                {
+                    "key": key.fingerprint,
+                    "weight": key.weight,
+                    "healthy": key.healthy(now),
+                    "eject_reason": key.eject_reason if not key.healthy(now) else None,
+                    "ejected_for_seconds": round(max(0.0, key.ejected_until - now), 1),
+                    "requests": key.requests,
+                    "in_flight": key.in_flight,
+                    "used_this_month": key._used,
+                    "monthly_quota": key.quota.monthly_limit or None,
+                }
+                for key in self._keys
+            ],
+        }
+
+    async def _select(self, candidates: list[ApiKey]) -> ApiKey:
+        """Pick the next key among healthy candidates."""
+        for key in candidates:
+            if key._used is None:
+                key._used = sum((await asyncio.to_thread(key.quota.usage)).values())
+
+        if self.strategy == "weighted":
+            # Smooth weighted round-robin (as used by nginx upstreams)
+            total = sum(key.weight for key in candidates)
+            for key in candidates:
+                key._current_weight += key.weight
+            chosen = max(candidates, key=lambda key: key._current_weight)
+            chosen._current_weight -= total
+            return chosen
+
+        return min(candidates, key=lambda key: (key._used / key.weight, key.in_flight))
+
+
+def key_error_reason(status_code: Optional[int], message: str = "") -> Optional[str]:
+    """
+    Return "auth" or "quota" if a response means the key was rejected, else None.
+
+    HTTP 429 on its own is not a key error (SerpAPI also answers 429 when
+    throttling); it only counts as "quota" when the message says the account
+    ran out of searches.
+    """
+    text = message.lower()
+    if status_code in (401, 403) or "invalid api key" in text:
+        return "auth"
+    if "run out of searches" in text:
+        return "quota"
+    return None
+
+
+def _key_quota_path(base_path: Optional[str], key: str) -> Optional[str]:
+    """Return the per-key quota file ("quota.sqlite3" -> "quota.<fingerprint>.sqlite3")."""
+    if not base_path:
+        return None
+    root, ext = os.path.splitext(base_path)
+    return f"{root}.{key_fingerprint(key)}{ext}"
@@ -0,0 +1,109 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Shared-Memory Plan Batch Module
+
+Moves the numeric columns of a chunk of plan problems (see
+travel_logic.solve_plan_batch) to a worker process without pickling them.
+All columns are written back to back into one shared memory block; the
+worker maps the same block by name and reads the columns in place.
+
+Only fixed-size numbers are shared (typecode "d" for floats, "q" for 64-bit
+integers), so a column is a plain slice of the block. What is sent to the
+worker is only the block's handle (name and layout).
+
+Key components:
+- SharedColumns: Named numeric columns of one batch in a shared memory block
+"""
+
+from array import array
+from multiprocessing import shared_memory
+from typing import Optional
+
+# Bytes per item of the supported typecodes
+_ITEM_SIZES = {"d": 8, "q": 8}
+
+
+class SharedColumns:
+    """
+    Named numeric columns in one shared memory block.
+
+    The process that creates the block owns it and must unlink() it once
+    every worker is done; workers attach() by handle and close() when done.
+
+    Example:
+        >>> columns = SharedColumns.create({"price": array("d", [99.0, 120.5])})
+        >>> worker_view = SharedColumns.attach(columns.handle)
+        >>> worker_view.read("price", 0, 2)
+        [99.0, 120.5]
+        >>> worker_view.close()
+        >>> columns.unlink()
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, layout: dict[str, tuple[str, int, int]]):
+        """
+        Wrap an existing block.
+
+        Args:
+            block: Shared memory block holding the columns
+            layout: Column name -> (typecode, byte offset, length)
+        """
+        self._block = block
+        self._layout = layout
+
+    @classmethod
+    def create(cls, columns: dict[str, array]) -> "SharedColumns":
+        """
+        Copy columns into a new shared memory block.
+
+        Raises:
+            ValueError: If a column is not an array of a supported typecode
+        """
+        layout = {}
+        size = 0
+        for name, column in columns.items():
+            if not isinstance(column, array) or column.typecode not in _ITEM_SIZES:
+                raise ValueError(f"Column {name!r} must be an array of typecode {sorted(_ITEM_SIZES)}")
+            layout[name] = (column.typecode, size, len(column))
+            size += len(column) * _ITEM_SIZES[column.typecode]
+
+        # Zero-size blocks are not allowed
+        block = shared_memory.SharedMemory(create=True, size=max(1, size))
+        for name, column in columns.items():
+            _, offset, _ = layout[name]
+            raw = column.tobytes()
+            block.buf[offset:offset + len(raw)] = raw
+        return cls(block, layout)
+
+    @classmethod
+    def attach(cls, handle: tuple[str, dict]) -> "SharedColumns":
+        """Map a block created by another process (handle from .handle)."""
+        name, layout = handle
+        return cls(shared_memory.SharedMemory(name=name), layout)
+
+    @property
+    def handle(self) -> tuple[str, dict]:
+        """Picklable (block name, layout) to attach() from a worker."""
+        return self._block.name, self._layout
+
+    def read(self, name: str, start: int = 0, stop: Optional[int] = None) -> list:
+        """Return items start..stop of a column as a list."""
+        typecode, offset, length = self._layout[name]
+        stop = length if stop is None else min(stop, length)
+        if stop <= start:
+            return []
+        item_size = _ITEM_SIZES[typecode]
+        # Views are released right away so close() never finds exported buffers
+        with self._block.buf[offset + start * item_size:offset + stop * item_size] as raw:
+            with raw.cast(typecode) as items:
+                return items.tolist()
+
+    def close(self) -> None:
+        """Unmap the block from this process."""
+        self._block.close()
+
+    def unlink(self) -> None:
+        """Unmap and free the block (owner only)."""
+        self._block.close()
+        self._block.unlink()
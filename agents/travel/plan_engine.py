@@ -0,0 +1,155 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Vectorized Plan Evaluation Module
+
+NumPy engine used by find_cheapest_plan for large candidate sets (fare grids,
+multi-airport fan-outs): every flight is checked against every hotel at once
+instead of in Python loops.
+
+Inputs are plain columns prepared by travel_logic (which does the parsing, so
+both engines read dates and times the same way):
+- flights: arrival time as naive epoch microseconds, price
+- hotels: check-in date as days since the epoch (or "floating" when the hotel
+  has no usable date and checks in on the flight's arrival date), check-in time
+  as microseconds after midnight, price, overall and location rating
+
+The check-in rules of filter_valid_hotels() become a boolean flight x hotel
+matrix built by broadcasting; the cheapest pair is the argmin of the masked
+price sums. Integer microseconds keep every comparison exact, and argmin's
+first-minimum rule gives the same tie-breaking as the scalar loop (earlier
+flight, then earlier hotel). The matrix is evaluated a block of flights at a
+time to bound memory.
+
+NumPy is optional: HAVE_NUMPY is False when it is not installed and
+find_cheapest_plan then always uses the scalar engine.
+
+Key components:
+- HAVE_NUMPY: Whether the vectorized engine is available
+- rating_mask: Hotels meeting the rating thresholds
+- validity_matrix: Which hotels each flight can check in to
+- cheapest_pair: Cheapest valid (flight, hotel) pair
+"""
+
+from typing import Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency - the scalar engine is used instead
+    np = None
+
+HAVE_NUMPY = np is not None
+
+_US_PER_DAY = 86_400_000_000
+
+# Latest time of day (23:59) the traveler should reach the hotel on the arrival date
+_CUTOFF_US = (23 * 3600 + 59 * 60) * 1_000_000
+
+# Flight x hotel cells evaluated per block
+_BLOCK_CELLS = 1 << 20
+
+
+def rating_mask(
+    overall_ratings: Sequence[float],
+    location_ratings: Sequence[float],
+    min_overall_rating: float,
+    min_location_rating: float,
+) -> "np.ndarray":
+    """
+    Return which hotels meet the rating thresholds (see filter_hotels_by_rating()).
+
+    The overall rating is required; the location rating only counts when a
+    hotel has one (> 0).
+    """
+    overall = np.asarray(overall_ratings, dtype=np.float64)
+    location = np.asarray(location_ratings, dtype=np.float64)
+    return (overall >= min_overall_rating) & ((location <= 0) | (location >= min_location_rating))
+
+
+def validity_matrix(
+    arrival_us: "np.ndarray",
+    checkin_days: "np.ndarray",
+    floating: "np.ndarray",
+    checkin_time_us: "np.ndarray",
+    gap_us: int,
+) -> "np.ndarray":
+    """
+    Return a flights x hotels matrix of which hotels each flight can check in to.
+
+    Same rules as filter_valid_hotels(): with T the traveler's arrival at the
+    hotel, a hotel checking in on T's date is valid if T is before 23:59 on
+    the flight's arrival date or the hotel's check-in time has passed, a hotel
+    checking in the day before is always valid, all others are not.
+
+    Args:
+        arrival_us: Flight arrival times (epoch microseconds), shape (F,)
+        checkin_days: Hotel check-in dates (days since epoch), shape (H,)
+        floating: Hotels without a check-in date (they use the arrival date), shape (H,)
+        checkin_time_us: Hotel check-in times (microseconds after midnight), shape (H,)
+        gap_us: Time from landing to reaching the hotel, in microseconds
+    """
+    arrival_day = arrival_us // _US_PER_DAY
+    reach = arrival_us + gap_us
+    reach_day = reach // _US_PER_DAY
+    reach_time = reach - reach_day * _US_PER_DAY
+    before_cutoff = reach <= arrival_day * _US_PER_DAY + _CUTOFF_US
+
+    # Days between the hotel's check-in date and the traveler reaching it
+    days_late = np.where(
+        floating[None, :],
+        (reach_day - arrival_day)[:, None],
+        reach_day[:, None] - checkin_days[None, :],
+    )
+    same_day_ok = before_cutoff[:, None] | (reach_time[:, None] >= checkin_time_us[None, :])
+    return ((days_late == 0) & same_day_ok) | (days_late == 1)
+
+
+def cheapest_pair(
+    arrival_us: Sequence[int],
+    flight_prices: Sequence[float],
+    checkin_days: Sequence[int],
+    floating: Sequence[bool],
+    checkin_time_us: Sequence[int],
+    hotel_prices: Sequence[float],
+    hotel_mask: "np.ndarray",
+    gap_us: int,
+) -> Optional[tuple[int, int]]:
+    """
+    Return (flight index, hotel index) of the cheapest valid combination, or None.
+
+    Among equal totals the earliest flight wins, then the earliest hotel.
+
+    Args:
+        arrival_us, flight_prices: Flight columns (flights without an arrival time left out)
+        checkin_days, floating, checkin_time_us, hotel_prices: Hotel columns
+        hotel_mask: Hotels that may be used at all (e.g. rating_mask())
+        gap_us: Time from landing to reaching the hotel, in microseconds
+    """
+    hotel_index = np.flatnonzero(hotel_mask)
+    if not len(arrival_us) or not len(hotel_index):
+        return None
+
+    arrivals = np.asarray(arrival_us, dtype=np.int64)
+    fares = np.asarray(flight_prices, dtype=np.float64)
+    days = np.asarray(checkin_days, dtype=np.int64)[hotel_index]
+    floats = np.asarray(floating, dtype=bool)[hotel_index]
+    times = np.asarray(checkin_time_us, dtype=np.int64)[hotel_index]
+    rates = np.asarray(hotel_prices, dtype=np.float64)[hotel_index]
+
+    best = None
+    best_total = np.inf
+    block = max(1, _BLOCK_CELLS // len(hotel_index))
+    for start in range(0, len(arrivals), block):
+        stop = start + block
+        valid = validity_matrix(arrivals[start:stop], days, floats, times, gap_us)
+        totals = np.where(valid, fares[start:stop, None] + rates[None, :], np.inf)
+        # NaN prices never win (as in the scalar comparison)
+        totals[np.isnan(totals)] = np.inf
+        position = int(np.argmin(totals))
+        row, column = divmod(position, len(hotel_index))
+        # Strict comparison: an earlier block keeps ties
+        if totals[row, column] < best_total:
+            best_total = totals[row, column]
+            best = (start + row, int(hotel_index[column]))
+    return best
@@ -0,0 +1,289 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Cache Prewarming Module
+
+Keeps the search cache warm for popular searches so users rarely pay the full
+SerpAPI latency after a cache entry expires.
+
+Interactive searches are recorded in a rolling query history. A background
+scheduler periodically ranks them by popularity - first by how often their
+route (flights) or city (hotels, activities) was searched, then by how often
+the exact search was repeated - and refreshes the top entries that are about to
+expire (or already have).
+
+Prewarming only spends a configured share of the SerpAPI budget: per cycle it
+may send budget_share of what the rate limits allow over the cycle and, when a
+monthly quota is set, of the remaining quota spread evenly over the rest of the
+month. Unused allowance carries over, capped at max_per_cycle.
+
+Key components:
+- QueryHistory: Rolling window of recent interactive searches
+- PrewarmScheduler: Refreshes popular cache entries ahead of expiry
+"""
+
+import asyncio
+import calendar
+import logging
+import time
+from collections import OrderedDict, deque
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from agents.travel.search_cache import SearchCache, make_cache_key
+
+logger = logging.getLogger("lungo.travel.prewarm")
+
+# Params that are never recorded (credentials) or cannot be replayed later
+# (tokens that only make sense right after the search that returned them)
+_UNRECORDED_PARAMS = {"api_key"}
+_UNREPLAYABLE_PARAMS = {"departure_token", "next_page_token"}
+
+# Params holding the first travel date of a search (past dates are not prewarmed)
+_DATE_PARAMS = ("outbound_date", "check_in_date")
+
+
+def popularity_group(params: dict) -> str:
+    """
+    Return the route or city a search belongs to.
+
+    Flights are grouped by route ("LAX-NRT"), hotels and activities by their
+    query ("tokyo").
+    """
+    if params.get("departure_id") or params.get("arrival_id"):
+        return f"{str(params.get('departure_id', '')).upper()}-{str(params.get('arrival_id', '')).upper()}"
+    return " ".join(str(params.get("q", "")).lower().split())
+
+
+class QueryHistory:
+    """
+    Rolling window of recent interactive searches.
+
+    Args:
+        window_seconds: Searches older than this no longer count
+        max_queries: Distinct searches kept (least recently seen dropped first)
+    """
+
+    def __init__(self, window_seconds: float = 24 * 3600, max_queries: int = 1000):
+        self.window_seconds = window_seconds
+        self.max_queries = max_queries
+        # cache key -> (params without api_key, timestamps of recent searches)
+        self._queries: OrderedDict[str, tuple[dict, deque[float]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def record(self, params: dict, now: Optional[float] = None) -> None:
+        """Record one search (token follow-ups are ignored)."""
+        if any(params.get(name) for name in _UNREPLAYABLE_PARAMS):
+            return
+        now = time.time() if now is None else now
+        key = make_cache_key(params)
+
+        entry = self._queries.get(key)
+        if entry is None:
+            entry = ({k: v for k, v in params.items() if k not in _UNRECORDED_PARAMS}, deque())
+            self._queries[key] = entry
+        entry[1].append(now)
+        self._queries.move_to_end(key)
+
+        while len(self._queries) > self.max_queries:
+            self._queries.popitem(last=False)
+
+    def popular(self, limit: int, now: Optional[float] = None) -> list[tuple[dict, int]]:
+        """
+        Return the most popular searches of the window, most popular first.
+
+        Searches are ranked by the number of searches for their route/city,
+        then by their own count, then by how recently they were seen.
+
+        Returns:
+            (params without api_key, search count) pairs
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.window_seconds
+
+        counts = []
+        for key, (params, timestamps) in list(self._queries.items()):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+            if not timestamps:
+                del self._queries[key]
+                continue
+            counts.append((params, len(timestamps), timestamps[-1]))
+
+        group_counts: dict[str, int] = {}
+        for params, count, _ in counts:
+            group = popularity_group(params)
+            group_counts[group] = group_counts.get(group, 0) + count
+
+        counts.sort(key=lambda item: (group_counts[popularity_group(item[0])], item[1], item[2]), reverse=True)
+        return [(params, count) for params, count, _ in counts[:limit]]
+
+    def top_groups(self, limit: int = 10, now: Optional[float] = None) -> list[tuple[str, int]]:
+        """Return the most searched routes/cities of the window with their counts."""
+        group_counts: dict[str, int] = {}
+        for params, count in self.popular(len(self._queries), now):
+            group = popularity_group(params)
+            group_counts[group] = group_counts.get(group, 0) + count
+        return sorted(group_counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class PrewarmScheduler:
+    """
+    Refreshes popular cache entries before they expire.
+
+    Args:
+        history: Recent interactive searches
+        cache: Search cache whose entries are refreshed
+        refresh: Coroutine function that fetches params upstream and caches the result
+        rate_per_minute: Total SerpAPI requests per minute allowed by the rate limits
+        quota_remaining: Returns the monthly searches left (None if unlimited)
+        budget_share: Share (0-1) of the budget prewarming may use
+        interval_seconds: Time between prewarm cycles
+        lead_seconds: Refresh entries expiring within this many seconds
+        max_per_cycle: Upper bound on refreshes per cycle
+        candidates: Number of popular searches considered per cycle
+    """
+
+    def __init__(
+        self,
+        history: QueryHistory,
+        cache: SearchCache,
+        refresh: Callable[[dict], Awaitable[None]],
+        rate_per_minute: float,
+        quota_remaining: Callable[[], Optional[int]],
+        budget_share: float = 0.1,
+        interval_seconds: float = 300.0,
+        lead_seconds: float = 300.0,
+        max_per_cycle: int = 10,
+        candidates: int = 50,
+    ):
+        self.history = history
+        self.cache = cache
+        self.refresh = refresh
+        self.rate_per_minute = rate_per_minute
+        self.quota_remaining = quota_remaining
+        self.budget_share = budget_share
+        self.interval_seconds = interval_seconds
+        self.lead_seconds = lead_seconds
+        self.max_per_cycle = max_per_cycle
+        self.candidates = candidates
+
+        self._credit = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "cycles": 0,
+            "refreshed": 0,
+            "refresh_failures": 0,
+            "skipped_no_budget": 0,
+            "last_allowance": 0,
+        }
+
+    def start(self) -> None:
+        """Start the background prewarm loop (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="serpapi-prewarm")
+
+    async def stop(self) -> None:
+        """Stop the background prewarm loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self, now: Optional[float] = None) -> int:
+        """
+        Run one prewarm cycle.
+
+        Returns:
+            Number of entries refreshed
+        """
+        now = time.time() if now is None else now
+        self._stats["cycles"] += 1
+
+        allowance = await self._cycle_allowance(now)
+        self._stats["last_allowance"] = allowance
+
+        refreshed = 0
+        today = datetime.fromtimestamp(now).date()
+        for params, count in self.history.popular(self.candidates, now):
+            if _travel_date_passed(params, today):
+                continue
+            expires_at = await self.cache.expires_at(params)
+            if expires_at is not None and expires_at - now > self.lead_seconds:
+                continue
+            if refreshed >= allowance:
+                self._stats["skipped_no_budget"] += 1
+                continue
+            try:
+                await self.refresh(params)
+                refreshed += 1
+                logger.debug(f"Prewarmed {popularity_group(params)} ({count} recent searches)")
+            except Exception as e:
+                self._stats["refresh_failures"] += 1
+                logger.warning(f"Prewarm refresh failed for {popularity_group(params)}: {e}")
+                # Do not keep spending budget while SerpAPI is failing
+                break
+
+        self._credit = max(0.0, self._credit - refreshed)
+        self._stats["refreshed"] += refreshed
+        if refreshed:
+            logger.info(f"Prewarmed {refreshed} popular searches (allowance {allowance})")
+        return refreshed
+
+    def stats(self) -> dict:
+        """Return prewarm counters and the most popular routes/cities."""
+        return {
+            **self._stats,
+            "running": self._task is not None and not self._task.done(),
+            "tracked_searches": len(self.history),
+            "top_searches": [
+                {"group": group, "searches": count} for group, count in self.history.top_groups(5)
+            ],
+        }
+
+    async def _run(self) -> None:
+        """Prewarm loop."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.warning(f"Prewarm cycle failed: {e}")
+
+    async def _cycle_allowance(self, now: float) -> int:
+        """Add this cycle's share of the budget to the carried-over credit and return it."""
+        share = self.budget_share * self.rate_per_minute * self.interval_seconds / 60.0
+
+        remaining = await asyncio.to_thread(self.quota_remaining)
+        if remaining is not None:
+            seconds_left = max(self.interval_seconds, _seconds_left_in_month(now))
+            share = min(share, self.budget_share * remaining * self.interval_seconds / seconds_left)
+
+        self._credit = min(float(self.max_per_cycle), self._credit + share)
+        return int(self._credit)
+
+
+def _travel_date_passed(params: dict, today: date) -> bool:
+    """Return True if the search is for a travel date before today."""
+    for name in _DATE_PARAMS:
+        value = params.get(name)
+        if value:
+            try:
+                return datetime.strptime(str(value)[:10], "%Y-%m-%d").date() < today
+            except ValueError:
+                return False
+    return False
+
+
+def _seconds_left_in_month(now: float) -> float:
+    """Return the seconds until the monthly quota resets (start of next UTC month)."""
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    days = calendar.monthrange(current.year, current.month)[1]
+    month_end = current.replace(day=days, hour=23, minute=59, second=59, microsecond=0)
+    return month_end.timestamp() - now + 1
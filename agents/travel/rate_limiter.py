@@ -0,0 +1,398 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Rate Limiter Module
+
+This module limits how fast and how much we call SerpAPI:
+- Per-engine token buckets (google_flights, google_hotels, google_local)
+- A monthly quota counter persisted to SQLite, shared by all agents on the host
+- Priority lanes: interactive user searches always go ahead of background work
+  (prefetching, return-flight enrichment)
+
+When a budget is exhausted, acquire() raises SerpApiBudgetExhaustedError so
+callers can fall back to cached data.
+
+Key components:
+- Priority: Request priority classes
+- TokenBucket: Classic token bucket (rate + burst capacity)
+- QuotaAccountant: Persistent monthly request counter
+- SerpApiRateLimiter: Combines buckets, quota and priority lanes
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from enum import IntEnum
+from typing import Optional
+
+from agents.travel.exceptions import SerpApiBudgetExhaustedError
+
+logger = logging.getLogger("lungo.travel.rate_limiter")
+
+
+class Priority(IntEnum):
+    """
+    Request priority classes (lower value = served first).
+
+    INTERACTIVE: A user is waiting on the result
+    BACKGROUND: Prefetching, cache refresh, or optional enrichment
+    """
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class TokenBucket:
+    """
+    Token bucket with a steady refill rate and a burst capacity.
+
+    Args:
+        rate_per_second: Tokens added per second
+        capacity: Maximum tokens stored (burst size)
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._updated = now
+
+    def available(self, now: Optional[float] = None) -> float:
+        """Return the number of tokens currently available."""
+        self._refill(now if now is not None else time.monotonic())
+        return self._tokens
+
+    def try_take(self, reserve: float = 0.0, now: Optional[float] = None) -> bool:
+        """
+        Take one token if at least 1 + reserve tokens are available.
+
+        Args:
+            reserve: Tokens that must remain after taking (kept for higher priorities)
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            True if a token was taken
+        """
+        self._refill(now if now is not None else time.monotonic())
+        if self._tokens >= 1.0 + reserve:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def time_until(self, tokens: float, now: Optional[float] = None) -> float:
+        """Return seconds until the given number of tokens is available."""
+        self._refill(now if now is not None else time.monotonic())
+        missing = tokens - self._tokens
+        if missing <= 0:
+            return 0.0
+        if self.rate_per_second <= 0:
+            return float("inf")
+        return missing / self.rate_per_second
+
+
+class QuotaAccountant:
+    """
+    Monthly SerpAPI request counter persisted to SQLite.
+
+    The counter is incremented atomically inside a SQLite transaction, so
+    several agent processes on the same host share one monthly budget.
+
+    Args:
+        db_path: SQLite file for the counter ("" or None keeps it in memory only)
+        monthly_limit: Maximum requests per calendar month (UTC); 0 = unlimited
+    """
+
+    def __init__(self, db_path: Optional[str], monthly_limit: int):
+        self.db_path = db_path or None
+        self.monthly_limit = monthly_limit
+        self._db_ready = False
+        # Fallback counters when no db_path is configured: (month, engine) -> used
+        self._memory_usage: dict[tuple[str, str], int] = {}
+
+    @staticmethod
+    def current_month() -> str:
+        """Return the current month as "YYYY-MM" (UTC)."""
+        return time.strftime("%Y-%m", time.gmtime())
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the quota database, creating the schema on first use."""
+        if not self._db_ready:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+
+        if not self._db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    month TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    used INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (month, engine)
+                )
+                """
+            )
+            self._db_ready = True
+
+        return conn
+
+    def try_consume(self, engine: str, count: int = 1) -> bool:
+        """
+        Consume quota for one or more requests if the monthly limit allows it.
+
+        Blocking (SQLite) - call via asyncio.to_thread from async code.
+
+        Args:
+            engine: SerpAPI engine being called
+            count: Number of requests to account for
+
+        Returns:
+            True if the quota was consumed, False if the monthly limit is reached
+        """
+        month = self.current_month()
+
+        if not self.db_path:
+            used = sum(v for (m, _), v in self._memory_usage.items() if m == month)
+            if self.monthly_limit and used + count > self.monthly_limit:
+                return False
+            self._memory_usage[(month, engine)] = self._memory_usage.get((month, engine), 0) + count
+            return True
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            used = conn.execute(
+                "SELECT COALESCE(SUM(used), 0) FROM quota_usage WHERE month = ?", (month,)
+            ).fetchone()[0]
+            if self.monthly_limit and used + count > self.monthly_limit:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT INTO quota_usage (month, engine, used) VALUES (?, ?, ?) "
+                "ON CONFLICT (month, engine) DO UPDATE SET used = used + excluded.used",
+                (month, engine, count),
+            )
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def usage(self) -> dict[str, int]:
+        """
+        Return this month's usage per engine.
+
+        Blocking (SQLite) - call via asyncio.to_thread from async code.
+        """
+        month = self.current_month()
+
+        if not self.db_path:
+            return {e: v for (m, e), v in self._memory_usage.items() if m == month}
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT engine, used FROM quota_usage WHERE month = ?", (month,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {engine: used for engine, used in rows}
+
+    def remaining(self) -> Optional[int]:
+        """
+        Return requests left this month, or None if the quota is unlimited.
+
+        Blocking (SQLite) - call via asyncio.to_thread from async code.
+        """
+        if not self.monthly_limit:
+            return None
+        return max(0, self.monthly_limit - sum(self.usage().values()))
+
+
+class SerpApiRateLimiter:
+    """
+    Rate limiter shared by all SerpAPI engines.
+
+    Each engine has its own token bucket. A request must take a token from its
+    engine's bucket and one unit of monthly quota before it is sent.
+
+    Priority lanes:
+    - Background callers yield while any interactive caller is waiting on the
+      same engine
+    - Background callers cannot take the last `background_reserve` tokens of a
+      bucket, so a burst of prefetching never starves user searches
+
+    Example:
+        >>> limiter = SerpApiRateLimiter({"google_flights": (60, 10)}, quota, max_wait_seconds=10)
+        >>> await limiter.acquire("google_flights", Priority.INTERACTIVE)
+    """
+
+    def __init__(
+        self,
+        budgets: dict[str, tuple[float, float]],
+        quota: QuotaAccountant,
+        max_wait_seconds: float,
+        default_budget: Optional[tuple[float, float]] = None,
+        background_reserve: float = 1.0,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            budgets: Per-engine (requests_per_minute, burst) budgets
+            quota: Monthly quota accountant
+            max_wait_seconds: Longest a caller waits for a token before failing
+            default_budget: Budget for engines not listed in budgets
+            background_reserve: Tokens per bucket reserved for interactive callers
+            enabled: If False, acquire() never waits (quota is still counted)
+        """
+        self.quota = quota
+        self.max_wait_seconds = max_wait_seconds
+        self.background_reserve = background_reserve
+        self.enabled = enabled
+        self._default_budget = default_budget or (60.0, 5.0)
+        self._buckets: dict[str, TokenBucket] = {
+            engine: TokenBucket(per_minute / 60.0, burst)
+            for engine, (per_minute, burst) in budgets.items()
+        }
+        # engine -> {priority: number of callers waiting}
+        self._waiting: dict[str, dict[Priority, int]] = {}
+        self._stats = {
+            "acquired": {p.name.lower(): 0 for p in Priority},
+            "rejected_rate_limit": 0,
+            "rejected_monthly_quota": 0,
+            "wait_seconds_total": 0.0,
+        }
+
+    def _bucket(self, engine: str) -> TokenBucket:
+        """Return the bucket for an engine, creating one from the default budget."""
+        bucket = self._buckets.get(engine)
+        if bucket is None:
+            per_minute, burst = self._default_budget
+            bucket = TokenBucket(per_minute / 60.0, burst)
+            self._buckets[engine] = bucket
+        return bucket
+
+    def _higher_priority_waiting(self, engine: str, priority: Priority) -> bool:
+        """Return True if a caller with a higher priority is waiting on this engine."""
+        waiting = self._waiting.get(engine, {})
+        return any(count > 0 for p, count in waiting.items() if p < priority)
+
+    async def acquire(
+        self,
+        engine: str,
+        priority: Priority = Priority.INTERACTIVE,
+        max_wait_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Wait for permission to send one SerpAPI request.
+
+        Args:
+            engine: SerpAPI engine to be called
+            priority: Priority class of the caller
+            max_wait_seconds: Override for the maximum wait (defaults to limiter setting)
+
+        Raises:
+            SerpApiBudgetExhaustedError: If no token frees up in time (reason
+                "rate_limit") or the monthly quota is used up ("monthly_quota")
+        """
+        if self.enabled:
+            await self._take_token(engine, priority, max_wait_seconds)
+
+        consumed = await asyncio.to_thread(self.quota.try_consume, engine)
+        if not consumed:
+            self._stats["rejected_monthly_quota"] += 1
+            logger.warning(f"SerpAPI monthly quota exhausted, rejecting {engine} request")
+            raise SerpApiBudgetExhaustedError(engine, "monthly_quota")
+
+        self._stats["acquired"][priority.name.lower()] += 1
+
+    async def _take_token(
+        self,
+        engine: str,
+        priority: Priority,
+        max_wait_seconds: Optional[float],
+    ) -> None:
+        """Wait for a token from the engine's bucket, honoring priority lanes."""
+        bucket = self._bucket(engine)
+        reserve = self.background_reserve if priority > Priority.INTERACTIVE else 0.0
+        max_wait = self.max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+
+        started = time.monotonic()
+        deadline = started + max_wait
+        waiting = self._waiting.setdefault(engine, {})
+        waiting[priority] = waiting.get(priority, 0) + 1
+
+        try:
+            while True:
+                now = time.monotonic()
+                if not self._higher_priority_waiting(engine, priority) and bucket.try_take(reserve, now):
+                    self._stats["wait_seconds_total"] += now - started
+                    return
+
+                delay = bucket.time_until(1.0 + reserve, now)
+                if now + delay > deadline:
+                    self._stats["rejected_rate_limit"] += 1
+                    logger.warning(
+                        f"SerpAPI rate budget for {engine} exhausted "
+                        f"(priority={priority.name.lower()}, waited {now - started:.1f}s)"
+                    )
+                    raise SerpApiBudgetExhaustedError(engine, "rate_limit", retry_after=delay)
+
+                # Sleep until the next token is due; if a higher-priority caller is
+                # waiting it will take that token first, and we check again
+                await asyncio.sleep(max(delay, 0.01))
+        finally:
+            waiting[priority] -= 1
+
+    def stats(self) -> dict:
+        """
+        Return limiter counters and per-engine bucket state.
+
+        Monthly quota usage is not included because it needs a SQLite read;
+        use quota_stats() for that.
+        """
+        now = time.monotonic()
+        return {
+            **self._stats,
+            "acquired": dict(self._stats["acquired"]),
+            "wait_seconds_total": round(self._stats["wait_seconds_total"], 3),
+            "engines": {
+                engine: {
+                    "tokens": round(bucket.available(now), 2),
+                    "rate_per_minute": bucket.rate_per_second * 60.0,
+                    "burst": bucket.capacity,
+                    "waiting": {p.name.lower(): c for p, c in self._waiting.get(engine, {}).items()},
+                }
+                for engine, bucket in self._buckets.items()
+            },
+        }
+
+    async def quota_stats(self) -> dict:
+        """Return this month's quota usage per engine, the limit and what remains."""
+        usage = await asyncio.to_thread(self.quota.usage)
+        used = sum(usage.values())
+        limit = self.quota.monthly_limit
+        return {
+            "month": self.quota.current_month(),
+            "used": used,
+            "monthly_limit": limit or None,
+            "remaining": max(0, limit - used) if limit else None,
+            "engines": usage,
+        }
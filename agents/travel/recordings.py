@@ -0,0 +1,130 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Recordings Module
+
+Stores raw SerpAPI responses on disk so the travel stack can be exercised
+offline (CI, load tests) without spending real SerpAPI quota.
+
+Recordings are keyed by the normalized request params (same key as the search
+cache, api_key excluded) and laid out as one JSON file per request:
+
+    <recordings_dir>/<engine>/<cache key>.json
+
+Each file holds the normalized params (for humans and tooling), the time of
+recording and the raw response body.
+
+Key components:
+- RecordingStore: Save/load recorded responses, used by serpapi_tools in
+  record/replay mode and by the local SerpAPI stand-in server
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+from agents.travel.search_cache import make_cache_key, normalize_params
+
+logger = logging.getLogger("lungo.travel.recordings")
+
+# Response returned when no recording exists for a request, shaped like the
+# "no results" responses SerpAPI itself returns
+NO_RECORDING_ERROR = "No recording found for this request."
+
+
+class RecordingStore:
+    """
+    Directory of recorded SerpAPI responses keyed by normalized params.
+
+    Example:
+        >>> store = RecordingStore(".cache/serpapi/recordings")
+        >>> await store.save(params, data)
+        >>> data = await store.load(params)
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Root directory for recordings (created on first save)
+        """
+        self.directory = directory
+
+    def path_for(self, params: dict) -> str:
+        """Return the recording file path for the given request params."""
+        engine = params.get("engine") or "unknown"
+        return os.path.join(self.directory, engine, f"{make_cache_key(params)}.json")
+
+    async def save(self, params: dict, data: dict) -> None:
+        """
+        Record a raw response for the given request params.
+
+        An existing recording for the same params is overwritten.
+
+        Args:
+            params: SerpAPI request parameters
+            data: Decoded SerpAPI response body
+        """
+        try:
+            await asyncio.to_thread(self._write, params, data)
+        except OSError as e:
+            logger.warning(f"Failed to record SerpAPI response: {e}")
+
+    async def load(self, params: dict) -> Optional[dict]:
+        """
+        Load the recorded response for the given request params.
+
+        Args:
+            params: SerpAPI request parameters
+
+        Returns:
+            Recorded response body, or None if there is no recording
+        """
+        return await asyncio.to_thread(self.load_sync, params)
+
+    def load_sync(self, params: dict) -> Optional[dict]:
+        """Blocking variant of load() for callers outside an event loop."""
+        path = self.path_for(params)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable recording {path}: {e}")
+            return None
+
+    def count(self) -> dict[str, int]:
+        """Return the number of recordings per engine."""
+        counts = {}
+        if not os.path.isdir(self.directory):
+            return counts
+        for engine in sorted(os.listdir(self.directory)):
+            engine_dir = os.path.join(self.directory, engine)
+            if os.path.isdir(engine_dir):
+                counts[engine] = sum(1 for name in os.listdir(engine_dir) if name.endswith(".json"))
+        return counts
+
+    def _write(self, params: dict, data: dict) -> None:
+        """Write a recording atomically (temp file + rename)."""
+        path = self.path_for(params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "params": normalize_params(params),
+            "recorded_at": time.time(),
+            "response": data,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,436 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compact Search Result Module
+
+Typed, memory-lean representations of parsed flight and hotel results.
+
+Parsed results used to be plain dicts, each flight carrying a copy of SerpAPI's
+raw leg list. They are now slotted records that still behave like read-only
+dicts (flight["price"], flight.get("airline"), dict(flight)), and the raw legs
+are only looked up when something asks for flight["flights"].
+
+For transport between agents (A2A) and for scans in the planning logic, lists
+of records are packed into columnar tables: one array per numeric field
+(prices, arrival times as epoch seconds, stops, ratings) and one list per text
+field. Table JSON names each field once instead of once per result and never
+includes raw legs.
+
+Key components:
+- FlightOption / HotelOption: Slotted records with a dict view
+- FlightTable / HotelTable: Columnar storage with JSON (to_columns/from_columns)
+  round-tripping
+"""
+
+import math
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar, Iterable, Iterator, Optional
+
+# Arrival times are stored as naive epoch seconds (timezone-free, like the
+# "YYYY-MM-DD HH:MM" local times SerpAPI returns)
+_EPOCH = datetime(1970, 1, 1)
+
+_ARRIVAL_TIME_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M:%S")
+
+
+class _RecordView(Mapping):
+    """
+    Dict view over a slotted record.
+
+    Keys are the record's fields plus its lazily resolved extras; assigning to
+    an existing field works like on a dict, unknown keys raise KeyError.
+    """
+
+    __slots__ = ()
+
+    _fields: ClassVar[tuple[str, ...]] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        return self._extra(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields + self._extra_keys())
+
+    def __len__(self) -> int:
+        return len(self._fields) + len(self._extra_keys())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={getattr(self, k)!r}' for k in self._fields)})"
+
+    def to_dict(self) -> dict:
+        """Return the record as a plain dict (without lazily resolved extras)."""
+        return {field: getattr(self, field) for field in self._fields}
+
+    def _extra(self, key: str) -> Any:
+        raise KeyError(key)
+
+    def _extra_keys(self) -> tuple[str, ...]:
+        return ()
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class FlightOption(_RecordView):
+    """
+    One parsed flight option.
+
+    Dict keys match the former flight dicts. "flights" (the raw SerpAPI leg
+    list) is resolved from the source response on access and is only present
+    for records parsed in this process.
+    """
+    price: Any = 0
+    departure_time: str = ""
+    departure_code: str = ""
+    arrival_time: str = ""
+    arrival_code: str = ""
+    airline: str = "Unknown"
+    duration_minutes: Any = 0
+    stops: int = 0
+    layovers: Optional[list] = None
+    return_flight: Optional[dict] = None
+    return_alternatives: Optional[list] = None
+    _source: Optional[dict] = None
+
+    _fields: ClassVar[tuple[str, ...]] = (
+        "price",
+        "departure_time",
+        "departure_code",
+        "arrival_time",
+        "arrival_code",
+        "airline",
+        "duration_minutes",
+        "stops",
+        "layovers",
+        "return_flight",
+        "return_alternatives",
+    )
+
+    @property
+    def legs(self) -> list[dict]:
+        """Raw SerpAPI legs of the outbound journey (empty if not available)."""
+        return self._source.get("flights", []) if self._source else []
+
+    @property
+    def departure_token(self) -> Optional[str]:
+        """SerpAPI token for the return flights paired with this outbound flight."""
+        return self._source.get("departure_token") if self._source else None
+
+    def _extra(self, key: str) -> Any:
+        if key == "flights" and self._source is not None:
+            return self.legs
+        raise KeyError(key)
+
+    def _extra_keys(self) -> tuple[str, ...]:
+        return ("flights",) if self._source is not None else ()
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class HotelOption(_RecordView):
+    """
+    One parsed hotel option. Dict keys match the former hotel dicts.
+
+    price is a nightly rate, unless price_is_total is set: then it is the
+    total for the searched stay (SerpAPI gave no nightly rate).
+    """
+    name: str = "Unknown Hotel"
+    price: Any = 0
+    price_is_total: bool = False
+    rating: Any = 0
+    overall_rating: Any = 0
+    location_rating: Any = 0
+    hotel_class: Any = 0
+    check_in_time: str = "15:00"
+    check_in_date: str = ""
+    amenities: list = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    _fields: ClassVar[tuple[str, ...]] = (
+        "name",
+        "price",
+        "price_is_total",
+        "rating",
+        "overall_rating",
+        "location_rating",
+        "hotel_class",
+        "check_in_time",
+        "check_in_date",
+        "amenities",
+        "latitude",
+        "longitude",
+    )
+
+
+def arrival_epoch(arrival_time: str) -> float:
+    """Return an arrival time string as naive epoch seconds (NaN if unparseable)."""
+    for fmt in _ARRIVAL_TIME_FORMATS:
+        try:
+            return (datetime.strptime(arrival_time, fmt) - _EPOCH).total_seconds()
+        except (TypeError, ValueError):
+            continue
+    return math.nan
+
+
+def _number_column(values: Iterable[Any]) -> array:
+    """Pack numbers into a float array (None/missing -> NaN)."""
+    return array("d", (math.nan if v is None or v == "" else float(v) for v in values))
+
+
+def _number(value: float) -> Any:
+    """Unpack a float column value (NaN -> None, whole numbers -> int)."""
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+class FlightTable:
+    """
+    Columnar flight results.
+
+    Numeric columns are arrays (prices, arrival_epochs, stops, durations) so
+    scans over many flights touch contiguous memory; rows are materialized as
+    FlightOption views on demand.
+
+    Example:
+        >>> table = FlightTable.from_records(flights)
+        >>> payload = json.dumps(table.to_columns())
+        >>> flights = FlightTable.from_columns(json.loads(payload)).to_dicts()
+    """
+
+    __slots__ = (
+        "prices",
+        "arrival_epochs",
+        "stops",
+        "durations",
+        "departure_times",
+        "departure_codes",
+        "arrival_times",
+        "arrival_codes",
+        "airlines",
+        "layovers",
+        "return_flights",
+        "return_alternatives",
+    )
+
+    def __init__(self):
+        self.prices = array("d")
+        self.arrival_epochs = array("d")
+        self.stops = array("d")
+        self.durations = array("d")
+        self.departure_times: list[str] = []
+        self.departure_codes: list[str] = []
+        self.arrival_times: list[str] = []
+        self.arrival_codes: list[str] = []
+        self.airlines: list[str] = []
+        self.layovers: list[list[str]] = []
+        self.return_flights: list[Optional[dict]] = []
+        self.return_alternatives: list[Optional[list]] = []
+
+    @classmethod
+    def from_records(cls, flights: Iterable[Mapping]) -> "FlightTable":
+        """Build a table from FlightOption records or flight dicts."""
+        flights = list(flights)
+        table = cls()
+        table.prices = _number_column(f.get("price") for f in flights)
+        table.stops = _number_column(f.get("stops") for f in flights)
+        table.durations = _number_column(f.get("duration_minutes") for f in flights)
+        table.departure_times = [f.get("departure_time", "") for f in flights]
+        table.departure_codes = [f.get("departure_code", "") for f in flights]
+        table.arrival_times = [f.get("arrival_time", "") for f in flights]
+        table.arrival_codes = [f.get("arrival_code", "") for f in flights]
+        table.airlines = [f.get("airline", "Unknown") for f in flights]
+        table.layovers = [f.get("layovers") or [] for f in flights]
+        table.return_flights = [f.get("return_flight") for f in flights]
+        table.return_alternatives = [f.get("return_alternatives") for f in flights]
+        table.arrival_epochs = array("d", map(arrival_epoch, table.arrival_times))
+        return table
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "FlightTable":
+        """Rebuild a table from to_columns() output."""
+        table = cls()
+        table.prices = _number_column(columns["price"])
+        table.stops = _number_column(columns["stops"])
+        table.durations = _number_column(columns["duration_minutes"])
+        table.departure_times = list(columns["departure_time"])
+        table.departure_codes = list(columns["departure_code"])
+        table.arrival_times = list(columns["arrival_time"])
+        table.arrival_codes = list(columns["arrival_code"])
+        table.airlines = list(columns["airline"])
+        table.layovers = list(columns.get("layovers") or [[] for _ in table.airlines])
+        table.return_flights = list(columns["return_flight"])
+        table.return_alternatives = list(columns.get("return_alternatives") or [None] * len(table.return_flights))
+        table.arrival_epochs = array("d", map(arrival_epoch, table.arrival_times))
+        return table
+
+    def to_columns(self) -> dict:
+        """Return the table as a JSON-serializable dict of columns."""
+        return {
+            "price": [_number(v) for v in self.prices],
+            "departure_time": self.departure_times,
+            "departure_code": self.departure_codes,
+            "arrival_time": self.arrival_times,
+            "arrival_code": self.arrival_codes,
+            "airline": self.airlines,
+            "duration_minutes": [_number(v) for v in self.durations],
+            "stops": [_number(v) for v in self.stops],
+            "layovers": self.layovers,
+            "return_flight": self.return_flights,
+            "return_alternatives": self.return_alternatives,
+        }
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index: int) -> FlightOption:
+        return FlightOption(
+            price=_number(self.prices[index]),
+            departure_time=self.departure_times[index],
+            departure_code=self.departure_codes[index],
+            arrival_time=self.arrival_times[index],
+            arrival_code=self.arrival_codes[index],
+            airline=self.airlines[index],
+            duration_minutes=_number(self.durations[index]),
+            stops=_number(self.stops[index]),
+            layovers=self.layovers[index],
+            return_flight=self.return_flights[index],
+            return_alternatives=self.return_alternatives[index],
+        )
+
+    def __iter__(self) -> Iterator[FlightOption]:
+        return (self[i] for i in range(len(self)))
+
+    def to_dicts(self) -> list[dict]:
+        """Return the rows as plain flight dicts."""
+        return [row.to_dict() for row in self]
+
+
+class HotelTable:
+    """
+    Columnar hotel results (see FlightTable).
+
+    Example:
+        >>> table = HotelTable.from_records(hotels)
+        >>> hotels = HotelTable.from_columns(table.to_columns()).to_dicts()
+    """
+
+    __slots__ = (
+        "prices",
+        "price_is_total",
+        "ratings",
+        "overall_ratings",
+        "location_ratings",
+        "hotel_classes",
+        "names",
+        "check_in_times",
+        "check_in_dates",
+        "amenities",
+        "latitudes",
+        "longitudes",
+    )
+
+    def __init__(self):
+        self.prices = array("d")
+        self.price_is_total: list[bool] = []
+        self.ratings = array("d")
+        self.overall_ratings = array("d")
+        self.location_ratings = array("d")
+        self.hotel_classes = array("d")
+        self.names: list[str] = []
+        self.check_in_times: list[str] = []
+        self.check_in_dates: list[str] = []
+        self.amenities: list[list] = []
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+
+    @classmethod
+    def from_records(cls, hotels: Iterable[Mapping]) -> "HotelTable":
+        """Build a table from HotelOption records or hotel dicts."""
+        hotels = list(hotels)
+        table = cls()
+        table.prices = _number_column(h.get("price") for h in hotels)
+        table.price_is_total = [bool(h.get("price_is_total")) for h in hotels]
+        table.ratings = _number_column(h.get("rating") for h in hotels)
+        table.overall_ratings = _number_column(h.get("overall_rating") for h in hotels)
+        table.location_ratings = _number_column(h.get("location_rating") for h in hotels)
+        table.hotel_classes = _number_column(h.get("hotel_class") for h in hotels)
+        table.names = [h.get("name", "Unknown Hotel") for h in hotels]
+        table.check_in_times = [h.get("check_in_time", "15:00") for h in hotels]
+        table.check_in_dates = [h.get("check_in_date", "") for h in hotels]
+        table.amenities = [h.get("amenities") or [] for h in hotels]
+        table.latitudes = _number_column(h.get("latitude") for h in hotels)
+        table.longitudes = _number_column(h.get("longitude") for h in hotels)
+        return table
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "HotelTable":
+        """Rebuild a table from to_columns() output."""
+        table = cls()
+        table.prices = _number_column(columns["price"])
+        table.ratings = _number_column(columns["rating"])
+        table.overall_ratings = _number_column(columns["overall_rating"])
+        table.location_ratings = _number_column(columns["location_rating"])
+        table.hotel_classes = _number_column(columns["hotel_class"])
+        table.names = list(columns["name"])
+        table.check_in_times = list(columns["check_in_time"])
+        table.check_in_dates = list(columns["check_in_date"])
+        table.amenities = list(columns["amenities"])
+        # Coordinates are missing from tables sent by older agents
+        table.latitudes = _number_column(columns.get("latitude") or [None] * len(table.names))
+        table.longitudes = _number_column(columns.get("longitude") or [None] * len(table.names))
+        # Older agents only sent nightly rates
+        table.price_is_total = list(columns.get("price_is_total") or [False] * len(table.names))
+        return table
+
+    def to_columns(self) -> dict:
+        """Return the table as a JSON-serializable dict of columns."""
+        return {
+            "name": self.names,
+            "price": [_number(v) for v in self.prices],
+            "price_is_total": self.price_is_total,
+            "rating": [_number(v) for v in self.ratings],
+            "overall_rating": [_number(v) for v in self.overall_ratings],
+            "location_rating": [_number(v) for v in self.location_ratings],
+            "hotel_class": [_number(v) for v in self.hotel_classes],
+            "check_in_time": self.check_in_times,
+            "check_in_date": self.check_in_dates,
+            "amenities": self.amenities,
+            "latitude": [_number(v) for v in self.latitudes],
+            "longitude": [_number(v) for v in self.longitudes],
+        }
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index: int) -> HotelOption:
+        return HotelOption(
+            name=self.names[index],
+            price=_number(self.prices[index]),
+            price_is_total=self.price_is_total[index],
+            rating=_number(self.ratings[index]),
+            overall_rating=_number(self.overall_ratings[index]),
+            location_rating=_number(self.location_ratings[index]),
+            hotel_class=_number(self.hotel_classes[index]),
+            check_in_time=self.check_in_times[index],
+            check_in_date=self.check_in_dates[index],
+            amenities=self.amenities[index],
+            latitude=_number(self.latitudes[index]),
+            longitude=_number(self.longitudes[index]),
+        )
+
+    def __iter__(self) -> Iterator[HotelOption]:
+        return (self[i] for i in range(len(self)))
+
+    def to_dicts(self) -> list[dict]:
+        """Return the rows as plain hotel dicts."""
+        return [row.to_dict() for row in self]
@@ -0,0 +1,123 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Retry and Hedging Policy Module
+
+Building blocks used by serpapi_tools to cut tail latency:
+- RetryPolicy: Jittered exponential backoff for retryable failures
+- is_retryable_error: Classifies failures (timeouts, transport errors, 5xx, 429)
+- LatencyTracker: Rolling per-engine latency window; its p95 is the adaptive
+  delay after which a duplicate (hedged) request is fired
+"""
+
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Jittered exponential backoff settings.
+
+    Attributes:
+        max_attempts: Total attempts including the first one (1 = no retries)
+        base_delay_seconds: Backoff cap for the first retry
+        max_delay_seconds: Upper bound for any backoff delay
+    """
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 4.0
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Return the delay before retry number `attempt` (1-based).
+
+        Uses "full jitter": a uniform random delay between 0 and the capped
+        exponential backoff, so retries from many callers do not synchronize.
+        """
+        cap = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Return True if a failed SerpAPI request is worth retrying.
+
+    Retryable: timeouts, connection/transport errors, HTTP 5xx and HTTP 429.
+    Not retryable: other HTTP 4xx (bad params, invalid key) and everything else.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+class LatencyTracker:
+    """
+    Rolling window of successful request latencies per engine.
+
+    Args:
+        window: Number of recent samples kept per engine
+        min_samples: Samples required before a hedge threshold is reported
+        min_threshold_seconds: Lower bound for the hedge threshold
+        max_threshold_seconds: Upper bound for the hedge threshold
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        min_threshold_seconds: float = 1.0,
+        max_threshold_seconds: float = 10.0,
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.min_threshold_seconds = min_threshold_seconds
+        self.max_threshold_seconds = max_threshold_seconds
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, engine: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        samples = self._samples.get(engine)
+        if samples is None:
+            samples = self._samples[engine] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, engine: str, pct: float) -> Optional[float]:
+        """Return the given percentile (0-100) of recent latencies, or None if no samples."""
+        samples = self._samples.get(engine)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def hedge_threshold(self, engine: str) -> Optional[float]:
+        """
+        Return the adaptive hedge delay (clamped p95) for an engine.
+
+        Returns None until enough samples have been collected.
+        """
+        samples = self._samples.get(engine)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        p95 = self.percentile(engine, 95)
+        return min(self.max_threshold_seconds, max(self.min_threshold_seconds, p95))
+
+    def stats(self) -> dict:
+        """Return p50/p95 latency and sample counts per engine."""
+        return {
+            engine: {
+                "samples": len(samples),
+                "p50_seconds": round(self.percentile(engine, 50), 3),
+                "p95_seconds": round(self.percentile(engine, 95), 3),
+                "hedge_threshold_seconds": self.hedge_threshold(engine),
+            }
+            for engine, samples in self._samples.items()
+            if samples
+        }
@@ -0,0 +1,117 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Return Flight Matching Module
+
+Pairs outbound flights with return options from the separate one-way return
+search. An option's match score for an outbound flight is:
+
+- +10 if it is flown by the same airline
+- -2 per stop of difference
+- +5 if both the outbound and the return are non-stop
+
+Ties go to the earlier (cheaper, as SerpAPI sorts by price) return option.
+
+Scores only depend on (same airline?, stop count), so options are indexed once
+by stop count and by (airline, stop count); matching an outbound flight looks at
+one or two buckets per distinct stop count instead of scoring and sorting every
+return option.
+
+Key components:
+- match_score: Score of one return option for an outbound flight
+- ReturnFlightIndex: Bucketed return options with best() and top_k() lookups
+"""
+
+import heapq
+from itertools import islice
+from typing import Iterator, Mapping, Optional
+
+
+def match_score(outbound: Mapping, return_flight: Mapping) -> int:
+    """Return how well a return option matches an outbound flight (higher is better)."""
+    outbound_stops = outbound.get("stops", 0)
+    return_stops = return_flight.get("stops", 0)
+
+    score = 0
+    # Prefer same airline
+    if return_flight.get("airline", "").lower() == outbound.get("airline", "").lower():
+        score += 10
+    # Prefer similar number of stops
+    score -= abs(return_stops - outbound_stops) * 2
+    # Prefer non-stop if outbound is non-stop
+    if outbound_stops == 0 and return_stops == 0:
+        score += 5
+    return score
+
+
+class ReturnFlightIndex:
+    """
+    Return options bucketed by stop count and by (airline, stop count).
+
+    Example:
+        >>> index = ReturnFlightIndex(return_flights)
+        >>> best = index.best(outbound)
+        >>> alternatives = index.top_k(outbound, 3)
+    """
+
+    def __init__(self, return_flights: list[Mapping]):
+        """
+        Build the buckets (positions in return_flights, in order).
+
+        Args:
+            return_flights: Return options, in the order ties should be broken
+        """
+        self._flights = list(return_flights)
+        self._by_stops: dict[int, list[int]] = {}
+        self._by_airline_stops: dict[tuple[str, int], list[int]] = {}
+
+        for position, flight in enumerate(self._flights):
+            stops = flight.get("stops", 0)
+            airline = flight.get("airline", "").lower()
+            self._by_stops.setdefault(stops, []).append(position)
+            self._by_airline_stops.setdefault((airline, stops), []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def best(self, outbound: Mapping) -> Optional[Mapping]:
+        """
+        Return the best matching return option, or None if there are none.
+
+        Same result as scoring every option and taking the highest score
+        (earliest option on ties).
+        """
+        airline = outbound.get("airline", "").lower()
+        best_key = None
+        for stops, positions in self._by_stops.items():
+            # Within a stop count the earliest same-airline option is best,
+            # otherwise the earliest option of any airline
+            same_airline = self._by_airline_stops.get((airline, stops))
+            position = same_airline[0] if same_airline else positions[0]
+            key = (-match_score(outbound, self._flights[position]), position)
+            if best_key is None or key < best_key:
+                best_key = key
+        return self._flights[best_key[1]] if best_key else None
+
+    def top_k(self, outbound: Mapping, k: int) -> list[Mapping]:
+        """
+        Return the k best matching return options, best first.
+
+        Same order as sorting all options by score (earliest option on ties),
+        but only the first k are produced.
+        """
+        if k <= 0:
+            return []
+        streams = [self._ranked_bucket(outbound, stops) for stops in self._by_stops]
+        return [self._flights[position] for _, position in islice(heapq.merge(*streams), k)]
+
+    def _ranked_bucket(self, outbound: Mapping, stops: int) -> Iterator[tuple[int, int]]:
+        """Yield (-score, position) for one stop count, best first."""
+        airline = outbound.get("airline", "").lower()
+        same_airline = self._by_airline_stops.get((airline, stops), [])
+        for position in same_airline:
+            yield -match_score(outbound, self._flights[position]), position
+        for position in self._by_stops[stops]:
+            if self._flights[position].get("airline", "").lower() != airline:
+                yield -match_score(outbound, self._flights[position]), position
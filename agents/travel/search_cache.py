@@ -0,0 +1,428 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+SerpAPI Search Cache Module
+
+This module provides a two-tier TTL cache for raw SerpAPI responses:
+- Tier 1: In-memory LRU (per process, sub-millisecond lookups)
+- Tier 2: SQLite on disk (survives restarts, shared by agents on the same host)
+
+Entries are keyed by the normalized request parameters (api_key excluded), and
+the TTL is chosen per SerpAPI engine so volatile data (flight fares) expires
+quickly while stable data (local activities) is kept for days.
+
+Expired entries can still be served for a grace period (stale-while-revalidate):
+lookup() returns them together with their expiry time so the caller can answer
+immediately and refresh the entry in the background. When SerpAPI is down,
+last_known() returns the last cached response however long ago it expired
+(until it is evicted from memory or purged from disk).
+
+Key components:
+- make_cache_key: Build a stable cache key from SerpAPI request params
+- SearchCache: Two-tier cache with hit/miss counters exposed via stats()
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger("lungo.travel.search_cache")
+
+# Params that never affect the response and must not leak into keys or disk
+_EXCLUDED_PARAMS = {"api_key"}
+
+# Params whose values are case-insensitive for SerpAPI
+# (e.g. "Tokyo" and "tokyo" return the same hotels)
+_CASE_INSENSITIVE_PARAMS = {"q", "departure_id", "arrival_id", "currency"}
+
+# Purge long-expired disk rows once every N writes
+_PURGE_EVERY_N_WRITES = 200
+
+
+def normalize_params(params: dict) -> dict:
+    """
+    Normalize SerpAPI request params for use as a cache key.
+
+    - Drops api_key (and other excluded params)
+    - Drops None values
+    - Converts values to strings and collapses whitespace
+    - Lowercases values of case-insensitive params
+
+    Args:
+        params: Raw SerpAPI request parameters
+
+    Returns:
+        Normalized params dictionary (sorted by key)
+    """
+    normalized = {}
+    for key in sorted(params):
+        if key in _EXCLUDED_PARAMS:
+            continue
+        value = params[key]
+        if value is None:
+            continue
+        value = " ".join(str(value).split())
+        if key in _CASE_INSENSITIVE_PARAMS:
+            value = value.lower()
+        normalized[key] = value
+    return normalized
+
+
+def make_cache_key(params: dict) -> str:
+    """
+    Build a stable cache key from SerpAPI request params.
+
+    Args:
+        params: Raw SerpAPI request parameters
+
+    Returns:
+        Hex SHA-256 digest of the normalized params
+    """
+    payload = json.dumps(normalize_params(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """
+    Two-tier (memory LRU + SQLite) TTL cache for SerpAPI responses.
+
+    Cached responses are shared between callers and must be treated as read-only.
+
+    Example:
+        >>> cache = SearchCache(max_entries=512, db_path=".cache/serpapi/cache.sqlite3",
+        ...                     ttl_seconds={"google_flights": 900}, default_ttl_seconds=3600)
+        >>> await cache.set(params, data)
+        >>> data = await cache.get(params)
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        db_path: Optional[str],
+        ttl_seconds: dict[str, int],
+        default_ttl_seconds: int,
+        disk_retention_seconds: int = 7 * 24 * 3600,
+        stale_seconds: int = 0,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in the memory tier
+            db_path: SQLite file for the disk tier (None or "" disables it)
+            ttl_seconds: TTL per SerpAPI engine (e.g. {"google_flights": 900})
+            default_ttl_seconds: TTL for engines not listed in ttl_seconds
+            disk_retention_seconds: How long expired rows are kept on disk before purge
+            stale_seconds: How long after expiry lookup() still returns an entry (0 = never)
+            enabled: If False, get() always misses and set() is a no-op
+        """
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.db_path = db_path or None
+        self.ttl_seconds = dict(ttl_seconds)
+        self.default_ttl_seconds = default_ttl_seconds
+        self.disk_retention_seconds = disk_retention_seconds
+        self.stale_seconds = stale_seconds
+
+        # key -> (expires_at, data)
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._db_ready = False
+        self._disk_writes = 0
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stale_hits": 0,
+            "fallback_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "disk_errors": 0,
+        }
+        self._engine_stats: dict[str, dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def ttl_for(self, engine: str) -> int:
+        """Return the TTL in seconds for a SerpAPI engine."""
+        return self.ttl_seconds.get(engine, self.default_ttl_seconds)
+
+    async def get(self, params: dict) -> Optional[dict]:
+        """
+        Look up a fresh cached response for the given request params.
+
+        Checks the memory tier first, then the disk tier. Disk hits are
+        promoted into the memory tier.
+
+        Args:
+            params: SerpAPI request parameters
+
+        Returns:
+            Cached response data, or None on miss/expiry
+        """
+        entry = await self._lookup(params, grace_seconds=0)
+        return entry[0] if entry else None
+
+    async def lookup(self, params: dict) -> Optional[tuple[dict, float]]:
+        """
+        Look up a cached response, including entries expired less than stale_seconds ago.
+
+        Args:
+            params: SerpAPI request parameters
+
+        Returns:
+            (data, expires_at) - the entry is stale if expires_at is in the past -
+            or None on miss
+        """
+        return await self._lookup(params, grace_seconds=self.stale_seconds)
+
+    async def last_known(self, params: dict) -> Optional[tuple[dict, float]]:
+        """
+        Look up the last cached response, however long ago it expired.
+
+        Used as a fallback when SerpAPI is unavailable. Misses are not counted
+        in stats() (the caller already counted one with lookup()).
+
+        Args:
+            params: SerpAPI request parameters
+
+        Returns:
+            (data, expires_at) or None if nothing is cached for params
+        """
+        return await self._lookup(params, grace_seconds=math.inf, stale_counter="fallback_hits", count_miss=False)
+
+    async def expires_at(self, params: dict) -> Optional[float]:
+        """
+        Return when the cached entry for params expires, or None if there is none.
+
+        Does not count as a lookup in stats() and does not change LRU order.
+        """
+        if not self.enabled:
+            return None
+
+        key = make_cache_key(params)
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry[0]
+        if self.db_path:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                return row[0]
+        return None
+
+    async def set(self, params: dict, data: dict) -> None:
+        """
+        Store a response for the given request params in both tiers.
+
+        Args:
+            params: SerpAPI request parameters
+            data: Decoded SerpAPI response body
+        """
+        if not self.enabled:
+            return
+
+        engine = params.get("engine", "")
+        key = make_cache_key(params)
+        now = time.time()
+        expires_at = now + self.ttl_for(engine)
+
+        self._memory_put(key, expires_at, data)
+        self._record(engine, "sets")
+
+        if self.db_path:
+            await asyncio.to_thread(
+                self._disk_set, key, engine, normalize_params(params), data, now, expires_at
+            )
+
+    async def _lookup(
+        self,
+        params: dict,
+        grace_seconds: float,
+        stale_counter: str = "stale_hits",
+        count_miss: bool = True,
+    ) -> Optional[tuple[dict, float]]:
+        """
+        Shared implementation of get(), lookup() and last_known().
+
+        Args:
+            params: SerpAPI request parameters
+            grace_seconds: How long after expiry an entry is still returned
+            stale_counter: Counter incremented when an expired entry is returned
+            count_miss: Whether a miss is counted in stats()
+        """
+        if not self.enabled:
+            return None
+
+        engine = params.get("engine", "")
+        key = make_cache_key(params)
+        now = time.time()
+        # Oldest expiry time that is still usable
+        usable_after = now - grace_seconds
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._record(engine, "memory_hits")
+                return data, expires_at
+            if expires_at > usable_after:
+                self._memory.move_to_end(key)
+                self._record(engine, stale_counter)
+                return data, expires_at
+            # Past the grace period in memory - the disk tier may have a fresher copy.
+            # The old entry is kept (until evicted) for last_known().
+
+        if self.db_path:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                expires_at, data = row
+                if expires_at > usable_after:
+                    self._memory_put(key, expires_at, data)
+                    self._record(engine, "disk_hits" if expires_at > now else stale_counter)
+                    return data, expires_at
+
+        if count_miss:
+            self._record(engine, "misses")
+        return None
+
+    def clear_memory(self) -> None:
+        """Drop all entries from the memory tier (disk tier is kept)."""
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        """
+        Return cache counters for sizing and monitoring.
+
+        Returns:
+            Dictionary with overall counters, hit ratio, memory tier size,
+            and per-engine counters
+        """
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        # Stale hits are answered from the cache too (and refreshed in the background)
+        lookups += self._stats["stale_hits"]
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["stale_hits"]
+        return {
+            **self._stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "disk_enabled": bool(self.db_path),
+            "engines": {engine: dict(counts) for engine, counts in self._engine_stats.items()},
+        }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _memory_put(self, key: str, expires_at: float, data: dict) -> None:
+        """Insert into the LRU, evicting the least recently used entries if full."""
+        self._memory[key] = (expires_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _record(self, engine: str, counter: str) -> None:
+        """Increment an overall and a per-engine counter."""
+        self._stats[counter] += 1
+        engine_counts = self._engine_stats.setdefault(
+            engine,
+            {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "fallback_hits": 0, "misses": 0, "sets": 0},
+        )
+        engine_counts[counter] = engine_counts.get(counter, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Disk tier (runs in a worker thread via asyncio.to_thread)
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the disk tier, creating the schema on first use."""
+        if not self._db_ready:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+
+        if not self._db_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    engine TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires_at)")
+            conn.commit()
+            self._db_ready = True
+
+        return conn
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, dict]]:
+        """Read an entry from SQLite. Returns (expires_at, data) or None."""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT expires_at, data FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self._stats["disk_errors"] += 1
+            logger.warning(f"Search cache disk read failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_set(
+        self,
+        key: str,
+        engine: str,
+        params: dict,
+        data: dict,
+        stored_at: float,
+        expires_at: float,
+    ) -> None:
+        """Write (or replace) an entry in SQLite."""
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, engine, params, data, stored_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, engine, json.dumps(params), json.dumps(data), stored_at, expires_at),
+                )
+                # Periodically purge rows that expired long ago to bound the file size
+                self._disk_writes += 1
+                if self._disk_writes % _PURGE_EVERY_N_WRITES == 0:
+                    conn.execute(
+                        "DELETE FROM responses WHERE expires_at < ?",
+                        (stored_at - self.disk_retention_seconds,),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self._stats["disk_errors"] += 1
+            logger.warning(f"Search cache disk write failed: {e}")
@@ -0,0 +1,144 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Local SerpAPI Stand-in Server
+
+Serves SerpAPI's /search endpoint from responses recorded with
+SERPAPI_RECORD_MODE=record, so the flight, hotel and activity agents can be
+benchmarked end to end without network access or SerpAPI quota.
+
+Latency and failures can be injected to exercise the retry, hedging and
+rate-limit paths of the agents:
+- SERPAPI_STUB_LATENCY_MS / SERPAPI_STUB_LATENCY_JITTER_MS: added response delay
+- SERPAPI_STUB_ERROR_RATE: fraction of requests answered with HTTP 503
+- SERPAPI_STUB_RATE_LIMIT_RATE: fraction of requests answered with HTTP 429
+
+Usage:
+    SERPAPI_RECORD_MODE=record ...          # run the agents once against SerpAPI
+    uv run python agents/travel/serpapi_stub_server.py
+    SERPAPI_BASE_URL=http://localhost:9010/search ...  # then point the agents here
+
+Routes:
+- GET /search: Recorded response for the request params (api_key ignored)
+- GET /stats: Request counters and the recordings available per engine
+"""
+
+import asyncio
+import logging
+import random
+
+import uvicorn
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from agents.travel.recordings import NO_RECORDING_ERROR, RecordingStore
+from config.config import (
+    SERPAPI_RECORDINGS_DIR,
+    SERPAPI_STUB_PORT,
+    SERPAPI_STUB_LATENCY_MS,
+    SERPAPI_STUB_LATENCY_JITTER_MS,
+    SERPAPI_STUB_ERROR_RATE,
+    SERPAPI_STUB_RATE_LIMIT_RATE,
+)
+
+load_dotenv()
+
+logger = logging.getLogger("lungo.travel.serpapi_stub_server")
+
+
+class StubSerpApi:
+    """
+    Recording-backed /search handler with injected latency and errors.
+
+    Args:
+        store: Recordings to serve responses from
+        latency_ms: Mean added delay per request
+        jitter_ms: Uniform jitter applied around latency_ms
+        error_rate: Probability of answering with HTTP 503
+        rate_limit_rate: Probability of answering with HTTP 429
+        rng: Random generator (seed it for reproducible benchmark runs)
+    """
+
+    def __init__(
+        self,
+        store: RecordingStore,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rng: random.Random = None,
+    ):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = rng or random.Random()
+        self._stats = {
+            "requests": 0,
+            "served": 0,
+            "missing": 0,
+            "injected_errors": 0,
+            "injected_rate_limits": 0,
+        }
+
+    async def search(self, request: Request) -> JSONResponse:
+        """Handle GET /search like SerpAPI would, from the recordings."""
+        self._stats["requests"] += 1
+        params = dict(request.query_params)
+
+        delay_ms = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+
+        roll = self.rng.random()
+        if roll < self.error_rate:
+            self._stats["injected_errors"] += 1
+            return JSONResponse({"error": "Injected upstream failure."}, status_code=503)
+        if roll < self.error_rate + self.rate_limit_rate:
+            self._stats["injected_rate_limits"] += 1
+            return JSONResponse({"error": "Injected rate limit."}, status_code=429)
+
+        data = await self.store.load(params)
+        if data is None:
+            self._stats["missing"] += 1
+            logger.info(f"No recording for {params.get('engine')} request")
+            return JSONResponse({"error": NO_RECORDING_ERROR})
+
+        self._stats["served"] += 1
+        return JSONResponse(data)
+
+    async def stats(self, request: Request) -> JSONResponse:
+        """Handle GET /stats."""
+        recordings = await asyncio.to_thread(self.store.count)
+        return JSONResponse({**self._stats, "recordings": recordings})
+
+
+def build_app(stub: StubSerpApi) -> Starlette:
+    """Build the Starlette app for a stub instance."""
+    return Starlette(routes=[
+        Route("/search", stub.search, methods=["GET"]),
+        Route("/stats", stub.stats, methods=["GET"]),
+    ])
+
+
+def main():
+    """Run the stand-in server with settings from the environment."""
+    logging.basicConfig(level=logging.INFO)
+    stub = StubSerpApi(
+        RecordingStore(SERPAPI_RECORDINGS_DIR),
+        latency_ms=SERPAPI_STUB_LATENCY_MS,
+        jitter_ms=SERPAPI_STUB_LATENCY_JITTER_MS,
+        error_rate=SERPAPI_STUB_ERROR_RATE,
+        rate_limit_rate=SERPAPI_STUB_RATE_LIMIT_RATE,
+    )
+    logger.info(f"Serving SerpAPI recordings from {SERPAPI_RECORDINGS_DIR} on port {SERPAPI_STUB_PORT}")
+    uvicorn.run(build_app(stub), host="0.0.0.0", port=SERPAPI_STUB_PORT)
+
+
+if __name__ == '__main__':
+    main()
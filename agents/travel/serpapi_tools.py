@@ -6,21 +6,693 @@ SerpAPI Tools Module
 
 This module provides functions to search for flights and hotels using the SerpAPI service.
 It handles API calls, response parsing, and data normalization.
+All requests share one pooled HTTP client (see http_client.py), and responses
+are cached per engine with a TTL (see search_cache.py). Each engine has a
+circuit breaker (see circuit_breaker.py): while SerpAPI is failing, searches
+fail fast and are answered from the last cached response, which agents report
+as stale (see collect_stale_responses).
 
 Key functions:
 - search_flights: Search for flights between origin and destination
+- search_flights_grid: Cheapest fares over a range of outbound dates and trip lengths
+- search_flights_multi_airport: Flights across all airports near origin and destination
 - search_hotels: Search for hotels at a destination location
+- iter_hotel_pages: Paginated hotel search, one page of hotels per iteration
+- search_activities: Search for activities of one type at a location
+- search_activities_multi: Several activity types at once, merged into one ranked list
 """
 
+import asyncio
 import logging
+import re
+import time
 import httpx
-from typing import Optional
-from datetime import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+from datetime import datetime, timedelta
 
-from config.config import SERPAPI_API_KEY, SERPAPI_BASE_URL
+from agents.travel.activities import merge_activities
+from agents.travel.airports import get_airport_catalog
+from agents.travel.circuit_breaker import CircuitBreaker
+from agents.travel.fare_history import get_fare_history
+from agents.travel.exceptions import (
+    SerpApiBudgetExhaustedError,
+    SerpApiError,
+    SerpApiRequestError,
+    SerpApiUnavailableError,
+)
+from agents.travel.http_client import get_http_client
+from agents.travel.key_pool import ApiKeyPool, key_error_reason, parse_key_spec
+from agents.travel.prewarm import PrewarmScheduler, QueryHistory
+from agents.travel.rate_limiter import Priority, QuotaAccountant, SerpApiRateLimiter
+from agents.travel.recordings import NO_RECORDING_ERROR, RecordingStore
+from agents.travel.results import FlightOption, HotelOption
+from agents.travel.return_matching import ReturnFlightIndex
+from agents.travel.retry_policy import LatencyTracker, RetryPolicy, is_retryable_error
+from agents.travel.search_cache import SearchCache, make_cache_key, normalize_params
+from agents.travel.single_flight import SingleFlight
+from config.config import (
+    SERPAPI_API_KEY,
+    SERPAPI_API_KEYS,
+    SERPAPI_KEY_STRATEGY,
+    SERPAPI_KEY_MONTHLY_QUOTA,
+    SERPAPI_KEY_EJECT_SECONDS,
+    SERPAPI_BASE_URL,
+    SERPAPI_CACHE_ENABLED,
+    SERPAPI_CACHE_MAX_ENTRIES,
+    SERPAPI_CACHE_DB_PATH,
+    SERPAPI_CACHE_TTL_FLIGHTS_SECONDS,
+    SERPAPI_CACHE_TTL_HOTELS_SECONDS,
+    SERPAPI_CACHE_TTL_ACTIVITIES_SECONDS,
+    SERPAPI_RATE_LIMIT_ENABLED,
+    SERPAPI_RATE_FLIGHTS_PER_MINUTE,
+    SERPAPI_RATE_HOTELS_PER_MINUTE,
+    SERPAPI_RATE_ACTIVITIES_PER_MINUTE,
+    SERPAPI_RATE_BURST,
+    SERPAPI_RATE_MAX_WAIT_SECONDS,
+    SERPAPI_MONTHLY_QUOTA,
+    SERPAPI_QUOTA_DB_PATH,
+    SERPAPI_RETRY_MAX_ATTEMPTS,
+    SERPAPI_RETRY_BASE_DELAY_SECONDS,
+    SERPAPI_RETRY_MAX_DELAY_SECONDS,
+    SERPAPI_HEDGING_ENABLED,
+    SERPAPI_HEDGE_MIN_DELAY_SECONDS,
+    SERPAPI_HEDGE_MAX_DELAY_SECONDS,
+    SERPAPI_HEDGE_MIN_SAMPLES,
+    SERPAPI_BREAKER_ENABLED,
+    SERPAPI_BREAKER_FAILURE_THRESHOLD,
+    SERPAPI_BREAKER_ERROR_RATE,
+    SERPAPI_BREAKER_WINDOW_SECONDS,
+    SERPAPI_BREAKER_MIN_REQUESTS,
+    SERPAPI_BREAKER_OPEN_SECONDS,
+    SERPAPI_BREAKER_HALF_OPEN_PROBES,
+    SERPAPI_RECORD_MODE,
+    SERPAPI_RECORDINGS_DIR,
+    SERPAPI_GRID_MAX_CONCURRENCY,
+    SERPAPI_GRID_MAX_OUTBOUND_DATES,
+    SERPAPI_GRID_MAX_TRIP_LENGTHS,
+    SERPAPI_MULTI_AIRPORT_MAX_PAIRS,
+    SERPAPI_ACTIVITY_MAX_TYPES,
+    SERPAPI_ACTIVITY_MERGE_RADIUS_METERS,
+    SERPAPI_HOTEL_MAX_PAGES,
+    SERPAPI_RETURN_ALTERNATIVES,
+    SERPAPI_EXACT_RETURN_PRICING,
+    SERPAPI_DEPARTURE_TOKEN_TOP_N,
+    SERPAPI_DEPARTURE_TOKEN_CONCURRENCY,
+    SERPAPI_DEPARTURE_TOKEN_BUDGET_SECONDS,
+    SERPAPI_DEPARTURE_TOKEN_QUOTA_RESERVE,
+    SERPAPI_CACHE_STALE_SECONDS,
+    SERPAPI_PREWARM_ENABLED,
+    SERPAPI_PREWARM_BUDGET_SHARE,
+    SERPAPI_PREWARM_INTERVAL_SECONDS,
+    SERPAPI_PREWARM_LEAD_SECONDS,
+    SERPAPI_PREWARM_MAX_PER_CYCLE,
+    SERPAPI_PREWARM_HISTORY_SECONDS,
+)
 
 logger = logging.getLogger("lungo.travel.serpapi_tools")
 
+# Shared response cache for all SerpAPI engines (one per process)
+_search_cache = SearchCache(
+    max_entries=SERPAPI_CACHE_MAX_ENTRIES,
+    db_path=SERPAPI_CACHE_DB_PATH,
+    ttl_seconds={
+        "google_flights": SERPAPI_CACHE_TTL_FLIGHTS_SECONDS,
+        "google_hotels": SERPAPI_CACHE_TTL_HOTELS_SECONDS,
+        "google_local": SERPAPI_CACHE_TTL_ACTIVITIES_SECONDS,
+    },
+    default_ttl_seconds=SERPAPI_CACHE_TTL_FLIGHTS_SECONDS,
+    stale_seconds=SERPAPI_CACHE_STALE_SECONDS,
+    enabled=SERPAPI_CACHE_ENABLED,
+)
+
+# Coalesces concurrent identical SerpAPI requests into one upstream call
+_single_flight = SingleFlight()
+
+# API keys every upstream attempt borrows from (SERPAPI_API_KEY alone if no pool is set)
+_key_pool = ApiKeyPool(
+    parse_key_spec(SERPAPI_API_KEYS or SERPAPI_API_KEY, SERPAPI_KEY_MONTHLY_QUOTA),
+    quota_db_path=SERPAPI_QUOTA_DB_PATH,
+    strategy=SERPAPI_KEY_STRATEGY,
+    eject_seconds=SERPAPI_KEY_EJECT_SECONDS,
+)
+# Rate budgets are configured per key, so throughput scales with the pool
+_key_count = max(1, len(_key_pool))
+
+# Per-engine rate budgets + monthly quota shared by all upstream calls
+_rate_limiter = SerpApiRateLimiter(
+    budgets={
+        "google_flights": (SERPAPI_RATE_FLIGHTS_PER_MINUTE * _key_count, SERPAPI_RATE_BURST * _key_count),
+        "google_hotels": (SERPAPI_RATE_HOTELS_PER_MINUTE * _key_count, SERPAPI_RATE_BURST * _key_count),
+        "google_local": (SERPAPI_RATE_ACTIVITIES_PER_MINUTE * _key_count, SERPAPI_RATE_BURST * _key_count),
+    },
+    quota=QuotaAccountant(SERPAPI_QUOTA_DB_PATH, SERPAPI_MONTHLY_QUOTA),
+    max_wait_seconds=SERPAPI_RATE_MAX_WAIT_SECONDS,
+    enabled=SERPAPI_RATE_LIMIT_ENABLED,
+)
+
+# Retry/backoff settings and rolling latency window used for hedged requests
+_retry_policy = RetryPolicy(
+    max_attempts=max(1, SERPAPI_RETRY_MAX_ATTEMPTS),
+    base_delay_seconds=SERPAPI_RETRY_BASE_DELAY_SECONDS,
+    max_delay_seconds=SERPAPI_RETRY_MAX_DELAY_SECONDS,
+)
+_latency_tracker = LatencyTracker(
+    min_samples=SERPAPI_HEDGE_MIN_SAMPLES,
+    min_threshold_seconds=SERPAPI_HEDGE_MIN_DELAY_SECONDS,
+    max_threshold_seconds=SERPAPI_HEDGE_MAX_DELAY_SECONDS,
+)
+
+# One circuit breaker per engine (created on first use for engines not listed)
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def _breaker(engine: str) -> CircuitBreaker:
+    """Return the circuit breaker of a SerpAPI engine."""
+    if engine not in _breakers:
+        _breakers[engine] = CircuitBreaker(
+            engine,
+            failure_threshold=SERPAPI_BREAKER_FAILURE_THRESHOLD,
+            error_rate_threshold=SERPAPI_BREAKER_ERROR_RATE,
+            window_seconds=SERPAPI_BREAKER_WINDOW_SECONDS,
+            min_requests=SERPAPI_BREAKER_MIN_REQUESTS,
+            open_seconds=SERPAPI_BREAKER_OPEN_SECONDS,
+            half_open_probes=SERPAPI_BREAKER_HALF_OPEN_PROBES,
+            enabled=SERPAPI_BREAKER_ENABLED,
+        )
+    return _breakers[engine]
+
+
+for _engine in ("google_flights", "google_hotels", "google_local"):
+    _breaker(_engine)
+
+# Last-known cached responses served in the current search (see collect_stale_responses)
+_stale_responses: ContextVar[Optional[list[dict]]] = ContextVar("serpapi_stale_responses", default=None)
+
+# api_key query parameter in URLs quoted by httpx error messages
+_API_KEY_PARAM = re.compile(r"(api_key=)[^&\s'\"]+")
+
+# Raw response recordings for record/replay mode (SERPAPI_RECORD_MODE)
+_recordings = RecordingStore(SERPAPI_RECORDINGS_DIR)
+if SERPAPI_RECORD_MODE not in ("off", "record", "replay"):
+    logger.warning(f"Unknown SERPAPI_RECORD_MODE '{SERPAPI_RECORD_MODE}', recording is off")
+
+_request_stats = {
+    "upstream_requests": 0,
+    "retries": 0,
+    "failures": 0,
+    "hedges_sent": 0,
+    "hedges_won": 0,
+    "hedges_skipped_no_budget": 0,
+    "departure_token_followups": 0,
+    "departure_token_timeouts": 0,
+    "revalidations": 0,
+    "revalidation_failures": 0,
+    "key_failovers": 0,
+    "breaker_rejections": 0,
+    "stale_fallbacks": 0,
+}
+
+# Background refreshes of stale cache entries, by cache key
+_revalidations: dict[str, asyncio.Task] = {}
+
+# Pending fare history writes (kept referenced until done)
+_history_writes: set[asyncio.Task] = set()
+
+# Recent interactive searches and the scheduler that keeps popular ones cached
+_query_history = QueryHistory(window_seconds=SERPAPI_PREWARM_HISTORY_SECONDS)
+
+
+async def get_serpapi_metrics() -> dict:
+    """
+    Return SerpAPI client-side metrics for this process.
+    
+    Returns:
+        Dictionary with cache hit/miss counters, in-flight coalescing counters
+        (including waiters per in-flight request), rate limiter state,
+        monthly quota usage, API key pool state and circuit breaker state
+    """
+    return {
+        "cache": _search_cache.stats(),
+        "single_flight": _single_flight.stats(),
+        "rate_limiter": _rate_limiter.stats(),
+        "quota": await _rate_limiter.quota_stats(),
+        "api_keys": _key_pool.stats(),
+        "circuit_breakers": {engine: breaker.stats() for engine, breaker in _breakers.items()},
+        "requests": dict(_request_stats),
+        "latency": _latency_tracker.stats(),
+        "prewarm": _prewarm_scheduler.stats(),
+    }
+
+
+def get_serpapi_health() -> dict:
+    """
+    Return the SerpAPI health of this process.
+    
+    Returns:
+        Dictionary with "status" ("ok", or "degraded" if any circuit breaker
+        is not closed) and the state of each engine's breaker
+    """
+    states = {engine: breaker.state for engine, breaker in _breakers.items()}
+    return {
+        "status": "ok" if all(state == "closed" for state in states.values()) else "degraded",
+        "circuit_breakers": states,
+    }
+
+
+@contextmanager
+def collect_stale_responses() -> Iterator[list[dict]]:
+    """
+    Collect the last-known cached responses served while SerpAPI was unavailable.
+    
+    Searches run inside the block (including tasks they start) append one
+    {"engine", "expired_seconds_ago"} item per stale response, so the caller
+    can mark its results as possibly outdated.
+    
+    Example:
+        >>> with collect_stale_responses() as stale:
+        ...     flights = await search_flights(...)
+        >>> response["stale"] = bool(stale)
+    """
+    collected: list[dict] = []
+    token = _stale_responses.set(collected)
+    try:
+        yield collected
+    finally:
+        _stale_responses.reset(token)
+
+
+async def _serpapi_request(params: dict, priority: Priority = Priority.INTERACTIVE) -> dict:
+    """
+    Fetch a SerpAPI response, serving it from the search cache when possible.
+    
+    On a cache miss, concurrent requests with identical normalized params are
+    coalesced into a single upstream call and all callers share its response.
+    Error responses (containing an "error" key) are returned but never cached.
+    
+    If the upstream call fails with a transient error, or the engine's circuit
+    breaker is open, the last cached response is returned instead (however old)
+    and reported to collect_stale_responses().
+    
+    Args:
+        params: SerpAPI query parameters (including engine; api_key is added per attempt)
+        priority: Rate limiter lane for the upstream call (interactive by default)
+    
+    Returns:
+        Decoded JSON response body (read-only if it came from the cache)
+    
+    Raises:
+        SerpApiRequestError: If the upstream request fails after retries
+        SerpApiBudgetExhaustedError: If the rate budget or monthly quota is exhausted
+        SerpApiUnavailableError: If the circuit breaker is open and nothing is cached
+    """
+    if priority == Priority.INTERACTIVE:
+        _query_history.record(params)
+    
+    entry = await _search_cache.lookup(params)
+    if entry is not None:
+        cached, expires_at = entry
+        if expires_at <= time.time():
+            # Stale-while-revalidate: answer now, refresh for the next caller
+            logger.debug(f"Serving stale {params.get('engine')} response, refreshing in background")
+            _revalidate(params)
+        else:
+            logger.debug(f"Search cache hit for {params.get('engine')}")
+        return cached
+    
+    normalized = normalize_params(params)
+    label = " ".join(f"{key}={value}" for key, value in normalized.items())
+    
+    try:
+        return await _single_flight.do(
+            make_cache_key(params),
+            lambda: _fetch_and_cache(params, priority),
+            label=label,
+        )
+    except (SerpApiRequestError, SerpApiUnavailableError) as e:
+        if isinstance(e, SerpApiRequestError) and not e.retryable:
+            raise
+        fallback = await _search_cache.last_known(params)
+        if fallback is None:
+            raise
+        data, expires_at = fallback
+        expired_seconds_ago = max(0.0, time.time() - expires_at)
+        _request_stats["stale_fallbacks"] += 1
+        logger.warning(
+            f"SerpAPI {params.get('engine')} unavailable ({e}), serving cached response "
+            f"expired {expired_seconds_ago:.0f}s ago"
+        )
+        collected = _stale_responses.get()
+        if collected is not None:
+            collected.append({"engine": params.get("engine"), "expired_seconds_ago": round(expired_seconds_ago)})
+        return data
+
+
+def _revalidate(params: dict) -> None:
+    """Refresh a stale cache entry in the background (once per key at a time)."""
+    key = make_cache_key(params)
+    if key in _revalidations:
+        return
+    
+    async def refresh() -> None:
+        try:
+            await _single_flight.do(key, lambda: _fetch_and_cache(params, Priority.BACKGROUND))
+            _request_stats["revalidations"] += 1
+        except Exception as e:
+            _request_stats["revalidation_failures"] += 1
+            logger.warning(f"Background refresh of stale {params.get('engine')} response failed: {e}")
+        finally:
+            _revalidations.pop(key, None)
+    
+    _revalidations[key] = asyncio.create_task(refresh())
+
+
+async def _prewarm_refresh(params: dict) -> None:
+    """Fetch a popular search upstream (background lane) and cache it."""
+    data = await _single_flight.do(
+        make_cache_key(params),
+        lambda: _fetch_and_cache(params, Priority.BACKGROUND),
+    )
+    if "error" in data:
+        raise SerpApiRequestError(f"SerpAPI error: {data['error']}")
+
+
+_prewarm_scheduler = PrewarmScheduler(
+    history=_query_history,
+    cache=_search_cache,
+    refresh=_prewarm_refresh,
+    rate_per_minute=(
+        SERPAPI_RATE_FLIGHTS_PER_MINUTE + SERPAPI_RATE_HOTELS_PER_MINUTE + SERPAPI_RATE_ACTIVITIES_PER_MINUTE
+    ) * _key_count,
+    quota_remaining=_rate_limiter.quota.remaining,
+    budget_share=SERPAPI_PREWARM_BUDGET_SHARE,
+    interval_seconds=SERPAPI_PREWARM_INTERVAL_SECONDS,
+    lead_seconds=SERPAPI_PREWARM_LEAD_SECONDS,
+    max_per_cycle=SERPAPI_PREWARM_MAX_PER_CYCLE,
+)
+
+
+def start_prewarm() -> None:
+    """Start the cache prewarm scheduler if SERPAPI_PREWARM_ENABLED is set (call from the server's event loop)."""
+    if SERPAPI_PREWARM_ENABLED:
+        _prewarm_scheduler.start()
+        logger.info("SerpAPI cache prewarming started")
+
+
+async def stop_prewarm() -> None:
+    """Stop the cache prewarm scheduler and pending background refreshes."""
+    await _prewarm_scheduler.stop()
+    for task in list(_revalidations.values()):
+        task.cancel()
+
+
+async def _fetch_and_cache(params: dict, priority: Priority) -> dict:
+    """
+    Fetch a response from SerpAPI and store successful responses in the cache.
+    
+    Args:
+        params: SerpAPI query parameters (including engine; api_key is added per attempt)
+        priority: Rate limiter lane for this call
+    
+    Returns:
+        Decoded JSON response body
+    """
+    data = await _fetch_with_retries(params, priority)
+    if "error" not in data:
+        await _search_cache.set(params, data)
+        _record_fare_history(params, data)
+    return data
+
+
+def _record_fare_history(params: dict, data: dict) -> None:
+    """Append the prices of a fresh upstream response to the fare history (in the background)."""
+    history = get_fare_history()
+    if history is None or params.get("departure_token"):
+        return
+    
+    engine = params.get("engine")
+    if engine == "google_flights":
+        flights = [
+            flight
+            for group in data.get("best_flights", []) + data.get("other_flights", [])
+            if (flight := _parse_flight(group))
+        ]
+        write = history.record_flights(
+            params.get("departure_id", ""),
+            params.get("arrival_id", ""),
+            params.get("outbound_date", ""),
+            params.get("return_date") if params.get("type") == "1" else None,
+            flights,
+        )
+    elif engine == "google_hotels":
+        check_in_date = params.get("check_in_date", "")
+        hotels = [
+            hotel
+            for prop in data.get("properties", [])
+            if (hotel := _parse_hotel(prop, check_in_date))
+        ]
+        write = history.record_hotels(params.get("q", ""), check_in_date, params.get("check_out_date", ""), hotels)
+    else:
+        return
+    
+    task = asyncio.create_task(write)
+    _history_writes.add(task)
+    task.add_done_callback(_history_writes.discard)
+
+
+async def _fetch_with_retries(params: dict, priority: Priority) -> dict:
+    """
+    Send a SerpAPI request, retrying transient failures with jittered backoff.
+    
+    In replay mode the response is loaded from the recordings instead and
+    none of the steps below apply.
+    
+    Every attempt (including hedged duplicates) goes through the rate limiter,
+    so retries consume rate budget and monthly quota like any other request.
+    If SerpAPI rejects the attempt's API key (auth error, or the account ran
+    out of searches), the key is ejected from the pool and the next attempt
+    goes out right away with another key. Plain 429 throttling is retried
+    with backoff like other transient failures.
+    
+    Each attempt first asks the engine's circuit breaker. Transient upstream
+    failures count against the breaker; once it is open, no further attempts
+    are sent.
+    
+    Args:
+        params: SerpAPI query parameters (including engine; api_key is added per attempt)
+        priority: Rate limiter lane for this call
+    
+    Returns:
+        Decoded JSON response body
+    
+    Raises:
+        SerpApiRequestError: If the request still fails after the last attempt
+        SerpApiBudgetExhaustedError: If no budget is available for an attempt
+        SerpApiUnavailableError: If the circuit breaker rejects an attempt
+    """
+    if SERPAPI_RECORD_MODE == "replay":
+        # Recordings are free: no rate budget, quota or API key is spent on them
+        return await _replay(params)
+    
+    engine = params["engine"]
+    breaker = _breaker(engine)
+    
+    for attempt in range(1, _retry_policy.max_attempts + 1):
+        if not breaker.allow():
+            _request_stats["breaker_rejections"] += 1
+            raise SerpApiUnavailableError(engine, retry_after=breaker.retry_after())
+        try:
+            await _rate_limiter.acquire(engine, priority)
+            data = await _send_with_hedging(params, priority)
+        except httpx.HTTPError as e:
+            retryable = is_retryable_error(e)
+            status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            message = _error_message(e.response) if isinstance(e, httpx.HTTPStatusError) else ""
+            key_error = key_error_reason(status_code, message) is not None
+            failover = key_error and _key_pool.healthy_count() > 0
+            
+            # Rejected keys are the key pool's business, not a sign SerpAPI is down
+            if retryable and not key_error:
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+            
+            if (
+                not (retryable or failover)
+                or attempt == _retry_policy.max_attempts
+                or breaker.state != "closed"
+            ):
+                _request_stats["failures"] += 1
+                logger.error(f"SerpAPI {engine} request failed after {attempt} attempt(s): {_describe_error(e)}")
+                # Not chained: the httpx error's text carries the request URL with the key
+                raise SerpApiRequestError(
+                    f"SerpAPI {engine} request failed: {_describe_error(e)}",
+                    status_code=status_code,
+                    retryable=retryable,
+                ) from None
+            
+            if failover:
+                _request_stats["key_failovers"] += 1
+                logger.warning(f"SerpAPI {engine} attempt {attempt} rejected the API key, retrying with another key")
+                continue
+            
+            delay = _retry_policy.backoff_delay(attempt)
+            _request_stats["retries"] += 1
+            logger.warning(
+                f"SerpAPI {engine} attempt {attempt} failed ({_describe_error(e)}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            breaker.record_ignored()
+            raise
+        
+        breaker.record_success()
+        return data
+    
+    # Unreachable: the loop either returns or raises on the last attempt
+    raise SerpApiRequestError(f"SerpAPI {engine} request failed")
+
+
+def _describe_error(error: httpx.HTTPError) -> str:
+    """
+    Describe a failed request for logs and error messages, without the API key.
+    
+    httpx puts the full request URL (api_key included) into the text of
+    HTTPStatusError, so status errors are described by status alone and the
+    key is masked in anything else.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP {error.response.status_code} {error.response.reason_phrase}".rstrip()
+    return _API_KEY_PARAM.sub(r"\1***", f"{type(error).__name__}: {error}")
+
+
+async def _send_with_hedging(params: dict, priority: Priority) -> dict:
+    """
+    Send one attempt, optionally hedged with a duplicate request.
+    
+    If hedging is enabled and the first request has not answered within the
+    engine's adaptive p95 latency, a duplicate is sent (only if the rate
+    limiter has budget for it right now) and the first successful answer wins.
+    
+    Args:
+        params: SerpAPI query parameters (including engine; api_key is added per attempt)
+        priority: Rate limiter lane for the duplicate request
+    
+    Returns:
+        Decoded JSON response body
+    """
+    engine = params["engine"]
+    threshold = _latency_tracker.hedge_threshold(engine) if SERPAPI_HEDGING_ENABLED else None
+    
+    if threshold is None:
+        return await _timed_get(params)
+    
+    primary = asyncio.create_task(_timed_get(params))
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=threshold)
+        if done:
+            return primary.result()
+        
+        # Only hedge if a token is available immediately - never wait for one
+        try:
+            await _rate_limiter.acquire(engine, priority, max_wait_seconds=0)
+        except SerpApiBudgetExhaustedError:
+            _request_stats["hedges_skipped_no_budget"] += 1
+            return await primary
+        
+        _request_stats["hedges_sent"] += 1
+        logger.info(f"SerpAPI {engine} request slower than {threshold:.2f}s, sending hedged request")
+        hedge = asyncio.create_task(_timed_get(params))
+        pending.add(hedge)
+        
+        last_error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        _request_stats["hedges_won"] += 1
+                    return task.result()
+                last_error = task.exception()
+        raise last_error
+    finally:
+        # Drop whichever request lost the race (or both, if we were cancelled)
+        for task in pending:
+            task.cancel()
+
+
+async def _timed_get(params: dict) -> dict:
+    """
+    Send a single SerpAPI request with a pooled API key and record its latency on success.
+    
+    Keys rejected by SerpAPI (auth errors, or out of searches) are ejected from the pool.
+    """
+    key = await _key_pool.acquire(params["engine"])
+    started = time.monotonic()
+    _request_stats["upstream_requests"] += 1
+    try:
+        data = await _serpapi_get({**params, "api_key": key.value})
+    except httpx.HTTPStatusError as e:
+        _key_pool.report_error(key, e.response.status_code, _error_message(e.response))
+        raise
+    finally:
+        _key_pool.release(key)
+    
+    if "error" in data:
+        _key_pool.report_error(key, message=str(data["error"]))
+    _latency_tracker.record(params["engine"], time.monotonic() - started)
+    return data
+
+
+def _error_message(response: httpx.Response) -> str:
+    """Return the "error" field of a SerpAPI error response ("" if the body has none)."""
+    try:
+        body = response.json()
+    except ValueError:
+        return ""
+    return str(body.get("error", "")) if isinstance(body, dict) else ""
+
+
+async def _serpapi_get(params: dict) -> dict:
+    """
+    Send a GET request to SerpAPI using the shared pooled HTTP client.
+    
+    In record mode the raw response is written to the recordings as well.
+    
+    Args:
+        params: SerpAPI query parameters (including engine; api_key is added per attempt)
+    
+    Returns:
+        Decoded JSON response body
+    
+    Raises:
+        httpx.HTTPError: If the request fails or returns a non-2xx status
+    """
+    client = get_http_client()
+    response = await client.get(SERPAPI_BASE_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+    
+    if SERPAPI_RECORD_MODE == "record":
+        await _recordings.save(params, data)
+    return data
+
+
+async def _replay(params: dict) -> dict:
+    """Load a recorded response (a SerpAPI-style error body if nothing was recorded for these params)."""
+    data = await _recordings.load(params)
+    return data if data is not None else {"error": NO_RECORDING_ERROR}
+
+
+def _require_api_key() -> None:
+    """Raise ValueError if no SerpAPI key is configured, unless responses are replayed."""
+    if not _key_pool and SERPAPI_RECORD_MODE != "replay":
+        logger.error("SERPAPI_API_KEY is not configured")
+        raise ValueError("SerpAPI key is not configured. Please set SERPAPI_API_KEY (or SERPAPI_API_KEYS) in your environment.")
+
 
 async def search_flights(
     origin: str,
@@ -34,6 +706,7 @@ async def search_flights(
     
     Supports both round-trip and one-way flights:
     - Round-trip: queries with type=1, optionally fetches return flight details
+      (the return-leg search runs concurrently with the outbound search)
     - One-way: queries with type=2, no return date needed
     
     This function extracts the arrival time of the last leg of the outbound flight,
@@ -48,18 +721,21 @@ async def search_flights(
                                Set to False for one-way flights.
     
     Returns:
-        List of flight dictionaries containing:
+        List of flight records (FlightOption, readable like dicts) containing:
         - price: Total price in USD (round-trip or one-way)
         - departure_time: Outbound flight departure time
         - arrival_time: Outbound flight arrival time (last leg)
         - airline: Primary airline name
         - duration_minutes: Total flight duration
         - stops: Number of stops
-        - flights: Full flight legs data from API
+        - layovers: Airport codes of the connections
+        - flights: Full flight legs data from API (looked up on access)
         - return_flight: Best matching return flight info (if include_return_flights=True and round-trip)
+        - return_alternatives: Next best return options (up to SERPAPI_RETURN_ALTERNATIVES)
     
     Raises:
-        Exception: If SerpAPI call fails or returns an error
+        SerpApiBudgetExhaustedError: If the SerpAPI rate budget or monthly quota is exhausted
+        SerpApiRequestError: If SerpAPI call fails (after retries) or returns an error
     
     Example (round-trip):
         >>> flights = await search_flights("LAX", "NRT", "2026-01-15", "2026-01-22")
@@ -76,42 +752,34 @@ async def search_flights(
     logger.info(f"Searching {trip_type} flights: {origin} -> {destination}, {outbound_date}" + 
                 (f" to {return_date}" if return_date and not is_one_way else ""))
     
-    # Validate API key is configured
-    if not SERPAPI_API_KEY:
-        logger.error("SERPAPI_API_KEY is not configured")
-        raise ValueError("SerpAPI key is not configured. Please set SERPAPI_API_KEY in your environment.")
+    # Validate API key is configured (not needed when replaying recordings)
+    _require_api_key()
     
-    # Build SerpAPI request parameters
-    # engine=google_flights: Use Google Flights data source
-    # type=1: Round trip flight search
-    # type=2: One way flight search
-    # sort_by=2: Sort results by price (lowest first)
-    params = {
-        "engine": "google_flights",
-        "api_key": SERPAPI_API_KEY,
-        "departure_id": origin.upper(),  # Airport codes should be uppercase
-        "arrival_id": destination.upper(),
-        "outbound_date": outbound_date,
-        "type": "2" if is_one_way else "1",  # 1 = Round trip, 2 = One way
-        "sort_by": "2",  # Sort by price
-        "currency": "USD",
-    }
-    
-    # Only include return_date for round-trip searches
-    if not is_one_way and return_date:
+    # Build SerpAPI request parameters (see _one_way_params)
+    # One-way searches share their params (and cache entries) with return-leg
+    # and fare-grid searches, so a leg searched by any of them is reused;
+    # round trips switch to type=1 and add the return date
+    params = _one_way_params(origin, destination, outbound_date)
+    if not is_one_way:
+        params["type"] = "1"  # 1 = Round trip, 2 = One way
         params["return_date"] = return_date
     
+    # Start the return-leg search right away (round-trip only)
+    # It does not depend on the outbound results, so both requests run concurrently
+    return_task = None
+    if not is_one_way:
+        return_task = asyncio.create_task(
+            _search_return_flights(destination, origin, return_date)
+        )
+    
     try:
         # Make async HTTP request to SerpAPI for outbound flights
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(SERPAPI_BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        data = await _serpapi_request(params)
         
         # Check for API errors in response
         if "error" in data:
             logger.error(f"SerpAPI error: {data['error']}")
-            raise Exception(f"SerpAPI error: {data['error']}")
+            raise SerpApiRequestError(f"SerpAPI error: {data['error']}")
         
         # Combine best_flights and other_flights for comprehensive results
         # best_flights: SerpAPI's recommended flights
@@ -127,25 +795,42 @@ async def search_flights(
         
         logger.info(f"Found {len(all_flights)} outbound flights")
         
-        # Fetch return flight options if requested (only for round-trip flights)
-        # This makes a separate search for the return leg to get actual return times
-        # Skip for one-way flights (is_one_way=True or no return_date)
-        if include_return_flights and all_flights and return_date and not is_one_way:
-            return_flights = await _search_return_flights(
-                destination, origin, return_date
-            )
+        # Wait for the concurrent return-leg search (only for round-trip flights)
+        # Matching runs once both outbound and return results have arrived
+        if return_task is not None and all_flights:
+            return_flights = await return_task
             
             # Match return flights to outbound flights by airline if possible
+            # The index is built once, so each match is a few bucket lookups
+            return_index = ReturnFlightIndex(return_flights)
             for flight in all_flights:
-                flight["return_flight"] = _find_best_return_flight(
-                    flight, return_flights
-                )
+                flight["return_flight"] = return_index.best(flight)
+                if SERPAPI_RETURN_ALTERNATIVES > 0:
+                    flight["return_alternatives"] = [
+                        rf for rf in return_index.top_k(flight, SERPAPI_RETURN_ALTERNATIVES + 1)
+                        if rf is not flight["return_flight"]
+                    ][:SERPAPI_RETURN_ALTERNATIVES]
+            
+            # Replace the matched return with the actually paired one (and its
+            # exact round-trip price) for the cheapest outbound options
+            if SERPAPI_EXACT_RETURN_PRICING:
+                await _apply_paired_returns(params, all_flights)
         
         return all_flights
         
-    except httpx.HTTPError as e:
+    except SerpApiRequestError as e:
         logger.error(f"HTTP error searching flights: {e}")
-        raise Exception(f"Failed to search flights: {e}")
+        raise SerpApiRequestError(
+            f"Failed to search flights: {e}",
+            status_code=e.status_code,
+            retryable=e.retryable,
+        ) from e
+    finally:
+        # Outbound search failed or found nothing - stop the pending return
+        # search so no upstream quota is spent on results we won't use
+        if return_task is not None and not return_task.done():
+            logger.info("Cancelling pending return flight search")
+            return_task.cancel()
 
 
 async def _search_return_flights(
@@ -169,22 +854,12 @@ async def _search_return_flights(
     logger.info(f"Searching return flights: {origin} -> {destination}, {departure_date}")
     
     # Build SerpAPI request for one-way return flight
-    params = {
-        "engine": "google_flights",
-        "api_key": SERPAPI_API_KEY,
-        "departure_id": origin.upper(),
-        "arrival_id": destination.upper(),
-        "outbound_date": departure_date,
-        "type": "2",  # 2 = One way
-        "sort_by": "2",  # Sort by price
-        "currency": "USD",
-    }
+    params = _one_way_params(origin, destination, departure_date)
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(SERPAPI_BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        # Return-leg enrichment is background work for the rate limiter:
+        # user-facing searches are served first when the budget is tight
+        data = await _serpapi_request(params, priority=Priority.BACKGROUND)
         
         if "error" in data:
             logger.warning(f"SerpAPI error for return flights: {data['error']}")
@@ -207,6 +882,24 @@ async def _search_return_flights(
         return []
 
 
+def _one_way_params(origin: str, destination: str, departure_date: str) -> dict:
+    """
+    Build SerpAPI params for a one-way, price-sorted flight search.
+    
+    Shared by one-way (including multi-city leg), return-leg and fare-grid
+    searches so identical legs hit the same cache entry.
+    """
+    return {
+        "engine": "google_flights",
+        "departure_id": origin.upper(),
+        "arrival_id": destination.upper(),
+        "outbound_date": departure_date,
+        "type": "2",  # 2 = One way
+        "sort_by": "2",  # Sort by price
+        "currency": "USD",
+    }
+
+
 def _parse_return_flight(flight_group: dict) -> Optional[dict]:
     """
     Parse a return flight from SerpAPI response.
@@ -243,53 +936,90 @@ def _parse_return_flight(flight_group: dict) -> Optional[dict]:
         return None
 
 
-def _find_best_return_flight(outbound: dict, return_flights: list[dict]) -> Optional[dict]:
+async def _apply_paired_returns(
+    params: dict,
+    flights: list[FlightOption],
+    top_n: int = SERPAPI_DEPARTURE_TOKEN_TOP_N,
+    max_concurrency: int = SERPAPI_DEPARTURE_TOKEN_CONCURRENCY,
+    budget_seconds: float = SERPAPI_DEPARTURE_TOKEN_BUDGET_SECONDS,
+) -> None:
     """
-    Find the best matching return flight for an outbound flight.
+    Price the top_n cheapest round-trip flights exactly via their departure_token.
     
-    Prefers return flights with:
-    1. Same airline as outbound (for consistency)
-    2. Similar number of stops
-    3. Reasonable departure time
+    Each follow-up search returns the return flights SerpAPI pairs with that
+    outbound flight, priced as the whole round trip. The cheapest pair replaces
+    the matched return_flight (marked "paired") and the flight's price; the
+    next pairs become its return_alternatives. Follow-ups go through the search
+    cache, so repeating a search does not spend quota again.
     
-    Args:
-        outbound: The outbound flight
-        return_flights: Available return flight options
+    Flights whose follow-up fails or misses the latency budget keep their
+    matched return. The list is re-sorted by price afterwards.
     
-    Returns:
-        Best matching return flight or None
+    Args:
+        params: Outbound round-trip search params (the follow-ups reuse them)
+        flights: Parsed outbound flights, cheapest first (updated in place)
+        top_n: Number of cheapest flights to follow up
+        max_concurrency: Follow-up searches in flight at once
+        budget_seconds: Time allowed for all follow-ups together
     """
-    if not return_flights:
-        return None
+    candidates = [flight for flight in flights[:top_n] if flight.departure_token]
+    if not candidates:
+        return
     
-    outbound_airline = outbound.get("airline", "").lower()
-    outbound_stops = outbound.get("stops", 0)
+    remaining = await asyncio.to_thread(_rate_limiter.quota.remaining)
+    if remaining is not None and remaining - len(candidates) < SERPAPI_DEPARTURE_TOKEN_QUOTA_RESERVE:
+        logger.info(f"Skipping departure_token follow-ups, only {remaining} monthly searches left")
+        return
     
-    # Score each return flight
-    scored_flights = []
-    for rf in return_flights:
-        score = 0
-        
-        # Prefer same airline
-        if rf.get("airline", "").lower() == outbound_airline:
-            score += 10
-        
-        # Prefer similar number of stops
-        stops_diff = abs(rf.get("stops", 0) - outbound_stops)
-        score -= stops_diff * 2
-        
-        # Prefer non-stop if outbound is non-stop
-        if outbound_stops == 0 and rf.get("stops", 0) == 0:
-            score += 5
-        
-        scored_flights.append((score, rf))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    paired: dict[int, list[dict]] = {}
+    
+    async def follow(position: int, flight: FlightOption) -> None:
+        async with semaphore:
+            try:
+                data = await _serpapi_request({**params, "departure_token": flight.departure_token})
+            except SerpApiError as e:
+                logger.warning(f"departure_token follow-up failed: {e}")
+                return
+        _request_stats["departure_token_followups"] += 1
+        if "error" in data:
+            logger.warning(f"departure_token follow-up error: {data['error']}")
+            return
+        options = [
+            option
+            for group in data.get("best_flights", []) + data.get("other_flights", [])
+            if (option := _parse_return_flight(group)) and option.get("price")
+        ]
+        if options:
+            options.sort(key=lambda option: option["price"])
+            paired[position] = options
+    
+    try:
+        async with asyncio.timeout(budget_seconds):
+            async with asyncio.TaskGroup() as group:
+                for position, flight in enumerate(candidates):
+                    group.create_task(follow(position, flight))
+    except TimeoutError:
+        _request_stats["departure_token_timeouts"] += 1
+        logger.warning(
+            f"departure_token follow-ups exceeded {budget_seconds}s, "
+            f"{len(candidates) - len(paired)} flight(s) keep their matched return"
+        )
+    
+    for position, options in paired.items():
+        flight = candidates[position]
+        for option in options:
+            option["paired"] = True
+        flight["return_flight"] = options[0]
+        flight["return_alternatives"] = options[1:1 + SERPAPI_RETURN_ALTERNATIVES]
+        flight["price"] = options[0]["price"]
     
-    # Sort by score (highest first) and return best match
-    scored_flights.sort(key=lambda x: x[0], reverse=True)
-    return scored_flights[0][1] if scored_flights else None
+    logger.info(f"Exact round-trip prices for {len(paired)} of {len(candidates)} flights")
+    # Stable sort keeps SerpAPI's ordering within equal prices
+    flights.sort(key=lambda flight: flight.get("price") or float("inf"))
 
 
-def _parse_flight(flight_group: dict) -> Optional[dict]:
+def _parse_flight(flight_group: dict) -> Optional[FlightOption]:
     """
     Parse a flight group from SerpAPI response into a normalized format.
     
@@ -303,7 +1033,7 @@ def _parse_flight(flight_group: dict) -> Optional[dict]:
         flight_group: Raw flight data from SerpAPI response
     
     Returns:
-        Normalized flight dictionary or None if parsing fails
+        Normalized flight record (dict view, see FlightOption) or None if parsing fails
     """
     try:
         flights = flight_group.get("flights", [])
@@ -353,25 +1083,242 @@ def _parse_flight(flight_group: dict) -> Optional[dict]:
                 "duration_minutes": flight_group.get("return_duration", 0),
             }
         
-        return {
-            "price": price,
+        return FlightOption(
+            price=price,
             # Outbound flight details
-            "departure_time": departure_time,
-            "departure_code": departure_code,
-            "arrival_time": arrival_time,  # Time when traveler arrives at destination
-            "arrival_code": arrival_code,
-            "airline": airline,
-            "duration_minutes": total_duration,
-            "stops": len(flights) - 1,  # Number of connections
-            "flights": flights,  # Full flight leg data for reference
+            departure_time=departure_time,
+            departure_code=departure_code,
+            arrival_time=arrival_time,  # Time when traveler arrives at destination
+            arrival_code=arrival_code,
+            airline=airline,
+            duration_minutes=total_duration,
+            stops=len(flights) - 1,  # Number of connections
+            # Connection airports (kept so formatters need not load the raw legs)
+            layovers=[
+                code
+                for leg in flights[:-1]
+                if (code := leg.get("arrival_airport", {}).get("id") or leg.get("arrival_code"))
+            ],
             # Return flight details (None if one-way or not available)
-            "return_flight": return_flight_info,
-        }
+            return_flight=return_flight_info,
+            # Full flight leg data stays in the raw response, read on demand
+            _source=flight_group,
+        )
     except Exception as e:
         logger.warning(f"Failed to parse flight: {e}")
         return None
 
 
+async def search_flights_multi_airport(
+    origin: str,
+    destination: str,
+    outbound_date: str,
+    return_date: str = None,
+    include_return_flights: bool = True,
+    radius_km: float = 0.0,
+    max_pairs: int = SERPAPI_MULTI_AIRPORT_MAX_PAIRS,
+) -> list[dict]:
+    """
+    Search flights from every airport near the origin to every airport near the destination.
+    
+    Each side is expanded to its metro siblings plus all catalog airports within
+    radius_km (e.g. JFK -> JFK, LGA, EWR). Airport pairs are ranked by total
+    distance from the requested airports and capped at max_pairs, so the number
+    of SerpAPI searches stays bounded. Pairs are searched concurrently.
+    
+    Args:
+        origin: Departure airport code (e.g., "JFK")
+        destination: Arrival airport code (e.g., "NRT")
+        outbound_date: Departure date in YYYY-MM-DD format
+        return_date: Return date in YYYY-MM-DD format (optional for one-way)
+        include_return_flights: If True, fetch return flight options for round-trip
+        radius_km: Extra search radius around each airport (0 = metro airports only)
+        max_pairs: Maximum number of origin/destination airport pairs searched
+    
+    Returns:
+        Flights from all searched pairs (same format as search_flights), cheapest first.
+        Each flight's departure_code/arrival_code tell which airports it uses.
+    
+    Raises:
+        SerpApiBudgetExhaustedError / SerpApiRequestError: If every pair search failed
+    """
+    pairs = _airport_pairs(origin, destination, radius_km, max(1, max_pairs))
+    logger.info(f"Multi-airport search {origin} -> {destination}: {', '.join(f'{o}-{d}' for o, d in pairs)}")
+    
+    results = await asyncio.gather(
+        *(
+            search_flights(o, d, outbound_date, return_date, include_return_flights)
+            for o, d in pairs
+        ),
+        return_exceptions=True,
+    )
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for error in errors:
+        logger.warning(f"Airport pair search failed: {error}")
+    
+    merged = [flight for r in results if not isinstance(r, BaseException) for flight in r]
+    # Stable sort keeps SerpAPI's ordering within equal prices
+    merged.sort(key=lambda flight: flight.get("price") or float("inf"))
+    return merged
+
+
+def _airport_pairs(origin: str, destination: str, radius_km: float, max_pairs: int) -> list[tuple[str, str]]:
+    """
+    Return origin/destination airport pairs to search, closest to the request first.
+    
+    The requested pair always comes first. Codes missing from the airport
+    catalog are searched as-is.
+    """
+    catalog = get_airport_catalog()
+    origins = catalog.nearby_airports(origin, radius_km) or [(None, 0.0)]
+    destinations = catalog.nearby_airports(destination, radius_km) or [(None, 0.0)]
+    
+    pairs = []
+    for o_airport, o_distance in origins:
+        o_code = o_airport.code if o_airport else origin.upper()
+        for d_airport, d_distance in destinations:
+            d_code = d_airport.code if d_airport else destination.upper()
+            if o_code != d_code:
+                pairs.append((o_distance + d_distance, o_code, d_code))
+    
+    pairs.sort(key=lambda pair: (pair[0], pair[1] != origin.upper(), pair[2] != destination.upper()))
+    return [(o_code, d_code) for _, o_code, d_code in pairs[:max_pairs]]
+
+
+async def search_flights_grid(
+    origin: str,
+    destination: str,
+    outbound_range: tuple[str, str],
+    trip_length_range: tuple[int, int],
+    max_concurrency: int = SERPAPI_GRID_MAX_CONCURRENCY,
+) -> dict:
+    """
+    Find the cheapest fares over a range of outbound dates and trip lengths.
+    
+    Instead of one round-trip search per date pair, every distinct one-way leg
+    is searched once (outbound legs per outbound date, return legs per return
+    date) with bounded concurrency. Legs go through the regular SerpAPI request
+    path, so cached legs (e.g. from earlier return-flight searches) are reused.
+    
+    Cell prices are the sum of the cheapest outbound and cheapest return
+    one-way fares, which can differ from a bundled round-trip fare.
+    
+    Args:
+        origin: Departure airport code (e.g., "LAX")
+        destination: Arrival airport code (e.g., "NRT")
+        outbound_range: Earliest and latest outbound date (YYYY-MM-DD, inclusive)
+        trip_length_range: Shortest and longest trip in nights (inclusive)
+        max_concurrency: Maximum number of leg searches in flight at once
+    
+    Returns:
+        Dictionary containing:
+        - origin, destination: Airport codes as searched
+        - outbound_dates: Row labels (YYYY-MM-DD)
+        - return_dates: Column labels (YYYY-MM-DD)
+        - prices: Matrix [outbound][return] of total prices, None where the
+          trip length is out of range or a leg had no fares
+        - cheapest: {"outbound_date", "return_date", "price"} or None
+        - legs_searched / legs_failed: Number of one-way legs searched / without fares
+    
+    Raises:
+        ValueError: If the ranges are invalid or the grid exceeds the configured limits
+        SerpApiBudgetExhaustedError: If every leg search failed on the SerpAPI budget
+        SerpApiRequestError: If every leg search failed
+    
+    Example:
+        >>> grid = await search_flights_grid("LAX", "NRT", ("2026-03-01", "2026-03-31"), (7, 7))
+        >>> print(grid["cheapest"])
+    """
+    _require_api_key()
+    
+    first_outbound = datetime.strptime(outbound_range[0].strip()[:10], "%Y-%m-%d")
+    last_outbound = datetime.strptime(outbound_range[1].strip()[:10], "%Y-%m-%d")
+    min_nights, max_nights = int(trip_length_range[0]), int(trip_length_range[1])
+    
+    if last_outbound < first_outbound or min_nights < 0 or max_nights < min_nights:
+        raise ValueError("Invalid flexible-date range")
+    
+    outbound_count = (last_outbound - first_outbound).days + 1
+    if outbound_count > SERPAPI_GRID_MAX_OUTBOUND_DATES:
+        raise ValueError(f"Too many outbound dates ({outbound_count}, max {SERPAPI_GRID_MAX_OUTBOUND_DATES})")
+    if max_nights - min_nights + 1 > SERPAPI_GRID_MAX_TRIP_LENGTHS:
+        raise ValueError(f"Too many trip lengths (max {SERPAPI_GRID_MAX_TRIP_LENGTHS})")
+    
+    outbound_dates = [first_outbound + timedelta(days=i) for i in range(outbound_count)]
+    return_dates = [
+        first_outbound + timedelta(days=i)
+        for i in range(min_nights, outbound_count + max_nights)
+    ]
+    outbound_labels = [d.strftime("%Y-%m-%d") for d in outbound_dates]
+    return_labels = [d.strftime("%Y-%m-%d") for d in return_dates]
+    
+    logger.info(
+        f"Searching fare grid {origin} -> {destination}: {outbound_count} outbound dates, "
+        f"{min_nights}-{max_nights} nights ({outbound_count + len(return_labels)} legs)"
+    )
+    
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def cheapest_leg(leg_origin: str, leg_destination: str, date: str) -> Optional[float]:
+        async with semaphore:
+            data = await _serpapi_request(_one_way_params(leg_origin, leg_destination, date))
+        if "error" in data:
+            return None
+        prices = [
+            group["price"]
+            for group in data.get("best_flights", []) + data.get("other_flights", [])
+            if group.get("price")
+        ]
+        return min(prices) if prices else None
+    
+    legs = [cheapest_leg(origin, destination, date) for date in outbound_labels]
+    legs += [cheapest_leg(destination, origin, date) for date in return_labels]
+    results = await asyncio.gather(*legs, return_exceptions=True)
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for error in errors:
+        logger.warning(f"Fare grid leg search failed: {error}")
+    
+    leg_prices = [None if isinstance(r, BaseException) else r for r in results]
+    outbound_prices = leg_prices[:outbound_count]
+    return_prices = leg_prices[outbound_count:]
+    
+    prices = []
+    cheapest = None
+    for row, outbound_price in enumerate(outbound_prices):
+        cells = []
+        for col, return_price in enumerate(return_prices):
+            nights = col + min_nights - row
+            if outbound_price is None or return_price is None or not min_nights <= nights <= max_nights:
+                cells.append(None)
+                continue
+            total = outbound_price + return_price
+            cells.append(total)
+            if cheapest is None or total < cheapest["price"]:
+                cheapest = {
+                    "outbound_date": outbound_labels[row],
+                    "return_date": return_labels[col],
+                    "price": total,
+                }
+        prices.append(cells)
+    
+    return {
+        "origin": origin.upper(),
+        "destination": destination.upper(),
+        "outbound_dates": outbound_labels,
+        "return_dates": return_labels,
+        "prices": prices,
+        "cheapest": cheapest,
+        "legs_searched": len(results),
+        "legs_failed": sum(1 for price in leg_prices if price is None),
+    }
+
+
 async def search_hotels(
     location: str,
     check_in_date: str,
@@ -382,6 +1329,7 @@ async def search_hotels(
     
     This function queries SerpAPI for hotels at the destination, sorted by price.
     If hotel check-in time is not provided by the API, it defaults to 15:00 (3 PM).
+    Only the first page of results is returned; use iter_hotel_pages() to read more.
     
     Args:
         location: City name or specific location (e.g., "Tokyo", "Paris, France")
@@ -396,45 +1344,72 @@ async def search_hotels(
         - check_in_time: Expected check-in time (default: "15:00" if not specified)
         - check_in_date: The check-in date
         - amenities: List of hotel amenities
+        - latitude / longitude: Hotel coordinates (None if not provided)
     
     Raises:
-        Exception: If SerpAPI call fails or returns an error
+        SerpApiBudgetExhaustedError: If the SerpAPI rate budget or monthly quota is exhausted
+        SerpApiRequestError: If SerpAPI call fails (after retries) or returns an error
     
     Example:
         >>> hotels = await search_hotels("Tokyo", "2026-01-15", "2026-01-22")
         >>> print(hotels[0]["name"], hotels[0]["price"])
     """
-    logger.info(f"Searching hotels in {location}, {check_in_date} to {check_out_date}")
+    hotels, _ = await search_hotels_page(location, check_in_date, check_out_date)
+    return hotels
+
+
+async def search_hotels_page(
+    location: str,
+    check_in_date: str,
+    check_out_date: str,
+    page_token: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Fetch one page of Google Hotels results.
     
-    # Validate API key is configured
-    if not SERPAPI_API_KEY:
-        logger.error("SERPAPI_API_KEY is not configured")
-        raise ValueError("SerpAPI key is not configured. Please set SERPAPI_API_KEY in your environment.")
+    Args:
+        location: City name or specific location (e.g., "Tokyo", "Paris, France")
+        check_in_date: Check-in date in YYYY-MM-DD format
+        check_out_date: Check-out date in YYYY-MM-DD format
+        page_token: next_page_token from the previous page (None for the first page)
+    
+    Returns:
+        Tuple of (hotels on this page, token for the next page or None if last page)
+    
+    Raises:
+        SerpApiBudgetExhaustedError: If the SerpAPI rate budget or monthly quota is exhausted
+        SerpApiRequestError: If SerpAPI call fails (after retries) or returns an error
+    """
+    logger.info(
+        f"Searching hotels in {location}, {check_in_date} to {check_out_date}"
+        + (" (next page)" if page_token else "")
+    )
+    
+    # Validate API key is configured (not needed when replaying recordings)
+    _require_api_key()
     
     # Build SerpAPI request parameters
     # engine=google_hotels: Use Google Hotels data source
     # sort_by=3: Sort by lowest price
     params = {
         "engine": "google_hotels",
-        "api_key": SERPAPI_API_KEY,
         "q": location,  # Location query string
         "check_in_date": check_in_date,
         "check_out_date": check_out_date,
         "sort_by": "3",  # Sort by lowest price
         "currency": "USD",
     }
+    if page_token:
+        params["next_page_token"] = page_token
     
     try:
         # Make async HTTP request to SerpAPI
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(SERPAPI_BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        data = await _serpapi_request(params)
         
         # Check for API errors in response
         if "error" in data:
             logger.error(f"SerpAPI error: {data['error']}")
-            raise Exception(f"SerpAPI error: {data['error']}")
+            raise SerpApiRequestError(f"SerpAPI error: {data['error']}")
         
         # Parse hotel properties from response
         hotels = []
@@ -446,15 +1421,55 @@ async def search_hotels(
             if hotel_info:
                 hotels.append(hotel_info)
         
-        logger.info(f"Found {len(hotels)} hotels")
-        return hotels
+        next_page_token = (data.get("serpapi_pagination") or {}).get("next_page_token")
+        
+        logger.info(f"Found {len(hotels)} hotels" + (", more pages available" if next_page_token else ""))
+        return hotels, next_page_token
         
-    except httpx.HTTPError as e:
+    except SerpApiRequestError as e:
         logger.error(f"HTTP error searching hotels: {e}")
-        raise Exception(f"Failed to search hotels: {e}")
+        raise SerpApiRequestError(
+            f"Failed to search hotels: {e}",
+            status_code=e.status_code,
+            retryable=e.retryable,
+        ) from e
 
 
-def _parse_hotel(property_data: dict, check_in_date: str) -> Optional[dict]:
+async def iter_hotel_pages(
+    location: str,
+    check_in_date: str,
+    check_out_date: str,
+    max_pages: int = SERPAPI_HOTEL_MAX_PAGES,
+) -> AsyncIterator[list[dict]]:
+    """
+    Yield parsed hotels page by page, following SerpAPI's next_page_token.
+    
+    Pages are only requested when the consumer asks for them, so a consumer
+    that stops iterating (see travel_logic.collect_hotel_pages) does not pay
+    for the remaining pages.
+    
+    Args:
+        location: City name or specific location (e.g., "Tokyo", "Paris, France")
+        check_in_date: Check-in date in YYYY-MM-DD format
+        check_out_date: Check-out date in YYYY-MM-DD format
+        max_pages: Maximum number of pages to fetch
+    
+    Yields:
+        List of hotel dictionaries (same format as search_hotels) per page
+    
+    Example:
+        >>> async for page in iter_hotel_pages("Tokyo", "2026-01-15", "2026-01-22"):
+        ...     print(len(page))
+    """
+    page_token = None
+    for _ in range(max(1, max_pages)):
+        hotels, page_token = await search_hotels_page(location, check_in_date, check_out_date, page_token)
+        yield hotels
+        if not page_token:
+            break
+
+
+def _parse_hotel(property_data: dict, check_in_date: str) -> Optional[HotelOption]:
     """
     Parse a hotel property from SerpAPI response into a normalized format.
     
@@ -471,7 +1486,7 @@ def _parse_hotel(property_data: dict, check_in_date: str) -> Optional[dict]:
         check_in_date: The requested check-in date
     
     Returns:
-        Normalized hotel dictionary or None if parsing fails
+        Normalized hotel record (dict view, see HotelOption) or None if parsing fails
     """
     try:
         name = property_data.get("name", "Unknown Hotel")
@@ -481,10 +1496,12 @@ def _parse_hotel(property_data: dict, check_in_date: str) -> Optional[dict]:
         rate_per_night = property_data.get("rate_per_night", {})
         price = rate_per_night.get("lowest", 0)
         
-        # If no rate_per_night, try total_rate
+        # If no rate_per_night, try total_rate (the price of the whole stay)
+        price_is_total = False
         if not price:
             total_rate = property_data.get("total_rate", {})
             price = total_rate.get("lowest", 0)
+            price_is_total = bool(price)
         
         # Extract numeric price from string if needed (e.g., "$150" -> 150)
         if isinstance(price, str):
@@ -521,19 +1538,29 @@ def _parse_hotel(property_data: dict, check_in_date: str) -> Optional[dict]:
         amenities = property_data.get("amenities", [])
         
         # Extract hotel class/stars if available
-        hotel_class = property_data.get("hotel_class", 0)
+        # SerpAPI sends "hotel_class": "4-star hotel" and the number as extracted_hotel_class
+        hotel_class = property_data.get("extracted_hotel_class")
+        if hotel_class is None:
+            stars = re.match(r"\s*(\d+(?:\.\d+)?)", str(property_data.get("hotel_class") or ""))
+            hotel_class = float(stars.group(1)) if stars else 0
         
-        return {
-            "name": name,
-            "price": price,
-            "rating": overall_rating,  # Overall rating (for backward compatibility)
-            "overall_rating": overall_rating,  # Explicit overall rating
-            "location_rating": location_rating,  # Location-specific rating
-            "hotel_class": hotel_class,  # Star rating (e.g., 3, 4, 5 stars)
-            "check_in_time": check_in_time,
-            "check_in_date": check_in_date,
-            "amenities": amenities,
-        }
+        # Extract GPS coordinates if available (used to find nearby activities)
+        gps = property_data.get("gps_coordinates") or {}
+        
+        return HotelOption(
+            name=name,
+            price=price,
+            price_is_total=price_is_total,
+            rating=overall_rating,  # Overall rating (for backward compatibility)
+            overall_rating=overall_rating,  # Explicit overall rating
+            location_rating=location_rating,  # Location-specific rating
+            hotel_class=hotel_class,  # Star rating (e.g., 3, 4, 5 stars)
+            check_in_time=check_in_time,
+            check_in_date=check_in_date,
+            amenities=amenities,
+            latitude=gps.get("latitude"),
+            longitude=gps.get("longitude"),
+        )
     except Exception as e:
         logger.warning(f"Failed to parse hotel: {e}")
         return None
@@ -567,9 +1594,11 @@ async def search_activities(
         - phone: Contact phone (if available)
         - website: Website URL (if available)
         - thumbnail: Image URL (if available)
+        - place_id: Google place id (if available)
     
     Raises:
-        Exception: If SerpAPI call fails or returns an error
+        SerpApiBudgetExhaustedError: If the SerpAPI rate budget or monthly quota is exhausted
+        SerpApiRequestError: If SerpAPI call fails (after retries) or returns an error
     
     Example:
         >>> activities = await search_activities("San Jose, CA", "attractions")
@@ -577,30 +1606,24 @@ async def search_activities(
     """
     logger.info(f"Searching activities in {location}, type: {activity_type}")
     
-    # Validate API key is configured
-    if not SERPAPI_API_KEY:
-        logger.error("SERPAPI_API_KEY is not configured")
-        raise ValueError("SerpAPI key is not configured. Please set SERPAPI_API_KEY in your environment.")
+    # Validate API key is configured (not needed when replaying recordings)
+    _require_api_key()
     
     # Build SerpAPI request parameters
     # engine=google_local: Use Google Local/Maps data source for activities
     params = {
         "engine": "google_local",
-        "api_key": SERPAPI_API_KEY,
         "q": f"{activity_type} in {location}",
     }
     
     try:
         # Make async HTTP request to SerpAPI
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(SERPAPI_BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        data = await _serpapi_request(params)
         
         # Check for API errors in response
         if "error" in data:
             logger.error(f"SerpAPI error: {data['error']}")
-            raise Exception(f"SerpAPI error: {data['error']}")
+            raise SerpApiRequestError(f"SerpAPI error: {data['error']}")
         
         # Parse local results from response
         activities = []
@@ -614,9 +1637,69 @@ async def search_activities(
         logger.info(f"Found {len(activities)} activities")
         return activities
         
-    except httpx.HTTPError as e:
+    except SerpApiRequestError as e:
         logger.error(f"HTTP error searching activities: {e}")
-        raise Exception(f"Failed to search activities: {e}")
+        raise SerpApiRequestError(
+            f"Failed to search activities: {e}",
+            status_code=e.status_code,
+            retryable=e.retryable,
+        ) from e
+
+
+async def search_activities_multi(
+    location: str,
+    activity_types: list[str],
+    max_types: int = SERPAPI_ACTIVITY_MAX_TYPES,
+    merge_radius_m: float = SERPAPI_ACTIVITY_MERGE_RADIUS_METERS,
+) -> list[dict]:
+    """
+    Search several activity types at a location and merge them into one ranked list.
+    
+    Each type is one search_activities call; the calls run concurrently and go
+    through the regular SerpAPI request path (cache, single-flight, rate
+    limits). Places found under several types are merged (same place_id, or
+    matching names within merge_radius_m), see activities.py.
+    
+    Args:
+        location: City name or specific location (e.g., "San Jose, CA", "Tokyo")
+        activity_types: Types to search (e.g. ["museums", "parks", "restaurants"]);
+                        duplicates are dropped and at most max_types are searched
+        max_types: Maximum number of types searched
+        merge_radius_m: Places with matching names closer than this are merged
+    
+    Returns:
+        Activities (same format as search_activities) plus "categories", the
+        types each place was found under, best first
+    
+    Raises:
+        SerpApiBudgetExhaustedError / SerpApiRequestError: If every type search failed
+    
+    Example:
+        >>> activities = await search_activities_multi("Paris", ["museums", "parks", "restaurants"])
+        >>> print(activities[0]["name"], activities[0]["categories"])
+    """
+    types = list(dict.fromkeys(t.strip().lower() for t in activity_types if t.strip()))[:max(1, max_types)]
+    if not types:
+        types = ["things to do"]
+    logger.info(f"Searching activities in {location}, types: {', '.join(types)}")
+    
+    results = await asyncio.gather(
+        *(search_activities(location, activity_type) for activity_type in types),
+        return_exceptions=True,
+    )
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    for error in errors:
+        logger.warning(f"Activity type search failed: {error}")
+    
+    merged = merge_activities(
+        [(t, r) for t, r in zip(types, results) if not isinstance(r, BaseException)],
+        radius_m=merge_radius_m,
+    )
+    logger.info(f"Merged {sum(len(r) for r in results if not isinstance(r, BaseException))} activities into {len(merged)}")
+    return merged
 
 
 def _parse_activity(place_data: dict) -> Optional[dict]:
@@ -669,6 +1752,9 @@ def _parse_activity(place_data: dict) -> Optional[dict]:
         latitude = gps.get("latitude")
         longitude = gps.get("longitude")
         
+        # Google place id (used to merge results of several searches)
+        place_id = place_data.get("place_id", "")
+        
         return {
             "name": name,
             "address": address,
@@ -683,6 +1769,7 @@ def _parse_activity(place_data: dict) -> Optional[dict]:
             "price_level": price_level,
             "latitude": latitude,
             "longitude": longitude,
+            "place_id": place_id,
         }
     except Exception as e:
         logger.warning(f"Failed to parse activity: {e}")
@@ -0,0 +1,48 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Travel Agent Server Routes
+
+Extra HTTP routes mounted next to the A2A endpoints of the flight, hotel and
+activity agent servers.
+
+Routes:
+- GET /metrics: SerpAPI client-side metrics (cache, rate limiter, quota, etc.)
+- GET /health: "ok", or "degraded" while a SerpAPI circuit breaker is not closed
+"""
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from agents.travel.serpapi_tools import get_serpapi_health, get_serpapi_metrics
+
+
+async def metrics_endpoint(request: Request) -> JSONResponse:
+    """Return SerpAPI metrics for this agent process as JSON."""
+    return JSONResponse(await get_serpapi_metrics())
+
+
+
+async def health_endpoint(request: Request) -> JSONResponse:
+    """
+    Return the health of this agent process as JSON.
+
+    Always answers 200: with a breaker open the agent still serves cached
+    results, so it should stay in rotation.
+    """
+    return JSONResponse(get_serpapi_health())
+
+
+def build_travel_routes() -> list[Route]:
+    """
+    Build the extra routes for a travel agent server.
+
+    Returns:
+        List of Starlette routes to pass to A2AStarletteApplication.build()
+    """
+    return [
+        Route("/metrics", metrics_endpoint, methods=["GET"]),
+        Route("/health", health_endpoint, methods=["GET"]),
+    ]
@@ -0,0 +1,126 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Single-Flight Request Coalescing Module
+
+When many users search the same route or city at the same moment, only the
+first caller (the "leader") should hit SerpAPI. Concurrent callers with the
+same key wait on the leader's in-flight call and share its result.
+
+Key components:
+- SingleFlight: Deduplicates concurrent async calls by key and reports
+  per-key waiter counts via stats()
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger("lungo.travel.single_flight")
+
+# Number of recently completed coalesced calls kept for metrics
+_RECENT_CALLS_LIMIT = 50
+
+
+@dataclass
+class _InFlightCall:
+    """Bookkeeping for one in-flight call shared by several waiters."""
+    task: asyncio.Task
+    label: str
+    waiters: int = 0
+    total_waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share the same key.
+
+    The underlying call runs as its own task, so cancelling one waiter does not
+    cancel the call for the others. The call is only cancelled when every
+    waiter has gone away.
+
+    Example:
+        >>> single_flight = SingleFlight()
+        >>> data = await single_flight.do(key, lambda: fetch(params), label="google_flights LAX-NRT")
+    """
+
+    def __init__(self):
+        """Initialize with no in-flight calls."""
+        self._inflight: dict[str, _InFlightCall] = {}
+        self._recent: deque[dict] = deque(maxlen=_RECENT_CALLS_LIMIT)
+        self._stats = {
+            "calls": 0,
+            "coalesced": 0,
+            "max_waiters": 0,
+        }
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        label: Optional[str] = None,
+    ) -> Any:
+        """
+        Run fn() once for all concurrent callers using the same key.
+
+        Args:
+            key: Deduplication key (e.g. the normalized request params hash)
+            fn: Zero-argument coroutine factory performing the real call
+            label: Human-readable description of the call for metrics
+
+        Returns:
+            The result of fn(), shared by all waiters
+
+        Raises:
+            Whatever fn() raises - every waiter receives the same exception
+        """
+        call = self._inflight.get(key)
+        if call is None:
+            call = _InFlightCall(task=asyncio.ensure_future(fn()), label=label or key[:16])
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+            self._stats["calls"] += 1
+        else:
+            self._stats["coalesced"] += 1
+            logger.debug(f"Coalescing request into in-flight call: {call.label}")
+
+        call.waiters += 1
+        call.total_waiters += 1
+        self._stats["max_waiters"] = max(self._stats["max_waiters"], call.waiters)
+
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # Last waiter gone - nobody needs the result, stop the upstream call
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _InFlightCall) -> None:
+        """Remove a finished call and record its waiter count."""
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        self._recent.append({"label": call.label, "waiters": call.total_waiters})
+        if not call.task.cancelled() and call.task.exception() is not None:
+            # Exception is delivered to waiters; retrieve it here so an
+            # unobserved failure is not logged as "never retrieved"
+            logger.debug(f"In-flight call failed: {call.label}")
+
+    def stats(self) -> dict:
+        """
+        Return coalescing counters and per-key waiter counts.
+
+        Returns:
+            Dictionary with total calls, coalesced waiters, the largest waiter
+            count seen, waiters per in-flight key, and recent completed calls
+        """
+        return {
+            **self._stats,
+            "inflight": {call.label: call.waiters for call in self._inflight.values()},
+            "recent": list(self._recent),
+        }
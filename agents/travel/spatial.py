@@ -0,0 +1,154 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Activity Spatial Index Module
+
+Grid index of a destination's activities, used to relate hotels to the places
+around them ("what can I walk to from this hotel?").
+
+Activities with coordinates are bucketed into square cells about cell_km wide
+(longitude cells are widened by 1/cos(latitude) of the destination, so cells
+are square on the ground). A radius query only computes distances for the
+activities in cells overlapping the radius, so walkable-distance lookups for a
+hotel take microseconds even for a few hundred activities.
+
+Indexes are kept per destination (the few most recently used), so the hotels
+of a search can all be queried against the activities found for the same city.
+
+Key components:
+- ActivityIndex: Grid of one destination's activities with radius queries
+- index_activities: Build and remember the index of a destination
+- get_activity_index: Look up a remembered index
+"""
+
+import math
+from collections import OrderedDict
+from typing import Mapping, Optional
+
+from agents.travel.airports import haversine_km
+
+# Approximate length of one degree of latitude
+_KM_PER_DEGREE = 111.2
+
+# Destinations whose activity index is kept
+_MAX_INDEXES = 32
+
+
+class ActivityIndex:
+    """
+    Activities of one destination bucketed into a lat/lon grid.
+
+    Example:
+        >>> index = ActivityIndex(activities)
+        >>> for activity, distance_km in index.within(hotel["latitude"], hotel["longitude"], 1.0):
+        ...     print(activity["name"], round(distance_km, 2))
+    """
+
+    def __init__(self, activities: list[Mapping], cell_km: float = 0.5):
+        """
+        Build the grid.
+
+        Args:
+            activities: Activities with "latitude" and "longitude" (others are skipped)
+            cell_km: Grid cell size in kilometres
+        """
+        self.cell_km = cell_km
+        self._cell_degrees = cell_km / _KM_PER_DEGREE
+        self._points: list[tuple[float, float, Mapping]] = []
+        self._grid: dict[tuple[int, int], list[int]] = {}
+
+        located = [a for a in activities if _coordinates(a) is not None]
+        # One destination spans a small latitude range, so one scale fits all cells
+        reference_lat = _coordinates(located[0])[0] if located else 0.0
+        self._lon_scale = max(math.cos(math.radians(reference_lat)), 0.01)
+
+        for activity in located:
+            lat, lon = _coordinates(activity)
+            self._grid.setdefault(self._cell(lat, lon), []).append(len(self._points))
+            self._points.append((lat, lon, activity))
+
+        self.skipped = len(activities) - len(located)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+    ) -> list[tuple[Mapping, float]]:
+        """
+        Return activities within radius_km of a point, nearest first.
+
+        Args:
+            lat, lon: Point to search around (e.g. a hotel)
+            radius_km: Search radius
+            limit: Return at most this many (None = all)
+
+        Returns:
+            (activity, distance_km) pairs
+        """
+        span = int(math.ceil(radius_km / self.cell_km))
+        row, col = self._cell(lat, lon)
+
+        results = []
+        for r in range(row - span, row + span + 1):
+            for c in range(col - span, col + span + 1):
+                for position in self._grid.get((r, c), ()):
+                    p_lat, p_lon, activity = self._points[position]
+                    distance = haversine_km(lat, lon, p_lat, p_lon)
+                    if distance <= radius_km:
+                        results.append((distance, position, activity))
+        results.sort(key=lambda item: (item[0], item[1]))
+        return [(activity, distance) for distance, _, activity in results[:limit]]
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        """Return the grid cell of a point."""
+        return (
+            math.floor(lat / self._cell_degrees),
+            math.floor(lon * self._lon_scale / self._cell_degrees),
+        )
+
+
+_indexes: "OrderedDict[str, ActivityIndex]" = OrderedDict()
+
+
+def index_activities(destination: str, activities: list[Mapping], cell_km: float = 0.5) -> ActivityIndex:
+    """Build the activity index of a destination and remember it (replacing an older one)."""
+    index = ActivityIndex(activities, cell_km=cell_km)
+    key = _destination_key(destination)
+    _indexes[key] = index
+    _indexes.move_to_end(key)
+    while len(_indexes) > _MAX_INDEXES:
+        _indexes.popitem(last=False)
+    return index
+
+
+def get_activity_index(destination: str) -> Optional[ActivityIndex]:
+    """Return the remembered activity index of a destination, or None."""
+    index = _indexes.get(_destination_key(destination))
+    if index is not None:
+        _indexes.move_to_end(_destination_key(destination))
+    return index
+
+
+def _destination_key(destination: str) -> str:
+    """Normalize a destination name ("Tokyo, Japan " -> "tokyo, japan")."""
+    return " ".join(str(destination).lower().split())
+
+
+def _coordinates(record: Mapping) -> Optional[tuple[float, float]]:
+    """Return (lat, lon) of a record, or None if it has no usable coordinates."""
+    lat, lon = record.get("latitude"), record.get("longitude")
+    if lat is None or lon is None:
+        return None
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(lat) or math.isnan(lon):
+        return None
+    return lat, lon
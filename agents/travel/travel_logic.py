@@ -11,14 +11,44 @@ has sufficient time to get from the airport to their hotel.
 Key functions:
 - extract_arrival_datetime: Parse flight arrival time into datetime
 - filter_valid_hotels: Filter hotels that meet timing constraints
-- find_cheapest_plan: Find the cheapest flight + hotel combination
+- find_cheapest_plan: Find the cheapest flight + hotel combination (large
+  candidate sets are evaluated with the NumPy engine in plan_engine.py)
+- find_top_plans: The k cheapest combinations, optionally diversified
+- find_pareto_plans: Combinations no other beats on price, duration, stops and rating
+- rank_plans: Order Pareto plans by weighted preferences
+- find_cheapest_itinerary: Cheapest multi-city itinerary (one flight per leg, one hotel per stay)
+- solve_plan_batch: Cheapest plans for many problems at once, in a process pool
+- collect_hotel_pages: Read paginated hotel results until enough candidates pass the filters
+- walkable_activities: Activities within walking distance of a hotel
+- rank_hotels_by_proximity: Order hotels by how many activities are close by
 """
 
+import bisect
+import heapq
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+import math
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import AsyncIterator, Iterable, Iterator, Optional
 
-from config.config import TRAVEL_HOTEL_CHECKIN_GAP_HOURS
+from agents.travel import plan_engine
+from agents.travel.plan_batch import SharedColumns
+from agents.travel.spatial import ActivityIndex
+from config.config import (
+    TRAVEL_BATCH_CHUNK_SIZE,
+    TRAVEL_BATCH_MIN_PROBLEMS,
+    TRAVEL_BATCH_WORKERS,
+    TRAVEL_HOTEL_CHECKIN_GAP_HOURS,
+    TRAVEL_HOTEL_MIN_CANDIDATES,
+    TRAVEL_VECTORIZE_MIN_PAIRS,
+    TRAVEL_WALKABLE_RADIUS_KM,
+)
 
 logger = logging.getLogger("lungo.travel.travel_logic")
 
@@ -27,6 +57,49 @@ logger = logging.getLogger("lungo.travel.travel_logic")
 MIN_OVERALL_RATING = 3.7  # Minimum overall hotel rating (1-5 scale)
 MIN_LOCATION_RATING = 4.0  # Minimum location rating (1-5 scale)
 
+# Check-in time assumed when a hotel has none (or it cannot be parsed)
+DEFAULT_CHECKIN_TIME = time(15, 0)
+
+# Latest time of day the traveler should reach the hotel on the arrival date
+_MIDNIGHT_CUTOFF = time(23, 59)
+
+# Diversity constraints understood by find_top_plans
+DIVERSITY_OPTIONS = ("airline", "hotel", "nonstop")
+
+# Objectives of find_pareto_plans (rating is maximized, the others minimized)
+PLAN_OBJECTIVES = ("price", "duration", "stops", "rating")
+
+# Naive epoch for the vectorized engine's and batch solver's integer timestamps
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Batch solver check-in day of hotels without a usable check-in date
+_NO_CHECKIN_DAY = -(2 ** 63)
+
+# Process pool of solve_plan_batch, created on first use and kept for later batches
+_batch_pool: Optional[ProcessPoolExecutor] = None
+_batch_pool_workers = 0
+
+
+@dataclass
+class PlanProblem:
+    """
+    One flight + hotel problem for solve_plan_batch() (the arguments of find_cheapest_plan).
+    
+    Attributes:
+        flights: List of flight options
+        hotels: List of hotel options
+        gap_hours: Minimum hours between flight arrival and hotel check-in
+                   (None = TRAVEL_HOTEL_CHECKIN_GAP_HOURS)
+        min_overall_rating: Minimum overall hotel rating
+        min_location_rating: Minimum location rating
+    """
+    flights: list[dict]
+    hotels: list[dict]
+    gap_hours: Optional[float] = None
+    min_overall_rating: float = MIN_OVERALL_RATING
+    min_location_rating: float = MIN_LOCATION_RATING
+
 
 def extract_arrival_datetime(flight: dict) -> Optional[datetime]:
     """
@@ -56,6 +129,20 @@ def extract_arrival_datetime(flight: dict) -> Optional[datetime]:
         logger.warning("No arrival time found in flight data")
         return None
     
+    arrival = _parse_flight_datetime(arrival_time_str)
+    if arrival is None:
+        logger.warning(f"Could not parse arrival time: {arrival_time_str}")
+    return arrival
+
+
+def _extract_departure_datetime(flight: dict) -> Optional[datetime]:
+    """Extract the departure datetime from a flight's first leg (None if missing or unparseable)."""
+    return _parse_flight_datetime(flight.get("departure_time", ""))
+
+
+@lru_cache(maxsize=4096)
+def _parse_flight_datetime(value: str) -> Optional[datetime]:
+    """Parse a flight time string ("2026-01-15 18:30", ISO, or with seconds), None if it fails."""
     # Try parsing various time formats
     formats_to_try = [
         "%Y-%m-%d %H:%M",     # Full datetime: "2026-01-15 18:30"
@@ -65,11 +152,9 @@ def extract_arrival_datetime(flight: dict) -> Optional[datetime]:
     
     for fmt in formats_to_try:
         try:
-            return datetime.strptime(arrival_time_str, fmt)
-        except ValueError:
+            return datetime.strptime(value, fmt)
+        except (ValueError, TypeError):
             continue
-    
-    logger.warning(f"Could not parse arrival time: {arrival_time_str}")
     return None
 
 
@@ -118,7 +203,7 @@ def filter_valid_hotels(
     traveler_hotel_arrival = flight_arrival + timedelta(hours=gap_hours)
     
     # Reasonable cutoff - traveler should arrive at hotel before midnight
-    midnight_cutoff = datetime.combine(flight_arrival.date(), datetime.strptime("23:59", "%H:%M").time())
+    midnight_cutoff = datetime.combine(flight_arrival.date(), _MIDNIGHT_CUTOFF)
     
     logger.info(
         f"Filtering hotels: flight arrives {flight_arrival.strftime('%Y-%m-%d %H:%M')}, "
@@ -274,32 +359,225 @@ def _get_hotel_checkin_datetime(hotel: dict, reference_date: datetime) -> Option
     Returns:
         datetime for hotel check-in, or None if parsing fails
     """
-    # Get check-in date - use hotel's date or flight arrival date
+    check_in_date = _parse_checkin_date(hotel) or reference_date.date()
+    return datetime.combine(check_in_date, _parse_checkin_time(hotel))
+
+
+def _parse_checkin_date(hotel: dict) -> Optional[date]:
+    """Return a hotel's check-in date, or None if it has none or it cannot be parsed."""
     check_in_date_str = hotel.get("check_in_date", "")
-    
-    if check_in_date_str:
-        try:
-            check_in_date = datetime.strptime(check_in_date_str, "%Y-%m-%d").date()
-        except ValueError:
-            check_in_date = reference_date.date()
-    else:
-        check_in_date = reference_date.date()
-    
-    # Get check-in time - default to 15:00 (3 PM) if not specified
-    check_in_time_str = hotel.get("check_in_time", "15:00")
-    
+    if not check_in_date_str:
+        return None
+    return _parse_date_string(check_in_date_str)
+
+
+def _parse_checkin_time(hotel: dict) -> time:
+    """Return a hotel's check-in time ("15:00" or "3:00 PM"), 15:00 if missing or unparseable."""
+    return _parse_time_string(hotel.get("check_in_time", "15:00"))
+
+
+def _hotel_rating(hotel: dict) -> float:
+    """Return a hotel's overall rating (0 if it has none)."""
+    return hotel.get("overall_rating", 0) or hotel.get("rating", 0) or 0
+
+
+# Hotels of one search share a handful of date and time strings, so each is parsed once
+
+@lru_cache(maxsize=1024)
+def _parse_date_string(check_in_date_str: str) -> Optional[date]:
+    """Parse a "YYYY-MM-DD" check-in date (None if invalid)."""
+    try:
+        return datetime.strptime(check_in_date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_time_string(check_in_time_str: str) -> time:
+    """Parse a "15:00" or "3:00 PM" check-in time (15:00 if invalid)."""
     try:
-        # Parse time string (e.g., "15:00" or "3:00 PM")
         if "PM" in check_in_time_str.upper() or "AM" in check_in_time_str.upper():
-            check_in_time = datetime.strptime(check_in_time_str, "%I:%M %p").time()
-        else:
-            check_in_time = datetime.strptime(check_in_time_str, "%H:%M").time()
+            return datetime.strptime(check_in_time_str, "%I:%M %p").time()
+        return datetime.strptime(check_in_time_str, "%H:%M").time()
     except ValueError:
-        # Default to 3 PM if parsing fails
-        check_in_time = datetime.strptime("15:00", "%H:%M").time()
+        return DEFAULT_CHECKIN_TIME
+
+
+class _CheckinIndex:
+    """
+    Hotels grouped by check-in date for the cheapest-valid-hotel query of find_cheapest_plan.
+    
+    Check-in dates and times are parsed once. Within a date, hotels are sorted
+    by check-in time with a running minimum of (price, position), so "cheapest
+    hotel whose check-in has started by time x" is one bisect. Hotels without a
+    usable check-in date take the flight's arrival date, so they are kept in a
+    group of their own (date None).
+    
+    Each date also keeps its hotels sorted by price, for walking the valid
+    hotels of a flight cheapest first (find_top_plans), and builds price /
+    rating staircases of its check-in-time prefixes on demand
+    (find_pareto_plans).
+    
+    The answers are those of filter_valid_hotels() followed by a scan for the
+    cheapest hotel (ties go to the hotel listed first).
+    """
+    
+    def __init__(self, hotels: list[dict]):
+        self._build(
+            [_parse_checkin_date(hotel) for hotel in hotels],
+            [_parse_checkin_time(hotel) for hotel in hotels],
+            [hotel.get("price") or 0 for hotel in hotels],
+            [_hotel_rating(hotel) for hotel in hotels],
+        )
+    
+    @classmethod
+    def from_columns(
+        cls,
+        checkin_dates: list[Optional[date]],
+        checkin_times: list[time],
+        prices: list[float],
+        ratings: list[float],
+    ) -> "_CheckinIndex":
+        """Build the index from already parsed hotel columns (positions are list indices)."""
+        index = cls.__new__(cls)
+        index._build(checkin_dates, checkin_times, prices, ratings)
+        return index
+    
+    def _build(
+        self,
+        checkin_dates: list[Optional[date]],
+        checkin_times: list[time],
+        prices: list[float],
+        ratings: list[float],
+    ) -> None:
+        """Group the hotels by check-in date and sort each group."""
+        self._ratings = ratings
+        # (date, hotels in the check-in-time prefix) -> staircase, see rating_staircase()
+        self._staircases: dict[tuple[Optional[date], int], list[tuple[float, float, int]]] = {}
+        
+        groups: dict[Optional[date], list[tuple[time, float, int]]] = {}
+        for position, (checkin_date, checkin_time, price) in enumerate(zip(checkin_dates, checkin_times, prices)):
+            groups.setdefault(checkin_date, []).append((checkin_time, price, position))
+        
+        # date -> [(price, position, check-in time)] cheapest first
+        self._by_price = {
+            checkin_date: sorted((price, position, checkin_time) for checkin_time, price, position in entries)
+            for checkin_date, entries in groups.items()
+        }
+        
+        # date -> (check-in times ascending, running min of (price, position) over that order)
+        self._groups: dict[Optional[date], tuple[list[time], list[tuple[float, int]]]] = {}
+        for checkin_date, entries in groups.items():
+            entries.sort(key=lambda entry: (entry[0], entry[2]))
+            times, running_min = [], []
+            for checkin_time, price, position in entries:
+                times.append(checkin_time)
+                candidate = (price, position)
+                running_min.append(min(running_min[-1], candidate) if running_min else candidate)
+            self._groups[checkin_date] = (times, running_min)
+    
+    def cheapest_valid(self, flight_arrival: datetime, gap_hours: float) -> Optional[tuple[float, int]]:
+        """
+        Return (price, position) of the cheapest hotel valid for a flight, or None.
+        
+        Same rules as filter_valid_hotels(): with T the traveler's arrival at the
+        hotel, hotels checking in on T's date are valid if T is before the
+        midnight cutoff or their check-in time has passed, hotels checking in
+        the day before are always valid, and all others are not.
+        """
+        candidates = [
+            self._cheapest(checkin_date, started_by)
+            for checkin_date, started_by in self._valid_groups(flight_arrival, gap_hours)
+        ]
+        return min((c for c in candidates if c is not None), default=None)
+    
+    def valid_by_price(self, flight_arrival: datetime, gap_hours: float) -> Iterator[tuple[float, int]]:
+        """Yield (price, position) of every hotel valid for a flight, cheapest first (ties: listed first)."""
+        return heapq.merge(*(
+            self._by_price_within(checkin_date, started_by)
+            for checkin_date, started_by in self._valid_groups(flight_arrival, gap_hours)
+        ))
+    
+    def rating_staircase(self, flight_arrival: datetime, gap_hours: float) -> list[tuple[float, int]]:
+        """
+        Return (price, position) of the valid hotels no other valid hotel beats on price and rating.
+        
+        Cheapest first, ratings strictly rising. Of hotels with the same
+        price and rating only the one listed first is kept.
+        """
+        steps = heapq.merge(*(
+            self._group_staircase(checkin_date, started_by)
+            for checkin_date, started_by in self._valid_groups(flight_arrival, gap_hours)
+        ))
+        return [(price, position) for price, _, position in _rising_ratings(steps)]
+    
+    def _group_staircase(
+        self, checkin_date: Optional[date], started_by: Optional[time]
+    ) -> list[tuple[float, float, int]]:
+        """Staircase (price, -rating, position) of a date group, limited to check-in times <= started_by."""
+        group = self._groups.get(checkin_date)
+        if group is None:
+            return []
+        times = group[0]
+        count = len(times) if started_by is None else bisect.bisect_right(times, started_by)
+        key = (checkin_date, count)
+        if key not in self._staircases:
+            # Flights share few distinct prefixes (check-in times are mostly on the hour)
+            last_time = times[count - 1] if count else None
+            entries = sorted(
+                (price, -self._ratings[position], position)
+                for price, position, checkin_time in self._by_price[checkin_date]
+                if count and checkin_time <= last_time
+            )
+            self._staircases[key] = list(_rising_ratings(entries))
+        return self._staircases[key]
+    
+    def _valid_groups(
+        self, flight_arrival: datetime, gap_hours: float
+    ) -> list[tuple[Optional[date], Optional[time]]]:
+        """
+        Return the (check-in date, latest usable check-in time) groups valid for a flight.
+        
+        A time of None means every hotel of the group is valid.
+        """
+        reach = flight_arrival + timedelta(hours=gap_hours)
+        # None = every check-in time on the day is fine
+        same_day_by = None if reach <= datetime.combine(flight_arrival.date(), _MIDNIGHT_CUTOFF) else reach.time()
+        
+        groups = [(reach.date(), same_day_by), (reach.date() - timedelta(days=1), None)]
+        # Hotels without a check-in date check in on the flight's arrival date
+        days_late = (reach.date() - flight_arrival.date()).days
+        if days_late == 0:
+            groups.append((None, same_day_by))
+        elif days_late == 1:
+            groups.append((None, None))
+        return groups
+    
+    def _by_price_within(
+        self, checkin_date: Optional[date], started_by: Optional[time]
+    ) -> Iterator[tuple[float, int]]:
+        """Yield (price, position) of a date group, cheapest first, limited to check-in times <= started_by."""
+        for price, position, checkin_time in self._by_price.get(checkin_date, ()):
+            if started_by is None or checkin_time <= started_by:
+                yield price, position
     
-    # Combine date and time
-    return datetime.combine(check_in_date, check_in_time)
+    def _cheapest(self, checkin_date: Optional[date], started_by: Optional[time]) -> Optional[tuple[float, int]]:
+        """Cheapest (price, position) of a date group, limited to check-in times <= started_by."""
+        group = self._groups.get(checkin_date)
+        if group is None:
+            return None
+        times, running_min = group
+        count = len(times) if started_by is None else bisect.bisect_right(times, started_by)
+        return running_min[count - 1] if count else None
+
+
+def _rising_ratings(entries: Iterable[tuple[float, float, int]]) -> Iterator[tuple[float, float, int]]:
+    """Yield the (price, -rating, position) entries, sorted cheapest first, whose rating beats all before them."""
+    best_rating = float("-inf")
+    for entry in entries:
+        if -entry[1] > best_rating:
+            best_rating = -entry[1]
+            yield entry
 
 
 def find_cheapest_plan(
@@ -312,18 +590,23 @@ def find_cheapest_plan(
     """
     Find the cheapest flight + hotel combination that meets timing and rating constraints.
     
-    This function iterates through all flight options, filters hotels that are
-    valid for each flight's arrival time AND meet rating thresholds, then finds 
-    the combination with the lowest total price (flight + hotel).
+    This function iterates through all flight options, finds the cheapest hotel
+    that is valid for each flight's arrival time AND meets rating thresholds,
+    then keeps the combination with the lowest total price (flight + hotel).
     
     Algorithm:
     1. Filter hotels by minimum overall rating (>=3.7) and location rating (>=4.0)
-    2. For each flight, extract arrival datetime
-    3. Filter remaining hotels that allow check-in after arrival + gap_hours
-    4. Find cheapest valid hotel for that flight
+    2. Parse check-in dates and times once and group hotels by check-in date
+    3. For each flight, extract arrival datetime
+    4. Look up the cheapest hotel that allows check-in after arrival + gap_hours
+       (a bisect per check-in date, see _CheckinIndex)
     5. Track minimum total cost across all combinations
     6. Return the best plan
     
+    Runs in O((F + H) log H) for F flights and H hotels; the plan is the same
+    as checking every flight against filter_valid_hotels() (ties go to the
+    earlier flight, then to the hotel listed first).
+    
     Args:
         flights: List of flight options from search_flights()
         hotels: List of hotel options from search_hotels()
@@ -364,8 +647,559 @@ def find_cheapest_plan(
         logger.warning("No hotels provided")
         return None
     
+    if plan_engine.HAVE_NUMPY and len(flights) * len(hotels) >= TRAVEL_VECTORIZE_MIN_PAIRS:
+        best_plan = _find_cheapest_plan_vectorized(
+            flights, hotels, gap_hours, min_overall_rating, min_location_rating
+        )
+    else:
+        best_plan = _find_cheapest_plan_scalar(
+            flights, hotels, gap_hours, min_overall_rating, min_location_rating
+        )
+    
+    if best_plan:
+        hotel = best_plan['hotel']
+        logger.info(
+            f"Found cheapest plan: ${best_plan['total_price']} total "
+            f"(flight: ${best_plan['flight']['price']}, hotel: ${hotel['price']}, "
+            f"overall_rating: {hotel.get('overall_rating', 'N/A')}, "
+            f"location_rating: {hotel.get('location_rating', 'N/A')})"
+        )
+    else:
+        logger.warning("No valid flight + hotel combination found")
+    
+    return best_plan
+
+
+def find_top_plans(
+    flights: list[dict],
+    hotels: list[dict],
+    k: int = 3,
+    diversity: str | Iterable[str] = (),
+    gap_hours: Optional[int] = None,
+    min_overall_rating: float = MIN_OVERALL_RATING,
+    min_location_rating: float = MIN_LOCATION_RATING,
+) -> list[dict]:
+    """
+    Find the k cheapest flight + hotel combinations, optionally diversified.
+    
+    Uses the same timing and rating rules as find_cheapest_plan, and without
+    diversity constraints the first plan is the one find_cheapest_plan returns.
+    
+    Diversity constraints (any combination):
+    - "airline": every plan flies a different airline
+    - "hotel": every plan stays at a different hotel
+    - "nonstop": if none of the cheaper plans is nonstop, the last slot goes to
+      the cheapest nonstop plan (so the list spans cheapest to most convenient);
+      needs k >= 2
+    
+    Algorithm (one pass over the pre-indexed inputs):
+    1. Filter hotels by rating and index them by check-in date (see _CheckinIndex)
+    2. Each flight yields its valid hotels cheapest first, so its plans come in
+       ascending total price
+    3. A heap holding the next plan of every flight merges these streams;
+       plans are popped cheapest first and kept unless they break a diversity
+       constraint, until k are kept
+    
+    Args:
+        flights: List of flight options from search_flights()
+        hotels: List of hotel options from search_hotels()
+        k: Number of plans to return
+        diversity: Diversity constraint name(s), see above
+        gap_hours: Minimum hours between flight arrival and hotel check-in.
+                   Defaults to TRAVEL_HOTEL_CHECKIN_GAP_HOURS from config.
+        min_overall_rating: Minimum overall hotel rating (default: 3.7)
+        min_location_rating: Minimum location rating (default: 4.0)
+    
+    Returns:
+        Up to k plans (same format as find_cheapest_plan), cheapest first
+        (ties go to the earlier flight, then to the hotel listed first)
+    
+    Raises:
+        ValueError: If diversity names an unknown constraint
+    
+    Example:
+        >>> plans = find_top_plans(flights, hotels, k=3, diversity=("airline", "nonstop"))
+        >>> for plan in plans:
+        ...     print(plan["total_price"], plan["flight"]["airline"], plan["hotel"]["name"])
+    """
+    constraints = {diversity} if isinstance(diversity, str) else set(diversity)
+    unknown = constraints.difference(DIVERSITY_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown diversity constraint(s) {sorted(unknown)}, expected {DIVERSITY_OPTIONS}")
+    
+    if gap_hours is None:
+        gap_hours = TRAVEL_HOTEL_CHECKIN_GAP_HOURS
+    
+    if k <= 0 or not flights or not hotels:
+        return []
+    
+    quality_hotels = _quality_hotels(hotels, min_overall_rating, min_location_rating)
+    checkin_index = _CheckinIndex(quality_hotels)
+    
+    # Next plan of every flight: (total price, flight order, hotel position)
+    heap = []
+    streams = {}
+    for order, flight in enumerate(flights):
+        arrival_datetime = extract_arrival_datetime(flight)
+        if arrival_datetime is None:
+            logger.warning(f"Skipping flight with unparseable arrival time")
+            continue
+        streams[order] = (arrival_datetime, flight.get("price") or 0, checkin_index.valid_by_price(arrival_datetime, gap_hours))
+        _push_next_plan(heap, streams, order)
+    
+    plans = []
+    used_airlines = set()
+    used_hotels = set()
+    has_nonstop = False
+    reserve_nonstop = "nonstop" in constraints and k >= 2
+    # Cheapest plan passed over while the last slot waited for a nonstop flight
+    passed_over = None
+    
+    while heap and len(plans) < k:
+        total_price, order, position = heapq.heappop(heap)
+        flight = flights[order]
+        nonstop = (flight.get("stops") or 0) == 0
+        
+        if "airline" in constraints and flight.get("airline") in used_airlines:
+            continue  # Drops the flight: all its plans share the airline
+        if "hotel" in constraints and position in used_hotels:
+            _push_next_plan(heap, streams, order)
+            continue
+        if reserve_nonstop and not has_nonstop and len(plans) == k - 1 and not nonstop:
+            passed_over = passed_over or (order, position)
+            continue  # Drops the flight: none of its plans is nonstop
+        
+        _push_next_plan(heap, streams, order)
+        
+        plans.append(_make_plan(flight, quality_hotels[position], gap_hours, streams[order][0]))
+        used_airlines.add(flight.get("airline"))
+        used_hotels.add(position)
+        has_nonstop = has_nonstop or nonstop
+    
+    if passed_over is not None and len(plans) < k:
+        # No nonstop plan exists - fill the slot with the cheapest plan after all
+        order, position = passed_over
+        plans.append(_make_plan(flights[order], quality_hotels[position], gap_hours, streams[order][0]))
+    
+    logger.info(f"Found {len(plans)} plan(s) (k={k}, diversity={sorted(constraints)})")
+    return plans
+
+
+def _push_next_plan(heap: list, streams: dict, order: int) -> None:
+    """Push a flight's next-cheapest valid plan onto the heap (if it has one left)."""
+    _, flight_price, stream = streams[order]
+    hotel = next(stream, None)
+    if hotel is not None:
+        hotel_price, position = hotel
+        heapq.heappush(heap, (flight_price + hotel_price, order, position))
+
+
+def find_pareto_plans(
+    flights: list[dict],
+    hotels: list[dict],
+    gap_hours: Optional[int] = None,
+    min_overall_rating: float = MIN_OVERALL_RATING,
+    min_location_rating: float = MIN_LOCATION_RATING,
+) -> list[dict]:
+    """
+    Find the Pareto frontier of flight + hotel combinations.
+    
+    Objectives (see PLAN_OBJECTIVES): total price, total flight duration and
+    stops (outbound plus return flight) are minimized, the hotel's overall
+    rating is maximized. A plan is on the frontier unless another valid plan
+    is at least as good on every objective; of plans with identical
+    objectives only the first (earlier flight, then hotel listed first) is
+    kept. Uses the same timing and rating rules as find_cheapest_plan, so
+    the cheapest frontier plan costs what find_cheapest_plan's plan costs.
+    
+    Algorithm (sort and sweep, no pairwise comparison):
+    1. Filter hotels by rating and index them by check-in date (see _CheckinIndex)
+    2. For each flight, only its valid hotels that no cheaper valid hotel
+       matches on rating can be on the frontier (a price / rating staircase,
+       built once per distinct check-in-time prefix and merged per flight)
+    3. Sort the candidates by price, then duration, stops and rating
+    4. Sweep them in that order: every plan that could dominate a candidate
+       comes before it, so a candidate is kept unless an earlier kept plan
+       with no more stops has no longer duration and no lower rating. Kept
+       plans are held in one duration / rating staircase per stop count, so
+       this is a bisect per stop count
+    
+    Runs in O(C log C) for C candidates from step 2 (stop counts are few).
+    
+    Args:
+        flights: List of flight options from search_flights()
+        hotels: List of hotel options from search_hotels()
+        gap_hours: Minimum hours between flight arrival and hotel check-in.
+                   Defaults to TRAVEL_HOTEL_CHECKIN_GAP_HOURS from config.
+        min_overall_rating: Minimum overall hotel rating (default: 3.7)
+        min_location_rating: Minimum location rating (default: 4.0)
+    
+    Returns:
+        Frontier plans, cheapest first (same format as find_cheapest_plan, plus
+        "objectives": the plan's price, duration in minutes, stops and rating)
+    
+    Example:
+        >>> frontier = find_pareto_plans(flights, hotels)
+        >>> plan = rank_plans(frontier, {"price": 1, "duration": 2})[0]
+    """
+    if gap_hours is None:
+        gap_hours = TRAVEL_HOTEL_CHECKIN_GAP_HOURS
+    
+    if not flights or not hotels:
+        return []
+    
+    quality_hotels = _quality_hotels(hotels, min_overall_rating, min_location_rating)
+    checkin_index = _CheckinIndex(quality_hotels)
+    
+    # STEP 2: Candidate plans as (price, duration, stops, -rating, flight order, hotel position)
+    candidates = []
+    arrivals = {}
+    for order, flight in enumerate(flights):
+        arrival_datetime = extract_arrival_datetime(flight)
+        if arrival_datetime is None:
+            logger.warning(f"Skipping flight with unparseable arrival time")
+            continue
+        arrivals[order] = arrival_datetime
+        flight_price = flight.get("price") or 0
+        duration, stops = _flight_duration_and_stops(flight)
+        for hotel_price, position in checkin_index.rating_staircase(arrival_datetime, gap_hours):
+            rating = _hotel_rating(quality_hotels[position])
+            candidates.append((flight_price + hotel_price, duration, stops, -rating, order, position))
+    
+    # STEP 3 + 4: Sort and sweep
+    candidates.sort()
+    # stops -> (durations ascending, ratings strictly ascending) of kept plans
+    staircases: dict[float, tuple[list[float], list[float]]] = {}
+    frontier = []
+    for candidate in candidates:
+        total_price, duration, stops, negative_rating, order, position = candidate
+        rating = -negative_rating
+        if any(
+            _staircase_covers(staircase, duration, rating)
+            for stop_count, staircase in staircases.items()
+            if stop_count <= stops
+        ):
+            continue
+        
+        durations, ratings = staircases.setdefault(stops, ([], []))
+        # Drop kept plans with these stops that the candidate now covers
+        start = bisect.bisect_left(durations, duration)
+        end = start
+        while end < len(ratings) and ratings[end] <= rating:
+            end += 1
+        durations[start:end] = [duration]
+        ratings[start:end] = [rating]
+        
+        plan = _make_plan(flights[order], quality_hotels[position], gap_hours, arrivals[order])
+        plan["objectives"] = {"price": total_price, "duration": duration, "stops": stops, "rating": rating}
+        frontier.append(plan)
+    
+    logger.info(f"Found {len(frontier)} Pareto plan(s) among {len(candidates)} candidates")
+    return frontier
+
+
+def rank_plans(plans: list[dict], weights: Optional[dict[str, float]] = None) -> list[dict]:
+    """
+    Order plans from find_pareto_plans() by weighted preferences, best first.
+    
+    Each objective is scaled to 0 (best among the plans) .. 1 (worst), so the
+    weights express relative importance regardless of units. A plan's score
+    is the weighted mean of its scaled objectives; the lowest score comes
+    first (ties keep the frontier order, i.e. cheaper first). Re-ranking with
+    other weights needs no new searches.
+    
+    Args:
+        plans: Plans with "objectives" (as returned by find_pareto_plans())
+        weights: Weight per objective name (see PLAN_OBJECTIVES), missing = 0.
+                 Defaults to equal weights.
+    
+    Returns:
+        The plans in preference order
+    
+    Raises:
+        ValueError: If a weight names an unknown objective, is negative, or all are 0
+    
+    Example:
+        >>> rank_plans(frontier, {"price": 3, "duration": 1, "rating": 1})[0]
+    """
+    if weights is None:
+        weights = dict.fromkeys(PLAN_OBJECTIVES, 1.0)
+    unknown = set(weights).difference(PLAN_OBJECTIVES)
+    if unknown:
+        raise ValueError(f"Unknown objective(s) {sorted(unknown)}, expected {PLAN_OBJECTIVES}")
+    if any(weight < 0 for weight in weights.values()) or not any(weights.values()):
+        raise ValueError(f"Weights must be >= 0 and not all 0, got {weights}")
+    
+    total_weight = sum(weights.values())
+    scales = {}
+    for objective, weight in weights.items():
+        if weight:
+            values = [plan["objectives"][objective] for plan in plans]
+            scales[objective] = (min(values, default=0), max(values, default=0))
+    
+    def score(plan: dict) -> float:
+        total = 0.0
+        for objective, (low, high) in scales.items():
+            if high > low:
+                value = plan["objectives"][objective]
+                # Higher ratings are better, everything else lower
+                scaled = (high - value if objective == "rating" else value - low) / (high - low)
+                total += weights[objective] * scaled
+        return total / total_weight
+    
+    return sorted(plans, key=score)
+
+
+def _flight_duration_and_stops(flight: dict) -> tuple[float, float]:
+    """Return a flight's total duration (minutes) and stops, including the return flight."""
+    duration = flight.get("duration_minutes") or 0
+    stops = flight.get("stops") or 0
+    return_flight = flight.get("return_flight")
+    if return_flight:
+        duration += return_flight.get("duration_minutes") or 0
+        stops += return_flight.get("stops") or 0
+    return duration, stops
+
+
+def _staircase_covers(staircase: tuple[list[float], list[float]], duration: float, rating: float) -> bool:
+    """Return True if a staircase holds a plan with duration <= duration and rating >= rating."""
+    durations, ratings = staircase
+    index = bisect.bisect_right(durations, duration)
+    return index > 0 and ratings[index - 1] >= rating
+
+
+def find_cheapest_itinerary(
+    leg_flights: list[list[dict]],
+    stay_hotels: list[Optional[list[dict]]],
+    stay_nights: Optional[list[int]] = None,
+    gap_hours: Optional[int] = None,
+    min_overall_rating: float = MIN_OVERALL_RATING,
+    min_location_rating: float = MIN_LOCATION_RATING,
+) -> Optional[dict]:
+    """
+    Find the cheapest multi-city itinerary (e.g. A→B→C→A).
+    
+    Picks one flight per leg and one hotel per stay (the stay in the city a
+    leg lands in, until the next leg leaves) so that:
+    - every hotel is valid for the flight that arrives there (same check-in
+      rules and rating thresholds as find_cheapest_plan)
+    - every flight departs at least gap_hours after the previous leg's
+      flight lands
+    
+    Algorithm (dynamic programming over the legs):
+    1. For each flight of leg i, the best stay is the hotel with the lowest
+       stay cost valid for its arrival (one lookup in the stay's
+       _CheckinIndex, built over stay costs)
+    2. best(i, flight) = flight price + stay cost + the cheapest best(i - 1)
+       among flights landing early enough; with leg i - 1 sorted by arrival
+       and a running minimum, that is one bisect
+    3. The cheapest best() of the last leg, traced back, is the itinerary
+    
+    Runs in O(F log F + F log H) for F flights and H hotels over all legs.
+    Ties go to the earlier flight, then to the hotel listed first.
+    
+    Args:
+        leg_flights: One-way flight options per leg, in travel order
+        stay_hotels: Hotel options per stay; stay i follows leg i. None (or
+                     no entry, e.g. for the final leg home) means no hotel
+                     is needed after that leg
+        stay_nights: Nights per stay, for the hotel cost (default: 1 each).
+                     Nightly rates are multiplied by the nights; hotels
+                     priced for the whole stay (price_is_total) are not
+        gap_hours: Minimum hours between flight arrival and hotel check-in,
+                   and between landing and the next leg's departure.
+                   Defaults to TRAVEL_HOTEL_CHECKIN_GAP_HOURS from config.
+        min_overall_rating: Minimum overall hotel rating (default: 3.7)
+        min_location_rating: Minimum location rating (default: 4.0)
+    
+    Returns:
+        Dictionary containing the itinerary:
+        - legs: Per leg, {"flight", "hotel" (None without a stay), "nights",
+          "hotel_price" (the stay's cost, 0 without a stay), "arrival_time"}
+        - total_price: Sum of flight prices and stay costs
+        - gap_hours: The timing gap used
+        
+        Returns None if no feasible itinerary exists.
+    
+    Example:
+        >>> itinerary = find_cheapest_itinerary(
+        ...     [lax_nrt, nrt_icn, icn_lax], [tokyo_hotels, seoul_hotels], stay_nights=[4, 3]
+        ... )
+        >>> print(itinerary["total_price"])
+    """
+    if gap_hours is None:
+        gap_hours = TRAVEL_HOTEL_CHECKIN_GAP_HOURS
+    gap = timedelta(hours=gap_hours)
+    
+    logger.info(f"Finding cheapest itinerary over {len(leg_flights)} leg(s)")
+    if not leg_flights:
+        return None
+    
+    # Per leg: [(arrival, best cost so far, flight order, hotel position, stay cost, predecessor index)]
+    legs = []
+    stays = []
+    for leg, flights in enumerate(leg_flights):
+        hotels = stay_hotels[leg] if leg < len(stay_hotels) else None
+        nights = stay_nights[leg] if stay_nights and leg < len(stay_nights) else 1
+        if hotels is not None:
+            if not hotels:
+                logger.warning(f"No hotels for the stay after leg {leg + 1}")
+                return None
+            quality_hotels = _quality_hotels(hotels, min_overall_rating, min_location_rating)
+            checkin_index = _CheckinIndex.from_columns(
+                [_parse_checkin_date(hotel) for hotel in quality_hotels],
+                [_parse_checkin_time(hotel) for hotel in quality_hotels],
+                [_stay_cost(hotel, nights) for hotel in quality_hotels],
+                [_hotel_rating(hotel) for hotel in quality_hotels],
+            )
+            stays.append((quality_hotels, checkin_index, nights))
+        else:
+            stays.append(None)
+        
+        previous = legs[-1] if legs else None
+        if previous is not None:
+            # Flights of the previous leg by arrival, with the running minimum of (cost, order, index)
+            previous_arrivals = [state[0] for state in previous]
+            previous_best = []
+            for index, state in enumerate(previous):
+                candidate = (state[1], state[2], index)
+                previous_best.append(min(previous_best[-1], candidate) if previous_best else candidate)
+        
+        states = []
+        for order, flight in enumerate(flights):
+            arrival_datetime = extract_arrival_datetime(flight)
+            if arrival_datetime is None:
+                continue
+            cost = flight.get("price") or 0
+            
+            # STEP 1: Cheapest stay for this arrival
+            position = None
+            hotel_price = 0
+            if stays[leg] is not None:
+                quality_hotels, checkin_index, nights = stays[leg]
+                cheapest = checkin_index.cheapest_valid(arrival_datetime, gap_hours)
+                if cheapest is None:
+                    continue
+                hotel_price, position = cheapest
+                cost += hotel_price
+            
+            # STEP 2: Cheapest way to be ready for this departure
+            predecessor = None
+            if previous is not None:
+                departure = _extract_departure_datetime(flight)
+                if departure is None:
+                    logger.warning(f"Skipping leg {leg + 1} flight with unparseable departure time")
+                    continue
+                count = bisect.bisect_right(previous_arrivals, departure - gap)
+                if not count:
+                    continue
+                previous_cost, _, predecessor = previous_best[count - 1]
+                cost += previous_cost
+            
+            states.append((arrival_datetime, cost, order, position, hotel_price, predecessor))
+        
+        if not states:
+            logger.warning(f"No feasible flight for leg {leg + 1}")
+            return None
+        states.sort(key=lambda state: (state[0], state[2]))
+        legs.append(states)
+    
+    # STEP 3: Trace the cheapest final state back to the first leg
+    index = min(range(len(legs[-1])), key=lambda i: (legs[-1][i][1], legs[-1][i][2]))
+    total_price = legs[-1][index][1]
+    itinerary = []
+    for leg in range(len(legs) - 1, -1, -1):
+        arrival_datetime, _, order, position, hotel_price, predecessor = legs[leg][index]
+        stay = stays[leg]
+        itinerary.append({
+            "flight": leg_flights[leg][order],
+            "hotel": stay[0][position] if stay is not None else None,
+            "nights": stay[2] if stay is not None else 0,
+            "hotel_price": hotel_price,
+            "arrival_time": arrival_datetime.strftime("%Y-%m-%d %H:%M"),
+        })
+        index = predecessor
+    itinerary.reverse()
+    
+    logger.info(f"Found cheapest itinerary: ${total_price} total over {len(itinerary)} leg(s)")
+    return {"legs": itinerary, "total_price": total_price, "gap_hours": gap_hours}
+
+
+def _stay_cost(hotel: dict, nights: int) -> float:
+    """Return what a stay at a hotel costs (nightly price x nights, or the price itself if it is a stay total)."""
+    price = hotel.get("price") or 0
+    return price if hotel.get("price_is_total") else price * nights
+
+
+def _find_cheapest_plan_scalar(
+    flights: list[dict],
+    hotels: list[dict],
+    gap_hours: float,
+    min_overall_rating: float,
+    min_location_rating: float,
+) -> Optional[dict]:
+    """Pure-Python engine of find_cheapest_plan (used for small candidate sets)."""
     # STEP 1: Filter hotels by rating requirements first
-    # This ensures we only consider quality accommodations
+    quality_hotels = _quality_hotels(hotels, min_overall_rating, min_location_rating)
+    
+    # STEP 2: Parse check-in times once, grouped by check-in date
+    checkin_index = _CheckinIndex(quality_hotels)
+    
+    # STEP 3: Get when traveler arrives at destination
+    arrivals = []
+    for flight in flights:
+        arrival_datetime = extract_arrival_datetime(flight)
+        if arrival_datetime is None:
+            logger.warning(f"Skipping flight with unparseable arrival time")
+        arrivals.append(arrival_datetime)
+    
+    # STEP 4 + 5: Cheapest valid hotel per flight, cheapest combination overall
+    pair = _cheapest_pair(arrivals, [flight.get("price") or 0 for flight in flights], checkin_index, gap_hours)
+    if pair is None:
+        return None
+    order, position = pair
+    return _make_plan(flights[order], quality_hotels[position], gap_hours, arrivals[order])
+
+
+def _cheapest_pair(
+    arrivals: list[Optional[datetime]],
+    flight_prices: list[float],
+    checkin_index: "_CheckinIndex",
+    gap_hours: float,
+) -> Optional[tuple[int, int]]:
+    """
+    Return (flight index, hotel position) of the cheapest valid combination, or None.
+    
+    Flights without an arrival time (None) are skipped; among equal totals
+    the earlier flight wins.
+    """
+    best_pair = None
+    best_total_price = float('inf')
+    
+    for order, (arrival_datetime, flight_price) in enumerate(zip(arrivals, flight_prices)):
+        if arrival_datetime is None:
+            continue
+        
+        # Cheapest hotel that meets the timing constraints for this flight
+        cheapest = checkin_index.cheapest_valid(arrival_datetime, gap_hours)
+        if cheapest is None:
+            continue
+        
+        hotel_price, position = cheapest
+        total_price = flight_price + hotel_price
+        if total_price < best_total_price:
+            best_total_price = total_price
+            best_pair = (order, position)
+    
+    return best_pair
+
+
+def _quality_hotels(hotels: list[dict], min_overall_rating: float, min_location_rating: float) -> list[dict]:
+    """
+    Return the hotels meeting the rating thresholds, relaxing them if none do.
+    
+    Fallbacks: overall rating only, then any rating >= 3.0, then all hotels.
+    """
     quality_hotels = filter_hotels_by_rating(
         hotels, 
         min_overall_rating=min_overall_rating,
@@ -387,58 +1221,515 @@ def find_cheapest_plan(
         if not quality_hotels:
             # Further fallback: use all hotels with any rating >= 3.0
             logger.warning("Still no hotels after relaxing criteria. Using all rated hotels.")
-            quality_hotels = [h for h in hotels if (h.get("overall_rating", 0) or h.get("rating", 0) or 0) >= 3.0]
+            quality_hotels = [h for h in hotels if _hotel_rating(h) >= 3.0]
             
             if not quality_hotels:
                 quality_hotels = hotels  # Last resort: use all hotels
     
-    best_plan = None
-    best_total_price = float('inf')
+    return quality_hotels
+
+
+def _find_cheapest_plan_vectorized(
+    flights: list[dict],
+    hotels: list[dict],
+    gap_hours: float,
+    min_overall_rating: float,
+    min_location_rating: float,
+) -> Optional[dict]:
+    """
+    NumPy engine of find_cheapest_plan (see plan_engine.py).
     
+    Applies the same rating fallbacks as the scalar engine, then evaluates
+    every flight against every remaining hotel at once.
+    """
+    overall = [_hotel_rating(h) for h in hotels]
+    location = [h.get("location_rating", 0) or 0 for h in hotels]
+    
+    # STEP 1: Rating mask, relaxed step by step like the scalar engine
+    mask = plan_engine.rating_mask(overall, location, min_overall_rating, min_location_rating)
+    if not mask.any():
+        logger.warning(
+            f"No hotels meet rating criteria (overall>={min_overall_rating}, "
+            f"location>={min_location_rating}). Relaxing criteria..."
+        )
+        mask = plan_engine.rating_mask(overall, location, min_overall_rating, 0)
+        if not mask.any():
+            logger.warning("Still no hotels after relaxing criteria. Using all rated hotels.")
+            mask = plan_engine.rating_mask(overall, location, 3.0, 0)
+            if not mask.any():
+                mask[:] = True
+    
+    # STEP 2: Flight and hotel columns (flights without an arrival time are skipped)
+    arrivals = []
+    kept_flights = []
     for flight in flights:
-        # STEP 2: Get when traveler arrives at destination
         arrival_datetime = extract_arrival_datetime(flight)
-        
         if arrival_datetime is None:
             logger.warning(f"Skipping flight with unparseable arrival time")
             continue
+        arrivals.append(arrival_datetime)
+        kept_flights.append(flight)
+    
+    checkin_days, floating, checkin_times = [], [], []
+    for hotel in hotels:
+        checkin_date = _parse_checkin_date(hotel)
+        checkin_time = _parse_checkin_time(hotel)
+        checkin_days.append((checkin_date - _EPOCH.date()).days if checkin_date else 0)
+        floating.append(checkin_date is None)
+        checkin_times.append(
+            ((checkin_time.hour * 60 + checkin_time.minute) * 60 + checkin_time.second) * 1_000_000
+            + checkin_time.microsecond
+        )
+    
+    # STEP 3: Cheapest valid pair
+    pair = plan_engine.cheapest_pair(
+        arrival_us=[(arrival - _EPOCH) // _ONE_MICROSECOND for arrival in arrivals],
+        flight_prices=[flight.get("price") or 0 for flight in kept_flights],
+        checkin_days=checkin_days,
+        floating=floating,
+        checkin_time_us=checkin_times,
+        hotel_prices=[hotel.get("price") or 0 for hotel in hotels],
+        hotel_mask=mask,
+        gap_us=timedelta(hours=gap_hours) // _ONE_MICROSECOND,
+    )
+    if pair is None:
+        return None
+    flight_position, hotel_position = pair
+    return _make_plan(kept_flights[flight_position], hotels[hotel_position], gap_hours, arrivals[flight_position])
+
+
+def _make_plan(flight: dict, hotel: dict, gap_hours: float, arrival_datetime: datetime) -> dict:
+    """Build the plan dictionary returned by find_cheapest_plan."""
+    return {
+        "flight": flight,
+        "hotel": hotel,
+        "total_price": (flight.get("price") or 0) + (hotel.get("price") or 0),
+        "gap_hours": gap_hours,
+        "arrival_time": arrival_datetime.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def solve_plan_batch(
+    problems: Iterable[PlanProblem],
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[tuple[int, Optional[dict]]]:
+    """
+    Find the cheapest plan for each of many problems, yielding results as they finish.
+    
+    Each result is what find_cheapest_plan returns for the problem. Batches
+    smaller than TRAVEL_BATCH_MIN_PROBLEMS, or with a single worker, are
+    solved in this process, in order.
+    
+    Larger batches go to a process pool, a chunk of problems per task:
+    1. The chunk's flights and hotels are parsed here and packed into numeric
+       columns (arrival times, check-in dates and times, prices, ratings) in
+       a shared memory block (see plan_batch.py), so the worker reads them in
+       place instead of receiving pickled dicts; the task itself carries only
+       the block's handle
+    2. Each chunk is submitted as soon as it is packed, so workers solve
+       while the next chunks are being packed
+    3. Workers apply the rating fallbacks and the check-in index of
+       find_cheapest_plan and return (flight, hotel) indices; the plans
+       are built here from the original dicts as chunks complete
+    
+    If the pool cannot be used (e.g. a worker died), the problems without a
+    result yet are solved in this process.
+    
+    Args:
+        problems: The problems to solve
+        max_workers: Worker processes (default: TRAVEL_BATCH_WORKERS, 0 = one per CPU)
+        chunk_size: Problems per task (default: TRAVEL_BATCH_CHUNK_SIZE, 0 = about
+                    four tasks per worker)
+    
+    Yields:
+        (problem index, plan or None) in completion order
+    
+    Example:
+        >>> problems = [PlanProblem(flights, hotels) for flights, hotels in quotes]
+        >>> for index, plan in solve_plan_batch(problems):
+        ...     print(index, plan and plan["total_price"])
+    """
+    problems = list(problems)
+    workers = max_workers or TRAVEL_BATCH_WORKERS or os.cpu_count() or 1
+    
+    if len(problems) < TRAVEL_BATCH_MIN_PROBLEMS or workers <= 1:
+        logger.info(f"Solving {len(problems)} plan problem(s) in-process")
+        yield from _solve_in_process(problems, range(len(problems)))
+        return
+    
+    chunk_size = chunk_size or TRAVEL_BATCH_CHUNK_SIZE or math.ceil(len(problems) / (workers * 4))
+    gaps = [TRAVEL_HOTEL_CHECKIN_GAP_HOURS if p.gap_hours is None else p.gap_hours for p in problems]
+    logger.info(
+        f"Solving {len(problems)} plan problems in {math.ceil(len(problems) / chunk_size)} chunk(s) "
+        f"on {workers} worker process(es)"
+    )
+    
+    # Submitted chunks: future -> (first problem index, shared block, arrivals, packed flight indices)
+    chunks = {}
+    solved = set()
+    try:
+        pool = _get_batch_pool(workers)
         
-        # STEP 3: Filter remaining hotels by timing constraints
-        valid_hotels = filter_valid_hotels(quality_hotels, arrival_datetime, gap_hours)
+        # STEP 1 + 2: Pack and submit chunk by chunk
+        for start in range(0, len(problems), chunk_size):
+            stop = min(start + chunk_size, len(problems))
+            columns, arrivals, kept_flights = _pack_plan_batch(problems[start:stop], gaps[start:stop])
+            shared = SharedColumns.create(columns)
+            try:
+                future = pool.submit(_solve_plan_chunk, shared.handle, stop - start)
+            except BaseException:
+                shared.unlink()
+                raise
+            chunks[future] = (start, shared, arrivals, kept_flights)
         
-        if not valid_hotels:
-            logger.debug(f"No valid hotels for flight arriving at {arrival_datetime}")
-            continue
+        # STEP 3: Plans from the original dicts, as chunks complete
+        for future in as_completed(list(chunks)):
+            start, shared, arrivals, kept_flights = chunks.pop(future)
+            shared.unlink()
+            for offset, pair in future.result():
+                index = start + offset
+                solved.add(index)
+                plan = None
+                if pair is not None:
+                    flight_position, hotel_position = pair
+                    problem = problems[index]
+                    plan = _make_plan(
+                        problem.flights[kept_flights[offset][flight_position]],
+                        problem.hotels[hotel_position],
+                        gaps[index],
+                        arrivals[offset][flight_position],
+                    )
+                yield index, plan
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"Plan batch process pool failed ({e!r}), solving the remaining problems in-process")
+        _shutdown_batch_pool()
+        yield from _solve_in_process(problems, [i for i in range(len(problems)) if i not in solved])
+    finally:
+        for future, (_, shared, _, _) in chunks.items():
+            future.cancel()
+            shared.unlink()
+
+
+def _solve_in_process(problems: list[PlanProblem], indices: Iterable[int]) -> Iterator[tuple[int, Optional[dict]]]:
+    """Solve problems one after another with find_cheapest_plan."""
+    for index in indices:
+        problem = problems[index]
+        yield index, find_cheapest_plan(
+            problem.flights,
+            problem.hotels,
+            problem.gap_hours,
+            problem.min_overall_rating,
+            problem.min_location_rating,
+        )
+
+
+def _pack_plan_batch(
+    problems: list[PlanProblem], gaps: list[float]
+) -> tuple[dict[str, array], list[list[datetime]], list[list[int]]]:
+    """
+    Parse a chunk of problems into the numeric columns read by _solve_plan_chunk.
+    
+    Problem i owns flights flight_start[i]..flight_start[i + 1] and hotels
+    hotel_start[i]..hotel_start[i + 1] of the flight and hotel columns.
+    Flights without an arrival time are left out.
+    
+    Returns:
+        (columns, arrival datetimes per problem, original index of each packed flight per problem)
+    """
+    columns = {
+        "flight_start": array("q", [0]),
+        "hotel_start": array("q", [0]),
+        "gap_hours": array("d", gaps),
+        "min_overall_rating": array("d", (p.min_overall_rating for p in problems)),
+        "min_location_rating": array("d", (p.min_location_rating for p in problems)),
+        "arrival_us": array("q"),
+        "flight_price": array("d"),
+        "checkin_day": array("q"),
+        "checkin_time_us": array("q"),
+        "hotel_price": array("d"),
+        "overall_rating": array("d"),
+        "location_rating": array("d"),
+    }
+    arrivals, kept_flights = [], []
+    
+    for problem in problems:
+        problem_arrivals, kept = [], []
+        for order, flight in enumerate(problem.flights):
+            arrival_datetime = extract_arrival_datetime(flight)
+            if arrival_datetime is None:
+                logger.warning(f"Skipping flight with unparseable arrival time")
+                continue
+            problem_arrivals.append(arrival_datetime)
+            kept.append(order)
+            columns["arrival_us"].append((arrival_datetime - _EPOCH) // _ONE_MICROSECOND)
+            columns["flight_price"].append(flight.get("price") or 0)
+        arrivals.append(problem_arrivals)
+        kept_flights.append(kept)
+        
+        checkins = [
+            _pack_checkin(hotel.get("check_in_date", ""), hotel.get("check_in_time", "15:00"))
+            for hotel in problem.hotels
+        ]
+        columns["checkin_day"].extend(checkin_day for checkin_day, _ in checkins)
+        columns["checkin_time_us"].extend(checkin_time_us for _, checkin_time_us in checkins)
+        columns["hotel_price"].extend(hotel.get("price") or 0 for hotel in problem.hotels)
+        columns["overall_rating"].extend(_hotel_rating(hotel) for hotel in problem.hotels)
+        columns["location_rating"].extend(hotel.get("location_rating", 0) or 0 for hotel in problem.hotels)
         
-        # STEP 4: Find cheapest valid hotel for this flight
-        for hotel in valid_hotels:
-            flight_price = flight.get("price") or 0
-            hotel_price = hotel.get("price") or 0
-            total_price = flight_price + hotel_price
+        columns["flight_start"].append(len(columns["arrival_us"]))
+        columns["hotel_start"].append(len(columns["hotel_price"]))
+    
+    return columns, arrivals, kept_flights
+
+
+def _solve_plan_chunk(handle: tuple, count: int) -> list[tuple[int, Optional[tuple[int, int]]]]:
+    """
+    Worker task: solve the count problems packed in a shared block.
+    
+    Returns:
+        (problem offset in the chunk, (packed flight index, hotel index) or None) per problem
+    """
+    shared = SharedColumns.attach(handle)
+    try:
+        flight_start = shared.read("flight_start")
+        hotel_start = shared.read("hotel_start")
+        gaps = shared.read("gap_hours")
+        min_overall = shared.read("min_overall_rating")
+        min_location = shared.read("min_location_rating")
+        
+        results = []
+        for offset in range(count):
+            first_hotel, end_hotel = hotel_start[offset], hotel_start[offset + 1]
+            overall = shared.read("overall_rating", first_hotel, end_hotel)
+            positions = _quality_positions(
+                overall,
+                shared.read("location_rating", first_hotel, end_hotel),
+                min_overall[offset],
+                min_location[offset],
+            )
+            days = shared.read("checkin_day", first_hotel, end_hotel)
+            times = shared.read("checkin_time_us", first_hotel, end_hotel)
+            prices = shared.read("hotel_price", first_hotel, end_hotel)
+            checkin_index = _CheckinIndex.from_columns(
+                [_day_to_date(days[p]) for p in positions],
+                [_microseconds_to_time(times[p]) for p in positions],
+                [prices[p] for p in positions],
+                [overall[p] for p in positions],
+            )
             
-            if total_price < best_total_price:
-                best_total_price = total_price
-                best_plan = {
-                    "flight": flight,
-                    "hotel": hotel,
-                    "total_price": total_price,
-                    "gap_hours": gap_hours,
-                    "arrival_time": arrival_datetime.strftime("%Y-%m-%d %H:%M"),
-                }
-                logger.debug(
-                    f"New best plan: ${total_price} (flight: ${flight_price}, "
-                    f"hotel: ${hotel_price}, rating: {hotel.get('overall_rating', 'N/A')})"
-                )
+            first_flight, end_flight = flight_start[offset], flight_start[offset + 1]
+            pair = _cheapest_pair(
+                [_EPOCH + timedelta(microseconds=us) for us in shared.read("arrival_us", first_flight, end_flight)],
+                shared.read("flight_price", first_flight, end_flight),
+                checkin_index,
+                gaps[offset],
+            )
+            results.append((offset, (pair[0], positions[pair[1]]) if pair else None))
+        return results
+    finally:
+        shared.close()
+
+
+def _quality_positions(
+    overall_ratings: list[float],
+    location_ratings: list[float],
+    min_overall_rating: float,
+    min_location_rating: float,
+) -> list[int]:
+    """Column form of _quality_hotels(): positions of the hotels kept, same thresholds and fallbacks."""
+    for min_overall, min_location in (
+        (min_overall_rating, min_location_rating),
+        (min_overall_rating, 0),
+        (3.0, 0),
+    ):
+        positions = [
+            position
+            for position, (overall, location) in enumerate(zip(overall_ratings, location_ratings))
+            if overall >= min_overall and (location <= 0 or location >= min_location)
+        ]
+        if positions:
+            return positions
+    return list(range(len(overall_ratings)))
+
+
+@lru_cache(maxsize=1024)
+def _pack_checkin(check_in_date_str: str, check_in_time_str: str) -> tuple[int, int]:
+    """Packed (check-in day, microseconds after midnight) of a hotel's check-in strings."""
+    checkin_date = _parse_date_string(check_in_date_str) if check_in_date_str else None
+    checkin_time = _parse_time_string(check_in_time_str)
+    return (
+        (checkin_date - _EPOCH.date()).days if checkin_date else _NO_CHECKIN_DAY,
+        (datetime.combine(_EPOCH.date(), checkin_time) - _EPOCH) // _ONE_MICROSECOND,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _day_to_date(day: int) -> Optional[date]:
+    """Check-in date of a packed check-in day (None for hotels without one)."""
+    return None if day == _NO_CHECKIN_DAY else _EPOCH.date() + timedelta(days=day)
+
+
+@lru_cache(maxsize=1024)
+def _microseconds_to_time(microseconds: int) -> time:
+    """Check-in time of a packed check-in time (microseconds after midnight)."""
+    return (_EPOCH + timedelta(microseconds=microseconds)).time()
+
+
+def _get_batch_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the batch process pool, (re)creating it for this many workers."""
+    global _batch_pool, _batch_pool_workers
+    if _batch_pool is None or _batch_pool_workers != workers:
+        _shutdown_batch_pool()
+        # Workers start from a fresh interpreter ("spawn"): forking a process
+        # that already runs threads (event loop executors, SQLite writers) is unsafe
+        _batch_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _batch_pool_workers = workers
+    return _batch_pool
+
+
+def _shutdown_batch_pool() -> None:
+    """Stop the batch process pool (a new one is created on next use)."""
+    global _batch_pool
+    if _batch_pool is not None:
+        _batch_pool.shutdown(wait=False, cancel_futures=True)
+        _batch_pool = None
+
+
+async def collect_hotel_pages(
+    flights: list[dict],
+    hotel_pages: AsyncIterator[list[dict]],
+    min_candidates: int = TRAVEL_HOTEL_MIN_CANDIDATES,
+    gap_hours: Optional[int] = None,
+    min_overall_rating: float = MIN_OVERALL_RATING,
+    min_location_rating: float = MIN_LOCATION_RATING,
+) -> list[dict]:
+    """
+    Read hotel result pages until enough hotels are usable for find_cheapest_plan.
     
-    if best_plan:
-        hotel = best_plan['hotel']
-        logger.info(
-            f"Found cheapest plan: ${best_plan['total_price']} total "
-            f"(flight: ${best_plan['flight']['price']}, hotel: ${hotel['price']}, "
-            f"overall_rating: {hotel.get('overall_rating', 'N/A')}, "
-            f"location_rating: {hotel.get('location_rating', 'N/A')})"
+    A hotel counts as a candidate when it meets both rating thresholds and
+    allows check-in for at least one of the flights. Once min_candidates are
+    found the remaining pages are not fetched (the generator is closed).
+    
+    This is a heuristic cutoff, not a proof of optimality: pages come cheapest
+    first, but a pricier hotel on a later page may be valid for a cheaper
+    flight than the candidates found so far. The plan is then the cheapest
+    among the pages read, not necessarily among all hotels.
+    
+    Args:
+        flights: List of flight options from search_flights()
+        hotel_pages: Async iterator of hotel pages (e.g. iter_hotel_pages())
+        min_candidates: Candidates needed before pagination stops
+        gap_hours: Minimum hours between flight arrival and hotel check-in.
+                   Defaults to TRAVEL_HOTEL_CHECKIN_GAP_HOURS from config.
+        min_overall_rating: Minimum overall hotel rating (default: 3.7)
+        min_location_rating: Minimum location rating (default: 4.0)
+    
+    Returns:
+        All hotels read so far, in page order (pass them to find_cheapest_plan)
+    
+    Example:
+        >>> pages = iter_hotel_pages("Tokyo", "2026-01-15", "2026-01-22")
+        >>> hotels = await collect_hotel_pages(flights, pages)
+        >>> plan = find_cheapest_plan(flights, hotels)
+    """
+    arrivals = [arrival for arrival in map(extract_arrival_datetime, flights) if arrival is not None]
+    
+    hotels = []
+    candidates = 0
+    pages_read = 0
+    
+    try:
+        async for page in hotel_pages:
+            pages_read += 1
+            hotels.extend(page)
+            
+            quality_hotels = filter_hotels_by_rating(
+                page,
+                min_overall_rating=min_overall_rating,
+                min_location_rating=min_location_rating,
+            )
+            usable = set()
+            for arrival in arrivals:
+                usable.update(id(hotel) for hotel in filter_valid_hotels(quality_hotels, arrival, gap_hours))
+                if len(usable) == len(quality_hotels):
+                    break
+            candidates += len(usable)
+            
+            if candidates >= min_candidates:
+                logger.info(f"Found {candidates} hotel candidates after {pages_read} page(s), stopping pagination")
+                break
+    finally:
+        # Stop the generator so no further pages are requested
+        aclose = getattr(hotel_pages, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    
+    logger.info(f"Collected {len(hotels)} hotels ({candidates} candidates) from {pages_read} page(s)")
+    return hotels
+
+
+def walkable_activities(
+    hotel: dict,
+    index: ActivityIndex,
+    radius_km: float = TRAVEL_WALKABLE_RADIUS_KM,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """
+    Return the activities within walking distance of a hotel, nearest first.
+    
+    Args:
+        hotel: Hotel with "latitude" and "longitude" (from search_hotels())
+        index: Activity index of the hotel's destination (see spatial.py)
+        radius_km: Walking distance (default: TRAVEL_WALKABLE_RADIUS_KM)
+        limit: Return at most this many activities (None = all)
+    
+    Returns:
+        Copies of the activities with "distance_km" added; empty if the hotel
+        has no coordinates
+    
+    Example:
+        >>> index = index_activities("Tokyo", activities)
+        >>> for activity in walkable_activities(plan["hotel"], index, limit=5):
+        ...     print(activity["name"], activity["distance_km"])
+    """
+    if hotel.get("latitude") is None or hotel.get("longitude") is None:
+        return []
+    return [
+        {**activity, "distance_km": round(distance, 2)}
+        for activity, distance in index.within(hotel["latitude"], hotel["longitude"], radius_km, limit)
+    ]
+
+
+def rank_hotels_by_proximity(
+    hotels: list[dict],
+    index: ActivityIndex,
+    radius_km: float = TRAVEL_WALKABLE_RADIUS_KM,
+) -> list[dict]:
+    """
+    Order hotels by how many activities are within walking distance.
+    
+    Each activity within radius_km counts 1 at the hotel's door, falling to
+    0 at radius_km, so a hotel close to a few places can beat one at the edge
+    of many. Equal scores go to the cheaper hotel; hotels without coordinates
+    come last, cheapest first.
+    
+    Args:
+        hotels: Hotel options (from search_hotels())
+        index: Activity index of the destination (see spatial.py)
+        radius_km: Walking distance (default: TRAVEL_WALKABLE_RADIUS_KM)
+    
+    Returns:
+        The hotels in ranked order (the same objects, not copies)
+    """
+    def proximity_score(hotel: dict) -> float:
+        if hotel.get("latitude") is None or hotel.get("longitude") is None:
+            return -1.0
+        return sum(
+            1.0 - distance / radius_km
+            for _, distance in index.within(hotel["latitude"], hotel["longitude"], radius_km)
         )
-    else:
-        logger.warning("No valid flight + hotel combination found")
     
-    return best_plan
+    scored = [(proximity_score(hotel), hotel.get("price") or float("inf"), position, hotel) for position, hotel in enumerate(hotels)]
+    scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+    return [hotel for _, _, _, hotel in scored]
@@ -45,13 +45,185 @@ OAUTH2_APPKEY = os.getenv("OAUTH2_APPKEY", "")
 # SerpAPI is used to search for flights and hotels
 # Get your API key at: https://serpapi.com/
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY", "")
+# Optional pool of keys to scale throughput: comma-separated "key[:weight[:monthly_quota]]"
+# (SERPAPI_API_KEY is used alone when unset). Requests go to the least used key
+# (least_used) or by smooth weighted round-robin (weighted); keys rejected by SerpAPI
+# (401/403, or out of searches) or out of quota are ejected for SERPAPI_KEY_EJECT_SECONDS
+# (plain 429 throttling is retried with backoff instead).
+# Rate limits below are per key, so they are multiplied by the number of keys.
+SERPAPI_API_KEYS = os.getenv("SERPAPI_API_KEYS", "")
+SERPAPI_KEY_STRATEGY = os.getenv("SERPAPI_KEY_STRATEGY", "least_used").lower()
+SERPAPI_KEY_MONTHLY_QUOTA = int(os.getenv("SERPAPI_KEY_MONTHLY_QUOTA", "0"))
+SERPAPI_KEY_EJECT_SECONDS = float(os.getenv("SERPAPI_KEY_EJECT_SECONDS", "3600"))
 SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com/search")
 
+# Shared HTTP client settings for SerpAPI calls
+# One pooled client is kept per process so connections (TCP + TLS) are reused
+# HTTP/2 is only enabled when the optional `h2` package is installed
+SERPAPI_HTTP_TIMEOUT_SECONDS = float(os.getenv("SERPAPI_HTTP_TIMEOUT_SECONDS", "30"))
+SERPAPI_HTTP2_ENABLED = os.getenv("SERPAPI_HTTP2_ENABLED", "true").lower() in ("true", "1", "yes")
+SERPAPI_MAX_CONNECTIONS = int(os.getenv("SERPAPI_MAX_CONNECTIONS", "100"))
+SERPAPI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("SERPAPI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+SERPAPI_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("SERPAPI_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+# SerpAPI response cache (memory LRU + SQLite on disk)
+# TTLs are per engine: flight fares change quickly, hotels slower, local activities rarely
+SERPAPI_CACHE_ENABLED = os.getenv("SERPAPI_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+SERPAPI_CACHE_MAX_ENTRIES = int(os.getenv("SERPAPI_CACHE_MAX_ENTRIES", "512"))
+SERPAPI_CACHE_DB_PATH = os.getenv("SERPAPI_CACHE_DB_PATH", ".cache/serpapi/search_cache.sqlite3")
+SERPAPI_CACHE_TTL_FLIGHTS_SECONDS = int(os.getenv("SERPAPI_CACHE_TTL_FLIGHTS_SECONDS", "900"))  # 15 minutes
+SERPAPI_CACHE_TTL_HOTELS_SECONDS = int(os.getenv("SERPAPI_CACHE_TTL_HOTELS_SECONDS", "21600"))  # 6 hours
+SERPAPI_CACHE_TTL_ACTIVITIES_SECONDS = int(os.getenv("SERPAPI_CACHE_TTL_ACTIVITIES_SECONDS", "259200"))  # 3 days
+# Expired entries are still served for STALE_SECONDS while a background refresh runs
+SERPAPI_CACHE_STALE_SECONDS = int(os.getenv("SERPAPI_CACHE_STALE_SECONDS", "900"))
+
+# Cache prewarming: popular recent searches are refreshed ahead of expiry in the
+# background, using at most BUDGET_SHARE of the rate limits / remaining monthly quota
+SERPAPI_PREWARM_ENABLED = os.getenv("SERPAPI_PREWARM_ENABLED", "false").lower() in ("true", "1", "yes")
+SERPAPI_PREWARM_BUDGET_SHARE = float(os.getenv("SERPAPI_PREWARM_BUDGET_SHARE", "0.1"))
+SERPAPI_PREWARM_INTERVAL_SECONDS = float(os.getenv("SERPAPI_PREWARM_INTERVAL_SECONDS", "300"))
+SERPAPI_PREWARM_LEAD_SECONDS = float(os.getenv("SERPAPI_PREWARM_LEAD_SECONDS", "300"))
+SERPAPI_PREWARM_MAX_PER_CYCLE = int(os.getenv("SERPAPI_PREWARM_MAX_PER_CYCLE", "10"))
+SERPAPI_PREWARM_HISTORY_SECONDS = float(os.getenv("SERPAPI_PREWARM_HISTORY_SECONDS", "86400"))  # 24 hours
+
+# SerpAPI rate limiting and monthly quota
+# Per-engine budgets in requests per minute per API key, with a shared burst size
+# Interactive searches always go ahead of background work (prefetch, enrichment)
+# SERPAPI_MONTHLY_QUOTA=0 means unlimited; usage is persisted to SERPAPI_QUOTA_DB_PATH
+# (per-key usage of a key pool goes to SERPAPI_QUOTA_DB_PATH with the key's fingerprint)
+SERPAPI_RATE_LIMIT_ENABLED = os.getenv("SERPAPI_RATE_LIMIT_ENABLED", "true").lower() in ("true", "1", "yes")
+SERPAPI_RATE_FLIGHTS_PER_MINUTE = float(os.getenv("SERPAPI_RATE_FLIGHTS_PER_MINUTE", "60"))
+SERPAPI_RATE_HOTELS_PER_MINUTE = float(os.getenv("SERPAPI_RATE_HOTELS_PER_MINUTE", "30"))
+SERPAPI_RATE_ACTIVITIES_PER_MINUTE = float(os.getenv("SERPAPI_RATE_ACTIVITIES_PER_MINUTE", "30"))
+SERPAPI_RATE_BURST = float(os.getenv("SERPAPI_RATE_BURST", "5"))
+SERPAPI_RATE_MAX_WAIT_SECONDS = float(os.getenv("SERPAPI_RATE_MAX_WAIT_SECONDS", "10"))
+SERPAPI_MONTHLY_QUOTA = int(os.getenv("SERPAPI_MONTHLY_QUOTA", "0"))
+SERPAPI_QUOTA_DB_PATH = os.getenv("SERPAPI_QUOTA_DB_PATH", ".cache/serpapi/quota.sqlite3")
+
+# SerpAPI retries and hedged requests
+# Timeouts, 5xx and 429 responses are retried with jittered exponential backoff
+# Hedging (optional): if a request is slower than the engine's recent p95 latency
+# (clamped to the min/max below), a duplicate request is sent and the first answer wins
+SERPAPI_RETRY_MAX_ATTEMPTS = int(os.getenv("SERPAPI_RETRY_MAX_ATTEMPTS", "3"))
+SERPAPI_RETRY_BASE_DELAY_SECONDS = float(os.getenv("SERPAPI_RETRY_BASE_DELAY_SECONDS", "0.5"))
+SERPAPI_RETRY_MAX_DELAY_SECONDS = float(os.getenv("SERPAPI_RETRY_MAX_DELAY_SECONDS", "4"))
+SERPAPI_HEDGING_ENABLED = os.getenv("SERPAPI_HEDGING_ENABLED", "false").lower() in ("true", "1", "yes")
+SERPAPI_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("SERPAPI_HEDGE_MIN_DELAY_SECONDS", "1"))
+SERPAPI_HEDGE_MAX_DELAY_SECONDS = float(os.getenv("SERPAPI_HEDGE_MAX_DELAY_SECONDS", "10"))
+SERPAPI_HEDGE_MIN_SAMPLES = int(os.getenv("SERPAPI_HEDGE_MIN_SAMPLES", "20"))
+
+# SerpAPI circuit breakers (one per engine)
+# A breaker opens after N consecutive upstream failures (timeouts, transport errors, 5xx),
+# or when the error rate over the window reaches the threshold (once min requests were seen).
+# While open, requests fail fast and are answered from the last cached response (marked stale);
+# after SERPAPI_BREAKER_OPEN_SECONDS a few trial requests decide whether it closes again
+SERPAPI_BREAKER_ENABLED = os.getenv("SERPAPI_BREAKER_ENABLED", "true").lower() in ("true", "1", "yes")
+SERPAPI_BREAKER_FAILURE_THRESHOLD = int(os.getenv("SERPAPI_BREAKER_FAILURE_THRESHOLD", "5"))
+SERPAPI_BREAKER_ERROR_RATE = float(os.getenv("SERPAPI_BREAKER_ERROR_RATE", "0.5"))
+SERPAPI_BREAKER_WINDOW_SECONDS = float(os.getenv("SERPAPI_BREAKER_WINDOW_SECONDS", "60"))
+SERPAPI_BREAKER_MIN_REQUESTS = int(os.getenv("SERPAPI_BREAKER_MIN_REQUESTS", "10"))
+SERPAPI_BREAKER_OPEN_SECONDS = float(os.getenv("SERPAPI_BREAKER_OPEN_SECONDS", "30"))
+SERPAPI_BREAKER_HALF_OPEN_PROBES = int(os.getenv("SERPAPI_BREAKER_HALF_OPEN_PROBES", "1"))
+
+# SerpAPI record/replay (offline benchmarking and CI)
+# off:    normal operation
+# record: every raw SerpAPI response is also written to SERPAPI_RECORDINGS_DIR
+# replay: responses are served from SERPAPI_RECORDINGS_DIR, SerpAPI is never called
+#         (no API key needed; rate budgets and quota are not spent)
+SERPAPI_RECORD_MODE = os.getenv("SERPAPI_RECORD_MODE", "off").lower()
+SERPAPI_RECORDINGS_DIR = os.getenv("SERPAPI_RECORDINGS_DIR", ".cache/serpapi/recordings")
+
+# Local SerpAPI stand-in server (agents/travel/serpapi_stub_server.py)
+# Serves /search from the recordings with injected latency and errors
+# Point SERPAPI_BASE_URL at http://localhost:<port>/search to use it
+SERPAPI_STUB_PORT = int(os.getenv("SERPAPI_STUB_PORT", "9010"))
+SERPAPI_STUB_LATENCY_MS = float(os.getenv("SERPAPI_STUB_LATENCY_MS", "0"))
+SERPAPI_STUB_LATENCY_JITTER_MS = float(os.getenv("SERPAPI_STUB_LATENCY_JITTER_MS", "0"))
+SERPAPI_STUB_ERROR_RATE = float(os.getenv("SERPAPI_STUB_ERROR_RATE", "0"))
+SERPAPI_STUB_RATE_LIMIT_RATE = float(os.getenv("SERPAPI_STUB_RATE_LIMIT_RATE", "0"))
+
+# Flexible-date fare grid (search_flights_grid)
+# Each outbound date and each return date is one one-way SerpAPI search
+SERPAPI_GRID_MAX_CONCURRENCY = int(os.getenv("SERPAPI_GRID_MAX_CONCURRENCY", "4"))
+SERPAPI_GRID_MAX_OUTBOUND_DATES = int(os.getenv("SERPAPI_GRID_MAX_OUTBOUND_DATES", "31"))
+SERPAPI_GRID_MAX_TRIP_LENGTHS = int(os.getenv("SERPAPI_GRID_MAX_TRIP_LENGTHS", "7"))
+
+# Multi-airport search (search_flights_multi_airport)
+# Origin and destination are expanded to their metro airports (e.g. JFK, EWR, LGA)
+# plus airports within the requested radius; at most MAX_PAIRS pairs are searched
+SERPAPI_MULTI_AIRPORT_MAX_PAIRS = int(os.getenv("SERPAPI_MULTI_AIRPORT_MAX_PAIRS", "6"))
+TRAVEL_NEARBY_AIRPORT_RADIUS_KM = float(os.getenv("TRAVEL_NEARBY_AIRPORT_RADIUS_KM", "100"))
+
+# Multi-category activity search (search_activities_multi)
+# Up to MAX_TYPES categories are searched concurrently; places with the same
+# place_id, or matching names within MERGE_RADIUS_METERS, are merged into one
+SERPAPI_ACTIVITY_MAX_TYPES = int(os.getenv("SERPAPI_ACTIVITY_MAX_TYPES", "5"))
+SERPAPI_ACTIVITY_MERGE_RADIUS_METERS = float(os.getenv("SERPAPI_ACTIVITY_MERGE_RADIUS_METERS", "50"))
+
+# Activities within WALKABLE_RADIUS_KM of a hotel are shown as walkable from it
+# and count towards distance-aware hotel ranking (rank_hotels_by_proximity)
+TRAVEL_WALKABLE_RADIUS_KM = float(os.getenv("TRAVEL_WALKABLE_RADIUS_KM", "1.0"))
+
+# Paginated hotel search
+# Full-trip planning reads further pages of hotel results (cheapest first) only
+# until enough hotels pass the rating and check-in filters, up to MAX_PAGES pages
+SERPAPI_HOTEL_MAX_PAGES = int(os.getenv("SERPAPI_HOTEL_MAX_PAGES", "3"))
+TRAVEL_HOTEL_MIN_CANDIDATES = int(os.getenv("TRAVEL_HOTEL_MIN_CANDIDATES", "5"))
+
+# Plan evaluation engine
+# find_cheapest_plan checks every flight against every hotel with NumPy (if installed)
+# once flights x hotels reaches this many pairs; smaller sets use the pure-Python engine
+TRAVEL_VECTORIZE_MIN_PAIRS = int(os.getenv("TRAVEL_VECTORIZE_MIN_PAIRS", "20000"))
+
+# Batch plan solver (solve_plan_batch)
+# Batches of at least TRAVEL_BATCH_MIN_PROBLEMS are solved in a process pool of
+# TRAVEL_BATCH_WORKERS processes (0 = one per CPU), TRAVEL_BATCH_CHUNK_SIZE problems
+# per task (0 = about four tasks per worker); smaller batches are solved in-process
+TRAVEL_BATCH_WORKERS = int(os.getenv("TRAVEL_BATCH_WORKERS", "0"))
+TRAVEL_BATCH_MIN_PROBLEMS = int(os.getenv("TRAVEL_BATCH_MIN_PROBLEMS", "32"))
+TRAVEL_BATCH_CHUNK_SIZE = int(os.getenv("TRAVEL_BATCH_CHUNK_SIZE", "0"))
+
+# Number of alternative return flights attached to each round-trip option
+# (next best matches after the chosen return flight; 0 disables)
+SERPAPI_RETURN_ALTERNATIVES = int(os.getenv("SERPAPI_RETURN_ALTERNATIVES", "2"))
+
+# Exact round-trip pricing via departure_token follow-ups
+# For the TOP_N cheapest outbound flights, fetch the return flights actually paired
+# with them (one extra SerpAPI search each, cached) instead of matching a separate
+# one-way return search. Follow-ups run CONCURRENCY at a time and whatever has not
+# finished after BUDGET_SECONDS keeps the matched return. They are skipped when
+# fewer than QUOTA_RESERVE monthly searches would remain afterwards.
+SERPAPI_EXACT_RETURN_PRICING = os.getenv("SERPAPI_EXACT_RETURN_PRICING", "false").lower() in ("true", "1", "yes")
+SERPAPI_DEPARTURE_TOKEN_TOP_N = int(os.getenv("SERPAPI_DEPARTURE_TOKEN_TOP_N", "3"))
+SERPAPI_DEPARTURE_TOKEN_CONCURRENCY = int(os.getenv("SERPAPI_DEPARTURE_TOKEN_CONCURRENCY", "3"))
+SERPAPI_DEPARTURE_TOKEN_BUDGET_SECONDS = float(os.getenv("SERPAPI_DEPARTURE_TOKEN_BUDGET_SECONDS", "6"))
+SERPAPI_DEPARTURE_TOKEN_QUOTA_RESERVE = int(os.getenv("SERPAPI_DEPARTURE_TOKEN_QUOTA_RESERVE", "50"))
+
+# Local fare history (agents/travel/fare_history.py)
+# Fares and hotel rates from every SerpAPI response are appended to SQLite so price
+# insights ("good price?", "cheapest recent fare") need no extra upstream call.
+# Insights compare against LOOKBACK_DAYS of observations for travel dates within
+# DATE_WINDOW_DAYS of the requested date; a verdict needs MIN_SAMPLES observations.
+TRAVEL_FARE_HISTORY_ENABLED = os.getenv("TRAVEL_FARE_HISTORY_ENABLED", "true").lower() in ("true", "1", "yes")
+TRAVEL_FARE_HISTORY_DB_PATH = os.getenv("TRAVEL_FARE_HISTORY_DB_PATH", ".cache/serpapi/fare_history.sqlite3")
+TRAVEL_FARE_HISTORY_RETENTION_DAYS = int(os.getenv("TRAVEL_FARE_HISTORY_RETENTION_DAYS", "365"))
+TRAVEL_FARE_HISTORY_LOOKBACK_DAYS = int(os.getenv("TRAVEL_FARE_HISTORY_LOOKBACK_DAYS", "30"))
+TRAVEL_FARE_HISTORY_DATE_WINDOW_DAYS = int(os.getenv("TRAVEL_FARE_HISTORY_DATE_WINDOW_DAYS", "3"))
+TRAVEL_FARE_HISTORY_MIN_SAMPLES = int(os.getenv("TRAVEL_FARE_HISTORY_MIN_SAMPLES", "5"))
+
 # Minimum hours required between flight arrival and hotel check-in
 # This buffer accounts for: deplaning, customs, baggage, airport-to-hotel travel
 # Default: 2 hours - adjust based on your use case
 TRAVEL_HOTEL_CHECKIN_GAP_HOURS = int(os.getenv("TRAVEL_HOTEL_CHECKIN_GAP_HOURS", "2"))
 
+# Alternative plans shown below the best full-trip plan (0 = only the best plan)
+# Alternatives fly other airlines, stay at other hotels and include a nonstop option
+TRAVEL_PLAN_ALTERNATIVES = int(os.getenv("TRAVEL_PLAN_ALTERNATIVES", "2"))
+
+# Most flight legs in one multi-city itinerary (A→B→C→A is 3 legs)
+# Each leg and each stay is one agent search, all sent at once
+TRAVEL_MULTI_CITY_MAX_LEGS = int(os.getenv("TRAVEL_MULTI_CITY_MAX_LEGS", "6"))
+
 # =============================================================================
 # Logging Configuration
 # =============================================================================
@@ -0,0 +1,126 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Random flight/hotel cases and reference solvers for the plan finder tests.
+
+The cases deliberately include what real data has: missing or zero prices,
+price ties, unparseable arrival times and check-in dates, 12-hour check-in
+times, late-night arrivals and hotels below the rating thresholds.
+"""
+
+import random
+
+from agents.travel.travel_logic import (
+    extract_arrival_datetime,
+    filter_hotels_by_rating,
+    filter_valid_hotels,
+)
+
+DATES = ["2026-03-10", "2026-03-11", "2026-03-12"]
+GAPS = [None, 0, 1, 2, 3.5, 5, 24, 30, 47]
+
+
+def random_case(rng: random.Random, max_flights: int = 8, max_hotels: int = 15) -> tuple[list[dict], list[dict]]:
+    """Return (flights, hotels) with up to max_flights and max_hotels entries."""
+    flights = []
+    for _ in range(rng.randrange(0, max_flights + 1)):
+        day = rng.choice(DATES)
+        clock = f"{rng.randrange(24):02d}:{rng.choice([0, 15, 30, 59]):02d}"
+        flights.append({
+            "price": rng.choice([None, 0, 100, 150, 200, rng.randrange(50, 500)]),
+            "arrival_time": rng.choice([f"{day} {clock}", f"{day}T{clock}", f"{day} {clock}:30", "bad"]),
+            "airline": rng.choice(["AA", "UA", "DL", None]),
+            "stops": rng.choice([0, 1, 2, None]),
+            "duration_minutes": rng.choice([300, 360, 420, 600]),
+        })
+
+    hotels = []
+    for i in range(rng.randrange(0, max_hotels + 1)):
+        hotel = {
+            "name": f"Hotel {i}",
+            "price": rng.choice([None, 0, 80, 100, rng.randrange(40, 400)]),
+            "overall_rating": rng.choice([0, 2.5, 3.2, 3.8, 4.5]),
+            "location_rating": rng.choice([0, 3.5, 4.2]),
+        }
+        draw = rng.random()
+        if draw < 0.7:
+            hotel["check_in_date"] = rng.choice(["2026-03-09", *DATES, "2026-03-13"])
+        elif draw < 0.8:
+            hotel["check_in_date"] = "garbage"
+        elif draw < 0.9:
+            hotel["check_in_date"] = ""
+        if rng.random() < 0.8:
+            hotel["check_in_time"] = rng.choice(
+                ["15:00", "14:00", "3:00 PM", "11:00 PM", "23:30", "00:00", "nonsense", "12:00 AM"]
+            )
+        hotels.append(hotel)
+    return flights, hotels
+
+
+def reference_quality_hotels(hotels: list[dict], min_overall_rating: float, min_location_rating: float) -> list[dict]:
+    """Rating filter with the fallbacks of find_cheapest_plan, one step at a time."""
+    quality = filter_hotels_by_rating(hotels, min_overall_rating, min_location_rating)
+    if not quality:
+        quality = filter_hotels_by_rating(hotels, min_overall_rating, 0)
+    if not quality:
+        quality = [h for h in hotels if (h.get("overall_rating", 0) or h.get("rating", 0) or 0) >= 3.0]
+    return quality or hotels
+
+
+def reference_candidates(
+    flights: list[dict],
+    hotels: list[dict],
+    gap_hours: float,
+    min_overall_rating: float = 3.7,
+    min_location_rating: float = 4.0,
+) -> list[tuple]:
+    """
+    Every valid (flight, hotel) pair as (total, flight order, hotel position, flight, hotel, arrival).
+
+    Sorted by total, then flight order, then hotel position (hotel positions
+    are positions among the hotels that pass the rating filter).
+    """
+    quality = reference_quality_hotels(hotels, min_overall_rating, min_location_rating)
+    position = {id(hotel): i for i, hotel in enumerate(quality)}
+    candidates = []
+    for order, flight in enumerate(flights):
+        arrival = extract_arrival_datetime(flight)
+        if arrival is None:
+            continue
+        for hotel in filter_valid_hotels(quality, arrival, gap_hours):
+            total = (flight.get("price") or 0) + (hotel.get("price") or 0)
+            candidates.append((total, order, position[id(hotel)], flight, hotel, arrival))
+    candidates.sort(key=lambda candidate: candidate[:3])
+    return candidates
+
+
+def reference_cheapest_plan(
+    flights: list[dict],
+    hotels: list[dict],
+    gap_hours: float,
+    min_overall_rating: float = 3.7,
+    min_location_rating: float = 4.0,
+):
+    """The cheapest plan by exhaustive search (ties: earlier flight, then hotel listed first)."""
+    if not flights or not hotels:
+        return None
+    candidates = reference_candidates(flights, hotels, gap_hours, min_overall_rating, min_location_rating)
+    if not candidates:
+        return None
+    total, _, _, flight, hotel, arrival = candidates[0]
+    return {
+        "flight": flight,
+        "hotel": hotel,
+        "total_price": total,
+        "gap_hours": gap_hours,
+        "arrival_time": arrival.strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def assert_same_plan(plan, expected) -> None:
+    """Plans must match, down to which flight and hotel objects were picked."""
+    assert plan == expected
+    if expected is not None:
+        assert plan["flight"] is expected["flight"]
+        assert plan["hotel"] is expected["hotel"]
@@ -0,0 +1,53 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for find_cheapest_plan against an exhaustive search over all pairs.
+"""
+
+import random
+
+import pytest
+
+from agents.travel.travel_logic import TRAVEL_HOTEL_CHECKIN_GAP_HOURS, find_cheapest_plan
+from tests.unit.plan_cases import GAPS, assert_same_plan, random_case, reference_cheapest_plan
+
+
+def hotel(name, price, check_in_time="15:00"):
+    return {"name": name, "price": price, "overall_rating": 4.5, "location_rating": 4.5,
+            "check_in_date": "2026-03-10", "check_in_time": check_in_time}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        flights, hotels = random_case(rng)
+        gap_hours = rng.choice(GAPS)
+        min_overall, min_location = rng.choice([(3.7, 4.0), (4.0, 0), (0, 0)])
+
+        plan = find_cheapest_plan(flights, hotels, gap_hours, min_overall, min_location)
+        resolved_gap = TRAVEL_HOTEL_CHECKIN_GAP_HOURS if gap_hours is None else gap_hours
+        assert_same_plan(plan, reference_cheapest_plan(flights, hotels, resolved_gap, min_overall, min_location))
+
+
+def test_ties_go_to_the_earlier_flight():
+    flights = [
+        {"price": 200, "arrival_time": "2026-03-10 09:00"},
+        {"price": 150, "arrival_time": "2026-03-10 10:00"},
+        {"price": 150, "arrival_time": "2026-03-10 08:00"},
+    ]
+
+    plan = find_cheapest_plan(flights, [hotel("A", 100)], gap_hours=2)
+
+    assert plan["flight"] is flights[1]
+
+
+def test_ties_go_to_the_hotel_listed_first():
+    flights = [{"price": 150, "arrival_time": "2026-03-10 10:00"}]
+    hotels = [hotel("Pricey", 120), hotel("First", 100), hotel("Second", 100, "14:00")]
+
+    plan = find_cheapest_plan(flights, hotels, gap_hours=2)
+
+    assert plan["hotel"] is hotels[1]
+    assert plan["total_price"] == 250
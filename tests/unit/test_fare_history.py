@@ -0,0 +1,44 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the local fare history (hotel rates and price insights).
+"""
+
+import asyncio
+
+from agents.travel.fare_history import FareHistory
+
+
+def test_hotel_rates_are_recorded_per_night(tmp_path):
+    history = FareHistory(str(tmp_path / "history.sqlite3"))
+    hotels = [
+        {"name": "Nightly", "price": 150, "overall_rating": 4.2},
+        {"name": "Total", "price": 700, "price_is_total": True, "overall_rating": 4.5},
+    ]
+
+    asyncio.run(history.record_hotels("Tokyo", "2026-01-15", "2026-01-22", hotels, observed_at=1000.0))
+    rows = asyncio.run(history.hotel_rates("tokyo", "2026-01-15", "2026-01-15", since=0))
+
+    assert [(row["hotel"], row["price"]) for row in rows] == [("Total", 100.0), ("Nightly", 150.0)]
+
+
+def test_stay_totals_without_nights_are_skipped(tmp_path):
+    history = FareHistory(str(tmp_path / "history.sqlite3"))
+    hotels = [{"name": "Total", "price": 700, "price_is_total": True}]
+
+    asyncio.run(history.record_hotels("Tokyo", "2026-01-15", "", hotels, observed_at=1000.0))
+
+    assert asyncio.run(history.hotel_rates("Tokyo", "2026-01-15", "2026-01-15", since=0)) == []
+
+
+def test_insight_leaves_out_observations_of_the_current_search(tmp_path):
+    history = FareHistory(str(tmp_path / "history.sqlite3"), lookback_days=10**6, min_samples=1)
+    asyncio.run(history.record_hotels("Tokyo", "2026-01-15", "2026-01-16", [{"name": "Old", "price": 200}], observed_at=1000.0))
+    asyncio.run(history.record_hotels("Tokyo", "2026-01-15", "2026-01-16", [{"name": "New", "price": 90}], observed_at=2000.0))
+
+    insight = asyncio.run(history.hotel_insight("Tokyo", "2026-01-15", 90, before=2000.0))
+
+    assert insight["samples"] == 1
+    assert insight["cheapest_recent"]["name"] == "Old"
+    assert insight["verdict"] == "good"
@@ -0,0 +1,131 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the multi-city itinerary planner (find_cheapest_itinerary).
+
+The leg DP is checked against a brute force over every combination of one
+flight per leg and one valid hotel per stay.
+"""
+
+import itertools
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.travel.travel_logic import filter_valid_hotels, find_cheapest_itinerary
+
+GAP_HOURS = 2
+LEG_DATES = ["2026-03-01", "2026-03-04", "2026-03-07"]
+STAY_NIGHTS = [3, 3]
+
+
+def _time(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M")
+
+
+def make_flights(rng: random.Random, leg_date: str, count: int) -> list[dict]:
+    day = datetime.strptime(leg_date, "%Y-%m-%d")
+    flights = []
+    for _ in range(count):
+        departure = day + timedelta(hours=rng.randint(5, 21), minutes=rng.choice([0, 30]))
+        arrival = departure + timedelta(hours=rng.randint(1, 9))
+        flights.append({
+            "price": rng.randint(80, 600),
+            "departure_time": _time(departure),
+            "arrival_time": _time(arrival),
+        })
+    return flights
+
+
+def make_hotels(rng: random.Random, leg_date: str, count: int) -> list[dict]:
+    next_day = (datetime.strptime(leg_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    return [
+        {
+            "name": f"Hotel {i}",
+            "price": rng.randint(60, 900),
+            "price_is_total": rng.random() < 0.5,
+            "overall_rating": 4.5,
+            "location_rating": 4.5,
+            "check_in_time": rng.choice(["12:00", "15:00", "16:00", "22:00"]),
+            "check_in_date": rng.choice([leg_date, leg_date, next_day, ""]),
+        }
+        for i in range(count)
+    ]
+
+
+def stay_cost(hotel: dict, nights: int) -> float:
+    return hotel["price"] if hotel["price_is_total"] else hotel["price"] * nights
+
+
+def arrival(flight: dict) -> datetime:
+    return datetime.strptime(flight["arrival_time"], "%Y-%m-%d %H:%M")
+
+
+def departure(flight: dict) -> datetime:
+    return datetime.strptime(flight["departure_time"], "%Y-%m-%d %H:%M")
+
+
+def brute_force_cost(leg_flights: list[list[dict]], stay_hotels: list[list[dict]]):
+    """Cheapest total over all flight and valid hotel combinations (None if infeasible)."""
+    best = None
+    for flights in itertools.product(*leg_flights):
+        if any(
+            departure(flights[leg]) < arrival(flights[leg - 1]) + timedelta(hours=GAP_HOURS)
+            for leg in range(1, len(flights))
+        ):
+            continue
+        cost = sum(flight["price"] for flight in flights)
+        for leg, hotels in enumerate(stay_hotels):
+            valid = filter_valid_hotels(hotels, arrival(flights[leg]), GAP_HOURS)
+            if not valid:
+                cost = None
+                break
+            cost += min(stay_cost(hotel, STAY_NIGHTS[leg]) for hotel in valid)
+        if cost is not None and (best is None or cost < best):
+            best = cost
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    leg_flights = [make_flights(rng, leg_date, 5) for leg_date in LEG_DATES]
+    stay_hotels = [make_hotels(rng, leg_date, 6) for leg_date in LEG_DATES[:-1]]
+
+    itinerary = find_cheapest_itinerary(
+        leg_flights, stay_hotels, STAY_NIGHTS, GAP_HOURS, min_overall_rating=4.0, min_location_rating=4.0
+    )
+    expected = brute_force_cost(leg_flights, stay_hotels)
+
+    if expected is None:
+        assert itinerary is None
+        return
+    assert itinerary["total_price"] == expected
+
+    # The returned legs are themselves feasible and add up to the total
+    legs = itinerary["legs"]
+    total = 0
+    for leg, plan in enumerate(legs):
+        total += plan["flight"]["price"] + plan["hotel_price"]
+        if leg > 0:
+            assert departure(plan["flight"]) >= arrival(legs[leg - 1]["flight"]) + timedelta(hours=GAP_HOURS)
+        if leg < len(stay_hotels):
+            assert plan["hotel"] in filter_valid_hotels(stay_hotels[leg], arrival(plan["flight"]), GAP_HOURS)
+            assert plan["hotel_price"] == stay_cost(plan["hotel"], STAY_NIGHTS[leg])
+        else:
+            assert plan["hotel"] is None and plan["hotel_price"] == 0
+    assert total == expected
+
+
+def test_stay_totals_are_not_multiplied_by_nights():
+    flights = [[{"price": 100, "departure_time": "2026-03-01 08:00", "arrival_time": "2026-03-01 10:00"}]]
+    nightly = {"name": "Nightly", "price": 100, "check_in_time": "15:00", "check_in_date": "2026-03-01",
+               "overall_rating": 4.5, "location_rating": 4.5}
+    total = {**nightly, "name": "Total", "price": 250, "price_is_total": True}
+
+    itinerary = find_cheapest_itinerary(flights, [[nightly, total]], [3], GAP_HOURS)
+
+    assert itinerary["legs"][0]["hotel"]["name"] == "Total"
+    assert itinerary["total_price"] == 350
@@ -0,0 +1,88 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the SerpAPI key pool's ejection policy and failover.
+"""
+
+import asyncio
+
+import pytest
+
+from agents.travel.exceptions import SerpApiBudgetExhaustedError
+from agents.travel.key_pool import ApiKeyPool, key_error_reason
+
+ENGINE = "google_flights"
+
+
+def make_pool(spec=(("key-a", 1.0, 0), ("key-b", 1.0, 0))) -> ApiKeyPool:
+    # quota_db_path=None keeps the per-key quota counters in memory
+    return ApiKeyPool(list(spec), quota_db_path=None, eject_seconds=60)
+
+
+def acquire(pool: ApiKeyPool):
+    key = asyncio.run(pool.acquire(ENGINE))
+    pool.release(key)
+    return key
+
+
+def test_429_alone_is_not_a_key_error():
+    assert key_error_reason(429) is None
+    assert key_error_reason(429, "Too many requests, please slow down.") is None
+
+
+@pytest.mark.parametrize(
+    "status_code, message, reason",
+    [
+        (401, "", "auth"),
+        (403, "", "auth"),
+        (200, "Invalid API key. Your API key should be here: https://serpapi.com/manage-api-key", "auth"),
+        (429, "Your account has run out of searches.", "quota"),
+        (200, "Your account has run out of searches.", "quota"),
+    ],
+)
+def test_key_errors(status_code, message, reason):
+    assert key_error_reason(status_code, message) == reason
+
+
+def test_429_keeps_key_in_pool():
+    pool = make_pool([("key-a", 1.0, 0)])
+    key = acquire(pool)
+
+    assert pool.report_error(key, 429) is False
+    assert pool.healthy_count() == 1
+    assert acquire(pool) is key
+
+
+@pytest.mark.parametrize(
+    "status_code, message",
+    [(401, ""), (403, ""), (429, "Your account has run out of searches.")],
+)
+def test_rejected_key_is_ejected(status_code, message):
+    pool = make_pool([("key-a", 1.0, 0)])
+    key = acquire(pool)
+
+    assert pool.report_error(key, status_code, message) is True
+    assert pool.healthy_count() == 0
+    with pytest.raises(SerpApiBudgetExhaustedError):
+        asyncio.run(pool.acquire(ENGINE))
+
+
+def test_acquire_fails_over_to_healthy_key():
+    pool = make_pool()
+    rejected = acquire(pool)
+    pool.report_error(rejected, 401)
+
+    for _ in range(5):
+        key = acquire(pool)
+        assert key is not rejected
+    assert pool.stats()["ejections"] == 1
+
+
+def test_acquire_skips_key_out_of_monthly_quota():
+    pool = make_pool([("key-a", 1.0, 1), ("key-b", 1.0, 0)])
+    keys = [acquire(pool).fingerprint for _ in range(3)]
+
+    # key-a serves at most one request before its quota ejects it
+    assert pool.healthy_count() == 1
+    assert keys.count(pool.stats()["keys"][0]["key"]) == 1
@@ -0,0 +1,106 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for find_pareto_plans against a pairwise dominance check, and rank_plans.
+"""
+
+import random
+
+import pytest
+
+from agents.travel.travel_logic import find_cheapest_plan, find_pareto_plans, rank_plans
+from tests.unit.plan_cases import random_case, reference_candidates
+
+
+def pareto_case(rng):
+    """A random case where some flights have a return flight adding duration and stops."""
+    flights, hotels = random_case(rng, max_flights=10, max_hotels=20)
+    for flight in flights:
+        if rng.random() < 0.5:
+            flight["return_flight"] = {"duration_minutes": rng.choice([300, 400]), "stops": rng.choice([0, 1, None])}
+    return flights, hotels
+
+
+def objectives(flight, hotel, total):
+    duration = flight.get("duration_minutes") or 0
+    stops = flight.get("stops") or 0
+    return_flight = flight.get("return_flight") or {}
+    duration += return_flight.get("duration_minutes") or 0
+    stops += return_flight.get("stops") or 0
+    rating = hotel.get("overall_rating", 0) or hotel.get("rating", 0) or 0
+    return {"price": total, "duration": duration, "stops": stops, "rating": rating}
+
+
+def dominates(a, b):
+    return (a["price"] <= b["price"] and a["duration"] <= b["duration"]
+            and a["stops"] <= b["stops"] and a["rating"] >= b["rating"])
+
+
+def brute_force_frontier(flights, hotels, gap_hours):
+    """Keep every valid pair no other pair dominates; of identical pairs the first in order."""
+    candidates = [
+        (flight, hotel, objectives(flight, hotel, total))
+        for total, _, _, flight, hotel, _ in reference_candidates(flights, hotels, gap_hours)
+    ]
+    # Same order as the frontier: price, duration, stops, best rating, then the candidates' order
+    candidates.sort(key=lambda c: (c[2]["price"], c[2]["duration"], c[2]["stops"], -c[2]["rating"]))
+    frontier = []
+    for i, (flight, hotel, values) in enumerate(candidates):
+        if any(dominates(other, values) and (other != values or j < i)
+               for j, (_, _, other) in enumerate(candidates) if j != i):
+            continue
+        frontier.append((flight, hotel, values))
+    return frontier
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_pairwise_dominance(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        flights, hotels = pareto_case(rng)
+        gap_hours = rng.choice([0, 2, 5, 24])
+
+        plans = find_pareto_plans(flights, hotels, gap_hours)
+        expected = brute_force_frontier(flights, hotels, gap_hours)
+
+        assert len(plans) == len(expected)
+        for plan, (flight, hotel, values) in zip(plans, expected):
+            assert plan["flight"] is flight and plan["hotel"] is hotel
+            assert plan["objectives"] == values
+
+        cheapest = find_cheapest_plan(flights, hotels, gap_hours)
+        assert (plans[0]["total_price"] if plans else None) == (cheapest["total_price"] if cheapest else None)
+
+
+def plan(price, duration, stops, rating):
+    return {"objectives": {"price": price, "duration": duration, "stops": stops, "rating": rating}}
+
+
+FRONTIER = [plan(300, 900, 2, 3.8), plan(400, 600, 1, 4.0), plan(550, 500, 0, 4.9)]
+
+
+def test_rank_by_a_single_objective():
+    assert rank_plans(FRONTIER, {"price": 1}) == FRONTIER
+    assert rank_plans(FRONTIER, {"duration": 1})[0] is FRONTIER[2]
+    assert rank_plans(FRONTIER, {"rating": 1})[0] is FRONTIER[2]
+
+
+def test_rank_weights_are_relative_and_scale_free():
+    # Price: 0, 0.4, 1; duration: 1, 0.25, 0
+    assert rank_plans(FRONTIER, {"price": 3, "duration": 1})[0] is FRONTIER[0]
+    assert rank_plans(FRONTIER, {"price": 1, "duration": 1})[0] is FRONTIER[1]
+    assert rank_plans(FRONTIER, {"price": 30, "duration": 10}) == rank_plans(FRONTIER, {"price": 3, "duration": 1})
+
+
+def test_rank_ties_keep_the_frontier_order():
+    same = [plan(300, 600, 0, 4.0), plan(300, 600, 0, 4.0)]
+    assert rank_plans(same) == same
+    assert rank_plans(same)[0] is same[0]
+    assert rank_plans([]) == []
+
+
+@pytest.mark.parametrize("weights", [{"comfort": 1}, {"price": -1, "duration": 2}, {"price": 0}, {}])
+def test_rank_rejects_invalid_weights(weights):
+    with pytest.raises(ValueError):
+        rank_plans(FRONTIER, weights)
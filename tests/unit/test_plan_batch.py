@@ -0,0 +1,144 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for solve_plan_batch: same plans as find_cheapest_plan, in or out of process.
+"""
+
+import random
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import pytest
+
+from agents.travel import travel_logic
+from agents.travel.plan_batch import SharedColumns
+from agents.travel.travel_logic import TRAVEL_BATCH_MIN_PROBLEMS, PlanProblem, find_cheapest_plan, solve_plan_batch
+from tests.unit.plan_cases import random_case
+
+BATCH_SIZE = max(3 * TRAVEL_BATCH_MIN_PROBLEMS, 100)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stop_batch_pool():
+    yield
+    travel_logic._shutdown_batch_pool()
+
+
+def problems(seed, count=BATCH_SIZE):
+    rng = random.Random(seed)
+    return [
+        PlanProblem(
+            *random_case(rng, max_flights=12, max_hotels=25),
+            gap_hours=rng.choice([None, 0, 2, 3.5, 24]),
+            min_overall_rating=rng.choice([3.7, 4.0, 0]),
+            min_location_rating=rng.choice([4.0, 0]),
+        )
+        for _ in range(count)
+    ]
+
+
+def expected_plans(batch):
+    return {
+        index: find_cheapest_plan(p.flights, p.hotels, p.gap_hours, p.min_overall_rating, p.min_location_rating)
+        for index, p in enumerate(batch)
+    }
+
+
+def assert_same_results(results, batch):
+    assert sorted(index for index, _ in results) == list(range(len(batch)))
+    expected = expected_plans(batch)
+    for index, plan in results:
+        assert plan == expected[index]
+        if plan is not None:
+            # Plans are built from the caller's own dicts, not copies from the workers
+            assert plan["flight"] is expected[index]["flight"]
+            assert plan["hotel"] is expected[index]["hotel"]
+
+
+@pytest.fixture
+def created_blocks(monkeypatch):
+    """Names of the shared memory blocks the batch solver creates."""
+    names = []
+
+    class RecordingColumns(SharedColumns):
+        @classmethod
+        def create(cls, columns):
+            shared = super().create(columns)
+            names.append(shared.handle[0])
+            return shared
+
+    monkeypatch.setattr(travel_logic, "SharedColumns", RecordingColumns)
+    return names
+
+
+def assert_unlinked(names):
+    assert names
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_process_pool_matches_find_cheapest_plan(monkeypatch, created_blocks):
+    def no_fallback(problems, indices):
+        raise AssertionError("the batch must be solved by the process pool")
+
+    monkeypatch.setattr(travel_logic, "_solve_in_process", no_fallback)
+    batch = problems(0)
+
+    results = list(solve_plan_batch(batch, max_workers=2, chunk_size=17))
+
+    assert_same_results(results, batch)
+    assert_unlinked(created_blocks)
+
+
+def test_closing_early_frees_shared_memory(created_blocks):
+    results = solve_plan_batch(problems(1), max_workers=2, chunk_size=10)
+    next(results)
+    results.close()
+
+    assert_unlinked(created_blocks)
+
+
+def test_small_batches_run_in_process(monkeypatch):
+    def no_pool(workers):
+        raise AssertionError("small batches must not start a process pool")
+
+    monkeypatch.setattr(travel_logic, "_get_batch_pool", no_pool)
+    batch = problems(2, count=TRAVEL_BATCH_MIN_PROBLEMS - 1)
+
+    results = list(solve_plan_batch(batch, max_workers=2))
+
+    assert [index for index, _ in results] == list(range(len(batch)))
+    assert_same_results(results, batch)
+
+
+def test_falls_back_in_process_when_the_pool_cannot_start(monkeypatch):
+    def failing_pool(workers):
+        raise OSError("no semaphores")
+
+    monkeypatch.setattr(travel_logic, "_get_batch_pool", failing_pool)
+    batch = problems(3)
+
+    assert_same_results(list(solve_plan_batch(batch, max_workers=2)), batch)
+
+
+class BrokenPool:
+    """Pool whose workers die: every task fails with BrokenProcessPool."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_falls_back_in_process_when_a_worker_dies(monkeypatch, created_blocks):
+    monkeypatch.setattr(travel_logic, "_get_batch_pool", lambda workers: BrokenPool())
+    batch = problems(4)
+
+    assert_same_results(list(solve_plan_batch(batch, max_workers=2, chunk_size=20)), batch)
+    assert_unlinked(created_blocks)
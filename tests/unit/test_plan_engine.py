@@ -0,0 +1,49 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for the NumPy plan engine: same plans as the pure-Python engine.
+"""
+
+import random
+
+import pytest
+
+from agents.travel import plan_engine, travel_logic
+from tests.unit.plan_cases import assert_same_plan, random_case, reference_cheapest_plan
+
+GAPS = [0, 1, 2, 1 / 3, 3.5, 5, 24, 30, 47, -2]
+RATINGS = [(3.7, 4.0), (4.0, 0), (0, 0)]
+
+
+def cases(seed, count=1000):
+    rng = random.Random(seed)
+    for _ in range(count):
+        flights, hotels = random_case(rng)
+        if flights and hotels:
+            yield flights, hotels, rng.choice(GAPS), rng.choice(RATINGS)
+
+
+@pytest.mark.parametrize("block_cells", [7, 1 << 20])
+def test_engines_agree(monkeypatch, block_cells):
+    pytest.importorskip("numpy")
+    # Tiny blocks split every case into many flight blocks
+    monkeypatch.setattr(plan_engine, "_BLOCK_CELLS", block_cells)
+
+    for flights, hotels, gap_hours, (min_overall, min_location) in cases(block_cells):
+        scalar = travel_logic._find_cheapest_plan_scalar(flights, hotels, gap_hours, min_overall, min_location)
+        vectorized = travel_logic._find_cheapest_plan_vectorized(flights, hotels, gap_hours, min_overall, min_location)
+        assert_same_plan(vectorized, scalar)
+
+
+@pytest.mark.parametrize("have_numpy", [True, False])
+def test_find_cheapest_plan_with_either_engine(monkeypatch, have_numpy):
+    if have_numpy:
+        pytest.importorskip("numpy")
+    # Every case goes to the vectorized engine if it is available
+    monkeypatch.setattr(travel_logic, "TRAVEL_VECTORIZE_MIN_PAIRS", 1)
+    monkeypatch.setattr(plan_engine, "HAVE_NUMPY", have_numpy)
+
+    for flights, hotels, gap_hours, (min_overall, min_location) in cases(100 + have_numpy, count=500):
+        plan = travel_logic.find_cheapest_plan(flights, hotels, gap_hours, min_overall, min_location)
+        assert_same_plan(plan, reference_cheapest_plan(flights, hotels, gap_hours, min_overall, min_location))
@@ -0,0 +1,78 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for parsed hotel records and their columnar (A2A) tables.
+"""
+
+import json
+
+from agents.travel.results import HotelTable
+from agents.travel.serpapi_tools import _parse_hotel
+
+# One entry of a google_hotels "properties" list, as SerpAPI returns it
+PROPERTY = {
+    "type": "hotel",
+    "name": "Hotel Gracery Shinjuku",
+    "description": "Modern hotel with a Godzilla head on the terrace.",
+    "link": "https://gracery.com/shinjuku/",
+    "gps_coordinates": {"latitude": 35.6948, "longitude": 139.7016},
+    "check_in_time": "2:00 PM",
+    "check_out_time": "11:00 AM",
+    "rate_per_night": {
+        "lowest": "$152",
+        "extracted_lowest": 152,
+        "before_taxes_fees": "$138",
+        "extracted_before_taxes_fees": 138,
+    },
+    "total_rate": {
+        "lowest": "$1,064",
+        "extracted_lowest": 1064,
+        "before_taxes_fees": "$966",
+        "extracted_before_taxes_fees": 966,
+    },
+    "hotel_class": "4-star hotel",
+    "extracted_hotel_class": 4,
+    "overall_rating": 4.3,
+    "reviews": 6812,
+    "ratings": [{"stars": 5, "count": 3562}, {"stars": 4, "count": 2105}],
+    "location_rating": 4.9,
+    "reviews_breakdown": [{"name": "Location", "description": "Location", "total_mentioned": 912}],
+    "amenities": ["Free Wi-Fi", "Air conditioning", "Restaurant"],
+    "property_token": "ChkI0N-Xk5nL3bQHGg0vZy8xMXJ5bDd3Z3FzEAE",
+}
+
+
+def round_trip(hotels):
+    table = HotelTable.from_records(hotels)
+    return HotelTable.from_columns(json.loads(json.dumps(table.to_columns()))).to_dicts()
+
+
+def test_parse_hotel_reads_serpapi_property():
+    hotel = _parse_hotel(PROPERTY, "2026-01-15")
+
+    assert hotel["price"] == 152
+    assert hotel["price_is_total"] is False
+    assert hotel["hotel_class"] == 4
+    assert hotel["overall_rating"] == 4.3
+    assert hotel["location_rating"] == 4.9
+    assert hotel["check_in_time"] == "2:00 PM"
+    assert (hotel["latitude"], hotel["longitude"]) == (35.6948, 139.7016)
+
+
+def test_hotel_class_text_without_extracted_value():
+    data = {key: value for key, value in PROPERTY.items() if key != "extracted_hotel_class"}
+
+    assert _parse_hotel(data, "2026-01-15")["hotel_class"] == 4
+    assert _parse_hotel({**data, "hotel_class": "Boutique"}, "2026-01-15")["hotel_class"] == 0
+
+
+def test_table_round_trip():
+    total_only = {key: value for key, value in PROPERTY.items() if key != "rate_per_night"}
+    hotels = [_parse_hotel(PROPERTY, "2026-01-15"), _parse_hotel(total_only, "2026-01-15")]
+
+    rows = round_trip(hotels)
+
+    assert rows == [hotel.to_dict() for hotel in hotels]
+    assert rows[0]["hotel_class"] == 4
+    assert rows[1]["price"] == 1064 and rows[1]["price_is_total"] is True
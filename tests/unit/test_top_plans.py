@@ -0,0 +1,101 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for find_top_plans against a brute force over all sorted pairs.
+"""
+
+import random
+
+import pytest
+
+from agents.travel.travel_logic import find_cheapest_plan, find_top_plans
+from tests.unit.plan_cases import random_case, reference_candidates
+
+DIVERSITY = [(), ("airline",), ("hotel",), ("nonstop",), ("airline", "hotel"), ("airline", "hotel", "nonstop")]
+
+
+def brute_force_top_plans(flights, hotels, k, diversity, gap_hours):
+    """Walk all valid pairs cheapest first and apply the diversity rules one plan at a time."""
+    if k <= 0 or not flights or not hotels:
+        return []
+    plans, airlines, positions = [], set(), set()
+    has_nonstop = False
+    passed_over = None
+    for candidate in reference_candidates(flights, hotels, gap_hours):
+        if len(plans) >= k:
+            break
+        _, _, position, flight, _, _ = candidate
+        nonstop = (flight.get("stops") or 0) == 0
+        if "airline" in diversity and flight.get("airline") in airlines:
+            continue
+        if "hotel" in diversity and position in positions:
+            continue
+        # The last slot waits for a nonstop flight if none was picked yet
+        if "nonstop" in diversity and k >= 2 and not has_nonstop and len(plans) == k - 1 and not nonstop:
+            passed_over = passed_over or candidate
+            continue
+        plans.append(candidate)
+        airlines.add(flight.get("airline"))
+        positions.add(position)
+        has_nonstop = has_nonstop or nonstop
+    if passed_over is not None and len(plans) < k:
+        plans.append(passed_over)
+    return [(flight, hotel, total) for total, _, _, flight, hotel, _ in plans]
+
+
+@pytest.mark.parametrize("diversity", DIVERSITY)
+def test_matches_brute_force(diversity):
+    rng = random.Random(DIVERSITY.index(diversity))
+    for _ in range(400):
+        flights, hotels = random_case(rng)
+        k = rng.randrange(0, 5)
+        gap_hours = rng.choice([0, 2, 5, 24, 30])
+
+        plans = find_top_plans(flights, hotels, k, diversity, gap_hours)
+        expected = brute_force_top_plans(flights, hotels, k, diversity, gap_hours)
+
+        assert len(plans) == len(expected)
+        for plan, (flight, hotel, total) in zip(plans, expected):
+            assert plan["flight"] is flight and plan["hotel"] is hotel and plan["total_price"] == total
+
+
+def test_first_plan_is_the_cheapest_plan():
+    rng = random.Random(5)
+    for _ in range(300):
+        flights, hotels = random_case(rng)
+        plans = find_top_plans(flights, hotels, 1, (), 2)
+        cheapest = find_cheapest_plan(flights, hotels, 2)
+        assert (plans[0] if plans else None) == cheapest
+
+
+def test_nonstop_slot_falls_back_to_cheapest_without_nonstop_flights():
+    flights = [
+        {"price": 100, "arrival_time": "2026-03-10 09:00", "airline": "AA", "stops": 1},
+        {"price": 120, "arrival_time": "2026-03-10 09:00", "airline": "UA", "stops": 2},
+    ]
+    hotels = [{"name": "H", "price": 80, "overall_rating": 4.5, "location_rating": 4.5,
+               "check_in_date": "2026-03-10", "check_in_time": "15:00"}]
+
+    plans = find_top_plans(flights, hotels, k=2, diversity="nonstop", gap_hours=2)
+
+    assert [plan["flight"]["airline"] for plan in plans] == ["AA", "UA"]
+
+
+def test_nonstop_slot_takes_a_pricier_nonstop_flight():
+    flights = [
+        {"price": 100, "arrival_time": "2026-03-10 09:00", "airline": "AA", "stops": 1},
+        {"price": 110, "arrival_time": "2026-03-10 09:00", "airline": "UA", "stops": 1},
+        {"price": 300, "arrival_time": "2026-03-10 09:00", "airline": "DL", "stops": 0},
+    ]
+    hotels = [{"name": "H", "price": 80, "overall_rating": 4.5, "location_rating": 4.5,
+               "check_in_date": "2026-03-10", "check_in_time": "15:00"}]
+
+    plans = find_top_plans(flights, hotels, k=2, diversity="nonstop", gap_hours=2)
+
+    assert [plan["flight"]["airline"] for plan in plans] == ["AA", "DL"]
+
+
+def test_unknown_diversity_constraint():
+    with pytest.raises(ValueError):
+        find_top_plans([], [], diversity=("price",))